@@ -2,6 +2,7 @@ import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from libraries.cnwave.workflow import OneTouchWorkflow
 from libraries.cnwave.client import CnWaveClient
+from libraries.cnwave.async_client import SyncCnWaveClient
 from libraries.cnwave.logger import setup_logger
 
 
@@ -15,11 +16,16 @@ class CnWaveControllerLib:
     # --------------------------------
     # CONNECT TO CONTROLLER
     # --------------------------------
-    def connect_to_controller(self, host, username, password, port=3443):
+    def connect_to_controller(self, host, username, password, port=3443,
+                              concurrent=False):
 
         self.logger.info(f"Connecting to controller {host}...")
 
-        self.client = CnWaveClient(
+        # concurrent=True swaps in the asyncio client behind a blocking
+        # facade; the keyword surface stays identical
+        client_cls = SyncCnWaveClient if concurrent else CnWaveClient
+
+        self.client = client_cls(
             host=host,
             username=username,
             password=password,
@@ -0,0 +1,731 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+
+import aiohttp
+
+from libraries.cnwave.exceptions import (
+    AuthenticationError,
+    ApiRequestError,
+    ApiTimeoutError,
+    ApiConnectionError,
+)
+
+from libraries.cnwave.cache import (
+    TopologySnapshot,
+    NodesSnapshot,
+    TTLCache,
+    invalidates_cache,
+    normalize_mac,
+)
+from libraries.cnwave.client import (
+    AdaptivePollSchedule,
+    apply_mcs_override,
+    apply_tdd_override,
+    match_pop_dn_versions,
+    mcs_override_applied,
+)
+from libraries.cnwave.retry import async_retry
+from libraries.cnwave.logger import setup_logger
+
+
+class AsyncCnWaveClient:
+    """
+    asyncio variant of CnWaveClient backed by a single aiohttp session.
+
+    Exposes the same API surface as CnWaveClient (every controller call
+    is a coroutine) plus gather(), which runs independent controller
+    reads concurrently on the shared connection pool. Wait helpers poll
+    on the event loop instead of through a shared TopologyPoller.
+    """
+
+    def __init__(self, host, username, password,
+                 port=3443, verify_ssl=False, timeout=15,
+                 max_connections=8, cache_ttl=2):
+
+        self.base_url = f"https://{host}:{port}"
+        self.username = username
+        self.password = password
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.max_connections = max_connections
+
+        self.session = None
+        self.token = None
+        self._auth_lock = None
+
+        # Same snapshot cache as CnWaveClient; wait helpers always refresh
+        self.cache = TTLCache(cache_ttl)
+
+        self.last_config_push = None
+        self.last_poll_timeline = []
+
+        self.logger = setup_logger()
+
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        client = cls(*args, **kwargs)
+        await client.authenticate()
+        return client
+
+    async def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=None if self.verify_ssl else False,
+                limit=self.max_connections
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=float(self.timeout))
+            )
+            self._auth_lock = asyncio.Lock()
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self):
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _headers(self):
+        if not self.token:
+            return {}
+        return {"Authorization": f"Bearer {self.token}"}
+
+    # -----------------------------------------
+    # Authentication
+    # -----------------------------------------
+
+    async def authenticate(self):
+        self.logger.info("Authenticating with CNWave controller")
+
+        session = await self._get_session()
+        url = f"{self.base_url}/local/userLogin"
+
+        payload = {
+            "username": self.username,
+            "password": self.password
+        }
+
+        try:
+            async with session.post(url, json=payload) as response:
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+
+            if not data.get("success"):
+                raise AuthenticationError("Login failed")
+
+            self.token = data.get("message")
+
+            self.logger.info("Authentication successful")
+
+        except asyncio.TimeoutError:
+            raise ApiTimeoutError("Authentication timeout")
+
+        except aiohttp.ClientConnectionError:
+            raise ApiConnectionError("Unable to connect to controller")
+
+        except Exception as e:
+            raise AuthenticationError(str(e))
+
+    async def _reauthenticate(self, stale_token):
+        # Concurrent requests that all hit 401 only log in once
+        async with self._auth_lock:
+            if self.token == stale_token:
+                self.logger.warning("Token expired. Re-authenticating...")
+                await self.authenticate()
+
+    # -----------------------------------------
+    # Generic Request Handler
+    # -----------------------------------------
+
+    async def _send(self, session, method, url, payload):
+        async with session.request(
+            method,
+            url,
+            json=payload,
+            headers=self._headers()
+        ) as response:
+            return response.status, await response.text()
+
+    @async_retry(max_attempts=5)
+    async def request(self, method, endpoint, payload=None):
+
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+
+        try:
+            token = self.token
+            status, text = await self._send(session, method, url, payload)
+
+            # Handle token expiry
+            if status == 401:
+                await self._reauthenticate(token)
+                status, text = await self._send(session, method, url, payload)
+
+            if status >= 400:
+                raise ApiRequestError(f"HTTP {status} from {endpoint}")
+
+            if not text.strip():
+                self.logger.warning(f"Empty response from {endpoint}")
+                return {}
+
+            try:
+                data = json.loads(text)
+            except Exception:
+                self.logger.error(f"Non-JSON response from {endpoint}")
+                self.logger.error(text)
+                raise ApiRequestError("Controller returned non-JSON response")
+
+            if isinstance(data, dict) and not data.get("success", True):
+                raise ApiRequestError(data)
+
+            return data
+
+        except asyncio.TimeoutError:
+            raise ApiTimeoutError("API request timeout")
+
+        except aiohttp.ClientConnectionError:
+            raise ApiConnectionError("API connection error")
+
+        except Exception as e:
+            raise ApiRequestError(str(e))
+
+    # -----------------------------------------
+    # Concurrent Fan-out
+    # -----------------------------------------
+
+    async def gather(self, *calls, return_exceptions=False):
+        """
+        Run independent client calls concurrently.
+
+        Each call is a coroutine, a method name ("get_topology") or a
+        tuple of method name and arguments (("get_node", "PoP")).
+        Results are returned in the order the calls were given.
+        """
+
+        coros = []
+
+        for call in calls:
+            if asyncio.iscoroutine(call):
+                coros.append(call)
+            elif isinstance(call, str):
+                coros.append(getattr(self, call)())
+            else:
+                name, *args = call
+                coros.append(getattr(self, name)(*args))
+
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    # -----------------------------------------
+    # Inventory / Topology Read APIs
+    # -----------------------------------------
+
+    async def get_topology_snapshot(self, refresh=False):
+        snapshot = None if refresh else self.cache.get("topology")
+
+        if snapshot is None:
+            response = await self.request(
+                "POST",
+                "/api/getTopology",
+                payload={}
+            )
+            snapshot = self.cache.put(
+                "topology",
+                TopologySnapshot(response.get("message", response))
+            )
+
+        return snapshot
+
+    async def get_nodes_snapshot(self, refresh=False):
+        snapshot = None if refresh else self.cache.get("nodes")
+
+        if snapshot is None:
+            response = await self.request(
+                "GET",
+                "/api/getNodes"
+            )
+            snapshot = self.cache.put(
+                "nodes",
+                NodesSnapshot(response.get("nodes", []))
+            )
+
+        return snapshot
+
+    def invalidate_cache(self):
+        self.cache.invalidate()
+
+    def after_config_push(self):
+        # Called after every mutating API: drop snapshots and remember
+        # when the push happened for the stabilization schedule
+        self.cache.invalidate()
+        self.last_config_push = time.time()
+
+    async def get_topology(self, refresh=False):
+        return (await self.get_topology_snapshot(refresh)).topology
+
+    async def get_nodes(self, refresh=False):
+        return (await self.get_nodes_snapshot(refresh)).nodes
+
+    async def get_links(self, refresh=False):
+        return (await self.get_topology_snapshot(refresh)).links
+
+    async def get_node(self, name):
+        return (await self.get_nodes_snapshot()).by_name.get(name)
+
+    async def get_node_by_mac(self, mac):
+        return (await self.get_nodes_snapshot()).by_mac.get(normalize_mac(mac))
+
+    async def get_link(self, node_a, node_b):
+        return (await self.get_topology_snapshot()).link_between(node_a, node_b)
+
+    async def get_node_info(self):
+
+        response = await self.request(
+            "POST",
+            "/api/getNodeInfo",
+            payload={}
+        )
+
+        self.logger.warning(f"NODE INFO RESPONSE: {response}")
+        return response
+
+    async def get_system_capability(self):
+
+        response = await self.request(
+            "POST",
+            "/local/getSystemCapability",
+            payload={}
+        )
+
+        self.logger.warning(f"SYSTEM CAPABILITY RESPONSE: {response}")
+
+        return response
+
+    async def is_link_alive(self, node_a, node_b):
+        link = await self.get_link(node_a, node_b)
+        if link is None:
+            return False
+        return link.get("is_alive", False)
+
+    async def wait_for_node_online(self, node_name, timeout=300, interval=10):
+
+        start = time.time()
+
+        while time.time() - start < timeout:
+            nodes = await self.get_nodes_snapshot(refresh=True)
+            node = nodes.by_name.get(node_name)
+
+            if node and node.get("status") == 3:
+                return True
+
+            await asyncio.sleep(interval)
+
+        raise ApiTimeoutError(f"Node {node_name} did not come online")
+
+    async def wait_for_link_alive(self, node_a, node_b, timeout=120, interval=5):
+
+        start = time.time()
+
+        while time.time() - start < timeout:
+            topology = await self.get_topology_snapshot(refresh=True)
+            link = topology.link_between(node_a, node_b)
+
+            if link and link.get("is_alive"):
+                return True
+
+            await asyncio.sleep(interval)
+
+        return False
+
+    # -----------------------------------------
+    # Topology Management APIs
+    # -----------------------------------------
+
+    @invalidates_cache
+    async def add_site(self, payload):
+        return await self.request("POST", "/internal/api/addSite", payload=payload)
+
+    @invalidates_cache
+    async def add_node(self, payload):
+        return await self.request("POST", "/internal/api/addNode", payload=payload)
+
+    @invalidates_cache
+    async def add_link(self, payload):
+        return await self.request("POST", "/internal/api/addLink", payload=payload)
+
+    @invalidates_cache
+    async def delete_link(self, payload):
+        return await self.request("POST", "/internal/api/delLink", payload=payload)
+
+    @invalidates_cache
+    async def delete_node(self, payload):
+        return await self.request("POST", "/internal/api/delNode", payload=payload)
+
+    @invalidates_cache
+    async def delete_site(self, payload):
+        return await self.request("POST", "/internal/api/delSite", payload=payload)
+
+    # -----------------------------------------
+    # Link Control APIs
+    # -----------------------------------------
+
+    @invalidates_cache
+    async def set_ignition_state(self, payload):
+        return await self.request(
+            "POST",
+            "/internal/api/setIgnitionState",
+            payload=payload
+        )
+
+    @invalidates_cache
+    async def set_link_status(self, payload):
+        return await self.request(
+            "POST",
+            "/internal/api/setLinkStatus",
+            payload=payload
+        )
+
+    # -----------------------------------------
+    # Override APIs
+    # -----------------------------------------
+
+    @invalidates_cache
+    async def set_node_overrides(self, payload):
+        return await self.request(
+            "POST",
+            "/internal/api/setNodeOverridesConfig",
+            payload=payload
+        )
+
+    # -----------------------------------------
+    # Controller Config APIs
+    # -----------------------------------------
+
+    async def get_controller_config(self):
+        return await self.request(
+            "POST",
+            "/internal/api/getControllerConfig",
+            payload={}
+        )
+
+    @invalidates_cache
+    async def set_controller_config(self, payload):
+        return await self.request(
+            "POST",
+            "/internal/api/setControllerConfig",
+            payload=payload
+        )
+
+    # -----------------------------------------
+    # Network Overrides (Onboard API)
+    # -----------------------------------------
+
+    async def get_node_overrides_parsed(self):
+
+        response = await self.request(
+            "POST",
+            "/api/getNodeOverridesConfig",
+            payload={}
+        )
+
+        overrides_str = response.get("overrides")
+
+        if not overrides_str:
+            return {}
+
+        return json.loads(overrides_str)
+
+    async def is_mcs_applied(self, value):
+        return mcs_override_applied(await self.get_node_overrides_parsed(), value)
+
+    @invalidates_cache
+    async def update_mcs(self, value):
+
+        response = await self.request(
+            "POST",
+            "/api/getNodeOverridesConfig",
+            payload={}
+        )
+
+        overrides_str = response.get("overrides")
+
+        if not overrides_str:
+            raise Exception("Node overrides empty")
+
+        overrides = apply_mcs_override(json.loads(overrides_str), value)
+
+        result = await self.request(
+            "POST",
+            "/api/setNodeOverridesConfig",
+            payload={"overrides": json.dumps(overrides)}
+        )
+
+        await asyncio.sleep(4)
+        return result
+
+    async def get_network_overrides(self):
+        response = await self.request(
+            "POST",
+            "/api/getNetworkOverridesConfig",
+            payload={}
+        )
+
+        overrides = response.get("overrides")
+
+        if isinstance(overrides, str):
+            return json.loads(overrides)
+
+        return overrides
+
+    async def get_network_overrides_parsed(self):
+        return await self.get_network_overrides()
+
+    @invalidates_cache
+    async def set_network_overrides(self, overrides_dict):
+        return await self.request(
+            "POST",
+            "/api/setNetworkOverridesConfig",
+            payload={"overrides": json.dumps(overrides_dict)}
+        )
+
+    @invalidates_cache
+    async def update_tdd_slot_ratio(self, value):
+
+        response = await self.request(
+            "POST",
+            "/api/getNetworkOverridesConfig",
+            payload={}
+        )
+
+        overrides_str = response.get("overrides")
+
+        if not overrides_str:
+            raise Exception("Network overrides are empty. Cannot modify safely.")
+
+        overrides = apply_tdd_override(json.loads(overrides_str), value)
+
+        return await self.request(
+            "POST",
+            "/api/setNetworkOverridesConfig",
+            payload={"overrides": json.dumps(overrides)}
+        )
+
+    # -----------------------------------------
+    # Runtime / Wait Helpers
+    # -----------------------------------------
+
+    async def wait_for_link_active(self, timeout=90, interval=5):
+        timeout = float(timeout)
+        interval = float(interval)
+
+        start = time.time()
+
+        while time.time() - start < timeout:
+            topology = await self.get_topology_snapshot(refresh=True)
+            if topology.any_link_alive():
+                return True
+
+            await asyncio.sleep(interval)
+
+        return False
+
+    async def get_dn_radio_mac(self):
+        for node in await self.get_nodes():
+            if node.get("nodeType") == "DN":
+                return node.get("macAddr")
+        return None
+
+    async def wait_for_link_stable(self, timeout=300, interval=5, stable_window=60):
+
+        timeout = float(timeout)
+        interval = float(interval)
+        stable_window = float(stable_window)
+
+        deadline = time.time() + timeout
+
+        schedule = AdaptivePollSchedule(
+            pushed_at=self.last_config_push,
+            stable_interval=interval,
+            stable_max_interval=max(interval, stable_window / 4)
+        )
+        self.last_poll_timeline = schedule.timeline
+
+        stable_start = None
+
+        while True:
+            topology = await self.get_topology_snapshot(refresh=True)
+            schedule.observe(topology)
+
+            if topology.any_link_alive():
+                if stable_start is None:
+                    stable_start = topology.fetched_at
+                elif topology.fetched_at - stable_start >= stable_window:
+                    schedule.finish("window_passed")
+                    self.logger.info(
+                        f"Link stabilization passed after "
+                        f"{time.time() - schedule.started_at:.1f}s "
+                        f"and {schedule.polls} polls"
+                    )
+                    return True
+
+            elif stable_start is not None:
+                # Link flapped: the window starts again once it is back
+                self.logger.warning("Link flapped. Restarting stability window")
+                stable_start = None
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                schedule.finish("timeout")
+                return False
+
+            await asyncio.sleep(min(schedule.next_interval(), remaining))
+
+    def get_last_poll_timeline(self):
+        return self.last_poll_timeline
+
+    async def get_pop_dn_versions(self, pop_name=None, dn_name=None):
+        """
+        Gets POP and DN software versions. The status dump and the
+        topology are fetched concurrently.
+        """
+        try:
+            status_dump, topo = await self.gather(
+                self.request("POST", "/api/getCtrlStatusDump", payload={}),
+                self.get_topology()
+            )
+
+            pop_version, dn_version = match_pop_dn_versions(
+                topo.get("nodes", []),
+                status_dump.get("statusReports", {}),
+                pop_name,
+                dn_name
+            )
+
+            self.logger.info(f"POP version: {pop_version} | DN version: {dn_version}")
+            return pop_version, dn_version
+
+        except Exception as e:
+            self.logger.warning(f"Could not get versions: {e}")
+            return "unknown", "unknown"
+
+    async def get_software_version(self):
+        """
+        Returns software version from /local/getDeviceInfo
+        Returns: dict with swVer, fwVersion, model, type
+        """
+        try:
+            response = await self.request("POST", "/local/getDeviceInfo", payload={})
+            return {
+                "swVer":      response.get("swVer", "unknown").strip(),
+                "fwVersion":  response.get("fwVersion", "unknown").strip(),
+                "model":      response.get("model", "unknown"),
+                "type":       response.get("type", "unknown"),
+            }
+        except Exception as e:
+            self.logger.warning(f"Could not get software version: {e}")
+            return {
+                "swVer": "unknown",
+                "fwVersion": "unknown",
+                "model": "unknown",
+                "type": "unknown"
+            }
+
+    async def debug_node_versions(self):
+        """
+        Debug helper - dumps topology nodes and controller status dump,
+        fetched concurrently
+        """
+        topo, status = await self.gather(
+            self.get_topology(),
+            self.request("POST", "/api/getCtrlStatusDump", payload={}),
+            return_exceptions=True
+        )
+
+        self.logger.warning("=== TOPOLOGY NODES ===")
+        if isinstance(topo, Exception):
+            self.logger.warning(f"getTopology failed: {topo}")
+        else:
+            nodes = topo.get("nodes", [])
+            if not nodes:
+                self.logger.warning("No nodes found in topology")
+            for node in nodes:
+                self.logger.warning(json.dumps(node, indent=2))
+
+        self.logger.warning("=== CTRL STATUS DUMP ===")
+        if isinstance(status, Exception):
+            self.logger.warning(f"getCtrlStatusDump failed: {status}")
+        else:
+            for mac, report in status.get("statusReports", {}).items():
+                self.logger.warning(
+                    f"MAC: {mac} | "
+                    f"cambiumVersion: {report.get('cambiumVersion')} | "
+                    f"hardwareBoardId: {report.get('hardwareBoardId')}"
+                )
+
+
+class SyncCnWaveClient:
+    """
+    Blocking facade over AsyncCnWaveClient.
+
+    Runs the async client on a private event loop thread and exposes every
+    coroutine method as a plain call, so it can be dropped in wherever a
+    CnWaveClient is expected (CnWaveControllerLib, OneTouchWorkflow,
+    Robot 'Call Method'). Only the poller attribute has no counterpart.
+    """
+
+    def __init__(self, host, username, password,
+                 port=3443, verify_ssl=False, timeout=15, cache_ttl=2):
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"cnwave-async-{host}:{port}",
+            daemon=True
+        )
+        self._thread.start()
+
+        self._client = self._run(AsyncCnWaveClient.create(
+            host,
+            username,
+            password,
+            port=port,
+            verify_ssl=verify_ssl,
+            timeout=timeout,
+            cache_ttl=cache_ttl
+        ))
+
+        self.base_url = self._client.base_url
+        self.logger = self._client.logger
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def blocking(*args, **kwargs):
+            return self._run(attr(*args, **kwargs))
+
+        return blocking
+
+    def gather(self, *calls, return_exceptions=False):
+        return self._run(
+            self._client.gather(*calls, return_exceptions=return_exceptions)
+        )
+
+    def close(self):
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,126 @@
+import functools
+import inspect
+import threading
+import time
+
+
+def normalize_mac(mac):
+    if not mac:
+        return ""
+    return str(mac).strip().lower()
+
+
+class TopologySnapshot:
+    """
+    Point-in-time view of /api/getTopology with name/MAC indexes,
+    so lookups don't rescan the node and link lists.
+    """
+
+    def __init__(self, topology, fetched_at=None):
+        self.topology = topology
+        self.fetched_at = fetched_at or time.time()
+
+        self.nodes = topology.get("nodes", [])
+        self.links = topology.get("links", [])
+        self.sites = topology.get("sites", [])
+
+        self.nodes_by_name = {}
+        self.nodes_by_mac = {}
+
+        for node in self.nodes:
+            self.nodes_by_name[node.get("name")] = node
+
+            self.nodes_by_mac[normalize_mac(node.get("mac_addr"))] = node
+            for wlan_mac in node.get("wlan_mac_addrs") or []:
+                self.nodes_by_mac[normalize_mac(wlan_mac)] = node
+
+        self.nodes_by_mac.pop("", None)
+
+        self.links_by_name = {}
+        self.links_by_pair = {}
+
+        for link in self.links:
+            self.links_by_name[link.get("name")] = link
+            self.links_by_pair[
+                (link.get("a_node_name"), link.get("z_node_name"))
+            ] = link
+
+    def link_between(self, node_a, node_b):
+        return self.links_by_pair.get((node_a, node_b))
+
+    def any_link_alive(self):
+        return any(link.get("is_alive") for link in self.links)
+
+
+class NodesSnapshot:
+    """Point-in-time view of /api/getNodes indexed by name and MAC."""
+
+    def __init__(self, nodes, fetched_at=None):
+        self.nodes = nodes
+        self.fetched_at = fetched_at or time.time()
+
+        self.by_name = {node.get("name"): node for node in nodes}
+        self.by_mac = {
+            normalize_mac(node.get("macAddr")): node
+            for node in nodes
+            if node.get("macAddr")
+        }
+
+
+class TTLCache:
+
+    def __init__(self, ttl=2):
+        self.ttl = float(ttl)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, stored_at = entry
+
+            if time.time() - stored_at >= self.ttl:
+                del self._entries[key]
+                return None
+
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+        return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+def invalidates_cache(func):
+    """Drop cached topology/nodes after any controller mutation."""
+
+    if inspect.iscoroutinefunction(func):
+        # Async client: run the hook once the call has been awaited
+        @functools.wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            finally:
+                self.after_config_push()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.after_config_push()
+
+    return wrapper
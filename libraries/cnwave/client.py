@@ -11,14 +11,187 @@ from libraries.cnwave.exceptions import (
 )
 
 from libraries.cnwave.retry import retry
+from libraries.cnwave.poller import TopologyPoller
+from libraries.cnwave.cache import (
+    TopologySnapshot,
+    NodesSnapshot,
+    TTLCache,
+    invalidates_cache,
+    normalize_mac,
+)
 from libraries.cnwave.logger import setup_logger
 
 
+# -----------------------------------------
+# Payload Helpers (shared with AsyncCnWaveClient)
+# -----------------------------------------
+
+def apply_mcs_override(overrides, value):
+    # Apply to ALL nodes present in overrides
+    for node_name in overrides.keys():
+
+        if "linkParamsBase" not in overrides[node_name]:
+            overrides[node_name]["linkParamsBase"] = {}
+
+        if "fwParams" not in overrides[node_name]["linkParamsBase"]:
+            overrides[node_name]["linkParamsBase"]["fwParams"] = {}
+
+        overrides[node_name]["linkParamsBase"]["fwParams"]["laMaxMcs"] = int(value)
+
+    return overrides
+
+
+def mcs_override_applied(overrides, value):
+    # True only if EVERY node already has laMaxMcs == value, the state
+    # apply_mcs_override leaves behind; no nodes means nothing applied
+    if not overrides:
+        return False
+
+    for node in overrides.values():
+        fw = (node or {}).get("linkParamsBase", {}).get("fwParams", {})
+        if fw.get("laMaxMcs") is None or int(fw["laMaxMcs"]) != int(value):
+            return False
+
+    return True
+
+
+def apply_tdd_override(overrides, value):
+    # Modify ONLY if structure already exists
+    if "radioParamsBase" in overrides:
+        if "fwParams" in overrides["radioParamsBase"]:
+            overrides["radioParamsBase"]["fwParams"]["tddSlotRatio"] = int(value)
+        else:
+            raise Exception("fwParams missing inside radioParamsBase")
+    else:
+        raise Exception("radioParamsBase missing in network overrides")
+
+    return overrides
+
+
+def match_pop_dn_versions(nodes, status_reports, pop_name=None, dn_name=None):
+    pop_version = "unknown"
+    dn_version  = "unknown"
+
+    for node in nodes:
+        name    = node.get("name", "")
+        mac     = node.get("mac_addr", "")
+        is_pop  = node.get("pop_node", False)
+
+        # Look up this node's status report by MAC
+        report  = status_reports.get(mac, {})
+        version = report.get("cambiumVersion", "unknown")
+
+        if is_pop:
+            # Match by name if provided, otherwise take first POP
+            if pop_name is None or pop_name == "None" or name == pop_name:
+                pop_version = version
+
+        else:
+            # Match by name if provided, otherwise take first non-POP
+            if dn_name is None or dn_name == "None" or name == dn_name:
+                dn_version = version
+
+    return pop_version, dn_version
+
+
+# -----------------------------------------
+# Adaptive Polling
+# -----------------------------------------
+
+class AdaptivePollSchedule:
+    """
+    Poll cadence for link stabilization waits.
+
+      settle - fast polling for settle_time after a config push
+      down   - exponential back-off while the link is down, capped at
+               down_max_interval so link-up is still seen within ~1 s
+      stable - sparse polling while the link holds, backing off from
+               stable_interval to stable_max_interval
+
+    Every phase change and link transition is appended to timeline.
+    """
+
+    def __init__(self, pushed_at=None, fast_interval=0.5, settle_time=10,
+                 down_max_interval=1.0, backoff=1.5,
+                 stable_interval=5, stable_max_interval=15):
+
+        self.started_at = time.time()
+        self.pushed_at = pushed_at
+        self.fast_interval = float(fast_interval)
+        self.settle_time = float(settle_time)
+        self.down_max_interval = float(down_max_interval)
+        self.backoff = float(backoff)
+        self.stable_interval = float(stable_interval)
+        self.stable_max_interval = float(stable_max_interval)
+
+        self.link_up = None
+        self.polls = 0
+        self.timeline = []
+
+        if self._settling(self.started_at):
+            self.phase = "settle"
+            self.interval = self.fast_interval
+        else:
+            self.phase = "down"
+            self.interval = self.fast_interval
+
+        self._record("start", self.started_at)
+
+    def _settling(self, at):
+        return self.pushed_at is not None and at - self.pushed_at < self.settle_time
+
+    def _record(self, event, at):
+        self.timeline.append({
+            "elapsed": round(at - self.started_at, 2),
+            "event": event,
+            "phase": self.phase,
+            "interval": round(self.interval, 2),
+            "polls": self.polls
+        })
+
+    def _enter(self, phase, interval, at):
+        self.phase = phase
+        self.interval = interval
+        self._record(phase, at)
+
+    def observe(self, topology):
+        at = topology.fetched_at
+        up = topology.any_link_alive()
+
+        self.polls += 1
+
+        if up != self.link_up:
+            self.link_up = up
+            self._record("link_up" if up else "link_down", at)
+
+        if self._settling(at):
+            if self.phase != "settle":
+                self._enter("settle", self.fast_interval, at)
+
+        elif not up:
+            if self.phase != "down":
+                self._enter("down", self.fast_interval, at)
+            else:
+                self.interval = min(self.interval * self.backoff, self.down_max_interval)
+
+        else:
+            if self.phase != "stable":
+                self._enter("stable", self.stable_interval, at)
+            else:
+                self.interval = min(self.interval * self.backoff, self.stable_max_interval)
+
+    def next_interval(self):
+        return self.interval
+
+    def finish(self, event):
+        self._record(event, time.time())
+        return self.timeline
+
 
 class CnWaveClient:
 
     def __init__(self, host, username, password,
-                 port=3443, verify_ssl=False, timeout=15):
+                 port=3443, verify_ssl=False, timeout=15, cache_ttl=2):
 
         self.base_url = f"https://{host}:{port}"
         self.username = username
@@ -30,6 +203,14 @@ class CnWaveClient:
         self.session.verify = False
         self.token = None
 
+        # Topology / node snapshots shared by every read helper.
+        # Keep cache_ttl below the wait helpers' poll interval.
+        self.cache = TTLCache(cache_ttl)
+        self._poller = None
+
+        self.last_config_push = None
+        self.last_poll_timeline = []
+
         self.logger = setup_logger()
 
         self.authenticate()
@@ -140,30 +321,73 @@ class CnWaveClient:
     # Inventory / Topology Read APIs
     # -----------------------------------------
 
-    def get_topology(self):
-        response = self.request(
-            "POST",
-            "/api/getTopology",
-            payload={}
-        )
-        return response.get("message", response)
+    def get_topology_snapshot(self, refresh=False):
+        snapshot = None if refresh else self.cache.get("topology")
 
-    def get_nodes(self):
-        response = self.request(
-            "GET",
-            "/api/getNodes"
-        )
-        return response.get("nodes", [])
+        if snapshot is None:
+            response = self.request(
+                "POST",
+                "/api/getTopology",
+                payload={}
+            )
+            snapshot = self.cache.put(
+                "topology",
+                TopologySnapshot(response.get("message", response))
+            )
+
+        return snapshot
+
+    def get_nodes_snapshot(self, refresh=False):
+        snapshot = None if refresh else self.cache.get("nodes")
+
+        if snapshot is None:
+            response = self.request(
+                "GET",
+                "/api/getNodes"
+            )
+            snapshot = self.cache.put(
+                "nodes",
+                NodesSnapshot(response.get("nodes", []))
+            )
+
+        return snapshot
+
+    def invalidate_cache(self):
+        self.cache.invalidate()
+
+    def after_config_push(self):
+        # Called after every mutating API: drop snapshots, remember when
+        # the push happened and get the poller to look straight away
+        self.cache.invalidate()
+        self.last_config_push = time.time()
+
+        if self._poller is not None:
+            self._poller.poke()
+
+    @property
+    def poller(self):
+        # One shared background poller per controller connection
+        if self._poller is None:
+            self._poller = TopologyPoller(self)
+        return self._poller
+
+    def get_topology(self, refresh=False):
+        return self.get_topology_snapshot(refresh).topology
 
-    def get_links(self):
-        topo = self.get_topology()
-        return topo.get("links", [])
+    def get_nodes(self, refresh=False):
+        return self.get_nodes_snapshot(refresh).nodes
+
+    def get_links(self, refresh=False):
+        return self.get_topology_snapshot(refresh).links
 
     def get_node(self, name):
-        for node in self.get_nodes():
-            if node.get("name") == name:
-                return node
-        return None
+        return self.get_nodes_snapshot().by_name.get(name)
+
+    def get_node_by_mac(self, mac):
+        return self.get_nodes_snapshot().by_mac.get(normalize_mac(mac))
+
+    def get_link(self, node_a, node_b):
+        return self.get_topology_snapshot().link_between(node_a, node_b)
     
     def get_node_info(self):
 
@@ -189,32 +413,35 @@ class CnWaveClient:
         return response
 
     def is_link_alive(self, node_a, node_b):
-        for link in self.get_links():
-            if (
-                link.get("a_node_name") == node_a and
-                link.get("z_node_name") == node_b
-            ):
-                return link.get("is_alive", False)
-        return False
+        link = self.get_link(node_a, node_b)
+        if link is None:
+            return False
+        return link.get("is_alive", False)
 
     def wait_for_node_online(self, node_name, timeout=300, interval=10):
 
-        start = time.time()
+        def online(topology, nodes):
+            node = nodes.by_name.get(node_name)
+            return bool(node and node.get("status") == 3)
 
-        while time.time() - start < timeout:
-            node = self.get_node(node_name)
+        if self.poller.wait_for(online, timeout, interval, needs_nodes=True):
+            return True
 
-            if node and node.get("status") == 3:
-                return True
+        raise ApiTimeoutError(f"Node {node_name} did not come online")
 
-            time.sleep(interval)
+    def wait_for_link_alive(self, node_a, node_b, timeout=120, interval=5):
 
-        raise ApiTimeoutError(f"Node {node_name} did not come online")
+        def alive(topology, nodes):
+            link = topology.link_between(node_a, node_b)
+            return bool(link and link.get("is_alive"))
+
+        return bool(self.poller.wait_for(alive, timeout, interval))
 
     # -----------------------------------------
     # Topology Management APIs
     # -----------------------------------------
 
+    @invalidates_cache
     def add_site(self, payload):
         return self.request(
             "POST",
@@ -222,6 +449,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def add_node(self, payload):
         return self.request(
             "POST",
@@ -229,6 +457,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def add_link(self, payload):
         return self.request(
             "POST",
@@ -236,6 +465,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def delete_link(self, payload):
         return self.request(
             "POST",
@@ -243,6 +473,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def delete_node(self, payload):
         return self.request(
             "POST",
@@ -250,6 +481,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def delete_site(self, payload):
         return self.request(
             "POST",
@@ -261,6 +493,7 @@ class CnWaveClient:
     # Link Control APIs
     # -----------------------------------------
 
+    @invalidates_cache
     def set_ignition_state(self, payload):
         return self.request(
             "POST",
@@ -268,6 +501,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def set_link_status(self, payload):
         return self.request(
             "POST",
@@ -279,6 +513,7 @@ class CnWaveClient:
     # Override APIs
     # -----------------------------------------
 
+    @invalidates_cache
     def set_node_overrides(self, payload):
         return self.request(
             "POST",
@@ -297,6 +532,7 @@ class CnWaveClient:
             payload={}
         )
 
+    @invalidates_cache
     def set_controller_config(self, payload):
         return self.request(
             "POST",
@@ -324,6 +560,10 @@ class CnWaveClient:
 
         return json.loads(overrides_str)
 
+    def is_mcs_applied(self, value):
+        return mcs_override_applied(self.get_node_overrides_parsed(), value)
+
+    @invalidates_cache
     def update_mcs(self, value):
         import json
         import time
@@ -339,18 +579,7 @@ class CnWaveClient:
         if not overrides_str:
             raise Exception("Node overrides empty")
 
-        overrides = json.loads(overrides_str)
-
-        # Apply to ALL nodes present in overrides
-        for node_name in overrides.keys():
-
-            if "linkParamsBase" not in overrides[node_name]:
-                overrides[node_name]["linkParamsBase"] = {}
-
-            if "fwParams" not in overrides[node_name]["linkParamsBase"]:
-                overrides[node_name]["linkParamsBase"]["fwParams"] = {}
-
-            overrides[node_name]["linkParamsBase"]["fwParams"]["laMaxMcs"] = int(value)
+        overrides = apply_mcs_override(json.loads(overrides_str), value)
 
         payload = {
             "overrides": json.dumps(overrides)
@@ -386,6 +615,7 @@ class CnWaveClient:
     def get_network_overrides_parsed(self):
         return self.get_network_overrides()
 
+    @invalidates_cache
     def set_network_overrides(self, overrides_dict):
         import json
 
@@ -402,6 +632,7 @@ class CnWaveClient:
             payload=payload
         )
 
+    @invalidates_cache
     def update_tdd_slot_ratio(self, value):
         import json
 
@@ -417,16 +648,8 @@ class CnWaveClient:
         if not overrides_str:
             raise Exception("Network overrides are empty. Cannot modify safely.")
 
-        overrides = json.loads(overrides_str)
-
         # 2️⃣ Modify ONLY if structure already exists
-        if "radioParamsBase" in overrides:
-            if "fwParams" in overrides["radioParamsBase"]:
-                overrides["radioParamsBase"]["fwParams"]["tddSlotRatio"] = int(value)
-            else:
-                raise Exception("fwParams missing inside radioParamsBase")
-        else:
-            raise Exception("radioParamsBase missing in network overrides")
+        overrides = apply_tdd_override(json.loads(overrides_str), value)
 
         # 3️⃣ Send FULL modified blob back
         payload = {
@@ -443,65 +666,66 @@ class CnWaveClient:
     # -----------------------------------------
 
     def wait_for_link_active(self, timeout=90, interval=5):
-        timeout = float(timeout)
-        interval = float(interval)
-
-        start = time.time()
 
-        while time.time() - start < timeout:
-            links = self.get_links()
+        def any_alive(topology, nodes):
+            return topology.any_link_alive()
 
-            for link in links:
-                if link.get("is_alive"):
-                    return True
-
-            time.sleep(interval)
-
-        return False
+        return bool(self.poller.wait_for(any_alive, float(timeout), float(interval)))
 
     def get_dn_radio_mac(self):
-        nodes = self.request("GET", "/api/getNodes")
-        for node in nodes.get("nodes", []):
+        for node in self.get_nodes():
             if node.get("nodeType") == "DN":
                 return node.get("macAddr")
         return None
     
     def wait_for_link_stable(self, timeout=300, interval=5, stable_window=60):
-        import time
 
         timeout = float(timeout)
         interval = float(interval)
         stable_window = float(stable_window)
 
-        start_time = time.time()
-
-        # Step 1: Wait until link first comes up
-        while time.time() - start_time < timeout:
-            if any(link.get("is_alive") for link in self.get_links()):
-                break
-            time.sleep(interval)
-        else:
-            return False
+        deadline = time.time() + timeout
 
-        # Step 2: Ensure it stays up continuously
-        stable_start = time.time()
-
-        while time.time() - start_time < timeout:
-            if not any(link.get("is_alive") for link in self.get_links()):
-                # Link flapped → reset stability timer
-                stable_start = None
-                while not any(link.get("is_alive") for link in self.get_links()):
-                    if time.time() - start_time >= timeout:
-                        return False
-                    time.sleep(interval)
-                stable_start = time.time()
-            else:
-                if stable_start and (time.time() - stable_start >= stable_window):
-                    return True
+        schedule = AdaptivePollSchedule(
+            pushed_at=self.last_config_push,
+            stable_interval=interval,
+            stable_max_interval=max(interval, stable_window / 4)
+        )
+        self.last_poll_timeline = schedule.timeline
+
+        def link_up(topology, nodes):
+            return topology.any_link_alive()
+
+        def link_down(topology, nodes):
+            return not topology.any_link_alive()
+
+        while True:
+            # Step 1: Wait until link (re)comes up
+            remaining = deadline - time.time()
+            if remaining <= 0 or not self.poller.wait_for(link_up, remaining, schedule):
+                schedule.finish("timeout")
+                return False
+
+            # Step 2: Ensure it stays up for the whole window.
+            # A flap wakes us immediately and restarts the window.
+            stable_start = time.time()
+            window = min(stable_window, deadline - stable_start)
+
+            if not self.poller.wait_for(link_down, window, schedule):
+                stable = time.time() - stable_start >= stable_window
+                schedule.finish("window_passed" if stable else "timeout")
+
+                self.logger.info(
+                    f"Link stabilization {'passed' if stable else 'timed out'} "
+                    f"after {time.time() - schedule.started_at:.1f}s "
+                    f"and {schedule.polls} polls"
+                )
+                return stable
 
-            time.sleep(interval)
+            self.logger.warning("Link flapped. Restarting stability window")
 
-        return False
+    def get_last_poll_timeline(self):
+        return self.last_poll_timeline
 
 
     def get_pop_dn_versions(self, pop_name=None, dn_name=None):
@@ -519,27 +743,9 @@ class CnWaveClient:
             topo = self.get_topology()
             nodes = topo.get("nodes", [])
 
-            pop_version = "unknown"
-            dn_version  = "unknown"
-
-            for node in nodes:
-                name    = node.get("name", "")
-                mac     = node.get("mac_addr", "")
-                is_pop  = node.get("pop_node", False)
-
-                # Look up this node's status report by MAC
-                report  = status_reports.get(mac, {})
-                version = report.get("cambiumVersion", "unknown")
-
-                if is_pop:
-                    # Match by name if provided, otherwise take first POP
-                    if pop_name is None or pop_name == "None" or name == pop_name:
-                        pop_version = version
-
-                else:
-                    # Match by name if provided, otherwise take first non-POP
-                    if dn_name is None or dn_name == "None" or name == dn_name:
-                        dn_version = version
+            pop_version, dn_version = match_pop_dn_versions(
+                nodes, status_reports, pop_name, dn_name
+            )
 
             self.logger.info(f"POP version: {pop_version} | DN version: {dn_version}")
             return pop_version, dn_version
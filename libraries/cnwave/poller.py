@@ -0,0 +1,283 @@
+import threading
+import time
+
+
+# Consecutive failed polls after which waiters stop waiting and see the
+# controller error instead of a timeout
+MAX_POLL_FAILURES = 3
+
+
+class _Waiter:
+
+    def __init__(self, interval, needs_nodes):
+        # interval is either seconds or a schedule exposing
+        # observe(topology) / next_interval()
+        if hasattr(interval, "next_interval"):
+            self.schedule = interval
+            self._interval = None
+        else:
+            self.schedule = None
+            self._interval = float(interval)
+
+        self.needs_nodes = needs_nodes
+
+    @property
+    def interval(self):
+        if self.schedule is not None:
+            return float(self.schedule.next_interval())
+        return self._interval
+
+
+class TopologyPoller:
+    """
+    Single background polling thread per controller.
+
+    Every wait helper registers as a waiter instead of running its own
+    sleep loop. The thread polls at the tightest interval any active
+    waiter asked for, publishes link/node state change events to
+    listeners and wakes all waiters as soon as a new snapshot lands.
+    The thread exits after idle_timeout seconds without waiters and is
+    restarted on demand.
+
+    A failing poll is kept as the last error: waiters raise it after
+    MAX_POLL_FAILURES failures in a row, or when they time out without
+    having seen a single snapshot, so an unreachable controller is not
+    reported as a link that never came up.
+    """
+
+    def __init__(self, client, interval=5, idle_timeout=30):
+        self.client = client
+        self.default_interval = float(interval)
+        self.idle_timeout = float(idle_timeout)
+        self.logger = client.logger
+
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._waiters = []
+        self._listeners = []
+        self._thread = None
+        self._poll_now = False
+
+        self._topology = None
+        self._nodes = None
+        self._version = 0
+
+        self._error = None
+        self._failures = 0
+
+    # -----------------------------------------
+    # Subscription API
+    # -----------------------------------------
+
+    def add_listener(self, callback):
+        """callback(event) is called for every observed state change."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def poke(self):
+        """Poll immediately instead of at the end of the current interval."""
+        self._poll_now = True
+        self._wake.set()
+
+    def wait_for(self, predicate, timeout, interval=None, needs_nodes=False):
+        """
+        Block until predicate(topology, nodes) is truthy on a polled
+        snapshot and return its value, or None once timeout expires.
+        Raises the last poll error instead when polling keeps failing
+        (see MAX_POLL_FAILURES) or no snapshot was seen before timeout.
+
+        topology is a TopologySnapshot; nodes is a NodesSnapshot when
+        needs_nodes is set, otherwise whatever was last fetched.
+        interval may be a schedule object, which sees every snapshot
+        before waiters are woken and sets the next poll delay.
+        """
+
+        waiter = _Waiter(interval or self.default_interval, needs_nodes)
+        deadline = time.time() + float(timeout)
+
+        with self._cond:
+            # Errors left over from an earlier, finished wait are stale
+            if not self._waiters:
+                self._error = None
+                self._failures = 0
+
+            self._waiters.append(waiter)
+            self._ensure_running()
+
+            if not self._is_fresh(waiter):
+                self.poke()
+            else:
+                # Let the thread shorten its current sleep if needed
+                self._wake.set()
+
+            try:
+                seen = None
+
+                while True:
+                    if self._version != seen and self._is_fresh(waiter):
+                        seen = self._version
+                        result = predicate(self._topology, self._nodes)
+                        if result:
+                            return result
+
+                    if self._failures >= MAX_POLL_FAILURES:
+                        raise self._error
+
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        if seen is None and self._error is not None:
+                            raise self._error
+                        return None
+
+                    self._cond.wait(remaining)
+
+            finally:
+                self._waiters.remove(waiter)
+
+    # -----------------------------------------
+    # Polling Thread
+    # -----------------------------------------
+
+    def _is_fresh(self, waiter):
+        now = time.time()
+
+        if self._topology is None:
+            return False
+
+        if now - self._topology.fetched_at > waiter.interval:
+            return False
+
+        if waiter.needs_nodes:
+            if self._nodes is None:
+                return False
+            if now - self._nodes.fetched_at > waiter.interval:
+                return False
+
+        return True
+
+    def _current_interval(self):
+        with self._cond:
+            return min(
+                (w.interval for w in self._waiters),
+                default=self.default_interval
+            )
+
+    def _ensure_running(self):
+        # Caller holds self._cond
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"cnwave-poller-{self.client.base_url}",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _sleep_until_due(self, last_poll):
+        # Re-evaluated on every wake-up, so a waiter joining with a
+        # shorter interval takes effect without forcing an extra poll
+        while not self._poll_now:
+            remaining = last_poll + self._current_interval() - time.time()
+            if remaining <= 0:
+                return
+            self._wake.wait(remaining)
+            self._wake.clear()
+
+    def _run(self):
+        idle_since = None
+
+        while True:
+            with self._cond:
+                if self._waiters:
+                    idle_since = None
+                    needs_nodes = any(w.needs_nodes for w in self._waiters)
+                else:
+                    idle_since = idle_since or time.time()
+                    if time.time() - idle_since >= self.idle_timeout:
+                        self._thread = None
+                        return
+
+            if idle_since is not None:
+                self._wake.wait(self.default_interval)
+                self._wake.clear()
+                continue
+
+            # Reset first so a poke that lands mid-poll is not lost
+            self._poll_now = False
+            self._wake.clear()
+            last_poll = time.time()
+
+            try:
+                self._poll_once(needs_nodes)
+            except Exception as e:
+                self.logger.warning(f"Topology poll failed: {e}")
+
+                with self._cond:
+                    self._error = e
+                    self._failures += 1
+                    self._cond.notify_all()
+
+            self._sleep_until_due(last_poll)
+
+    def _poll_once(self, needs_nodes):
+        topology = self.client.get_topology_snapshot(refresh=True)
+        nodes = self.client.get_nodes_snapshot(refresh=True) if needs_nodes else None
+
+        with self._cond:
+            events = self._diff(topology, nodes)
+
+            self._topology = topology
+            if nodes is not None:
+                self._nodes = nodes
+
+            # Schedules see the snapshot before the next delay is chosen
+            for waiter in self._waiters:
+                if waiter.schedule is not None:
+                    waiter.schedule.observe(topology)
+
+            self._version += 1
+            self._error = None
+            self._failures = 0
+            self._cond.notify_all()
+
+        for event in events:
+            self.logger.info(
+                f"{event['type']}: {event['name']} -> {event['value']}"
+            )
+            for callback in list(self._listeners):
+                try:
+                    callback(event)
+                except Exception as e:
+                    self.logger.warning(f"Poller listener failed: {e}")
+
+    def _diff(self, topology, nodes):
+        events = []
+
+        if self._topology is not None:
+            for name, link in topology.links_by_name.items():
+                old = self._topology.links_by_name.get(name)
+                alive = bool(link.get("is_alive"))
+
+                if old is None or bool(old.get("is_alive")) != alive:
+                    events.append({
+                        "type": "link_state",
+                        "name": name,
+                        "value": alive,
+                        "at": topology.fetched_at
+                    })
+
+        if nodes is not None and self._nodes is not None:
+            for name, node in nodes.by_name.items():
+                old = self._nodes.by_name.get(name)
+
+                if old is None or old.get("status") != node.get("status"):
+                    events.append({
+                        "type": "node_status",
+                        "name": name,
+                        "value": node.get("status"),
+                        "at": nodes.fetched_at
+                    })
+
+        return events
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import random
 import functools
@@ -43,3 +44,43 @@ def retry(max_attempts=5, base_delay=2):
 
     return decorator
 
+
+
+def async_retry(max_attempts=5, base_delay=2):
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+
+            delay = base_delay
+            last_exception = None
+
+            for attempt in range(1, max_attempts + 1):
+
+                try:
+                    return await func(*args, **kwargs)
+
+                except Exception as e:
+                    last_exception = e
+
+                    if attempt == max_attempts:
+                        raise
+
+                    sleep_time = delay + random.uniform(0, 1)
+
+                    if args and hasattr(args[0], "logger"):
+                        args[0].logger.warning(
+                            f"Retry {attempt}/{max_attempts} "
+                            f"after error: {str(e)}. "
+                            f"Sleeping {sleep_time:.2f}s"
+                        )
+
+                    await asyncio.sleep(sleep_time)
+                    delay *= 2
+
+            raise last_exception
+
+        return wrapper
+
+    return decorator
@@ -1,6 +1,3 @@
-import time
-
-
 class OneTouchWorkflow:
 
     def __init__(self, client):
@@ -138,15 +135,9 @@ class OneTouchWorkflow:
 
         self.logger.info("Validating link status...")
 
-        start = time.time()
-
-        while time.time() - start < timeout:
-
-            if self.client.is_link_alive(node_a, node_b):
-                self.logger.info("Link is alive")
-                return True
-
-            time.sleep(interval)
+        if self.client.wait_for_link_alive(node_a, node_b, timeout, interval):
+            self.logger.info("Link is alive")
+            return True
 
         self.logger.error("Link failed to come alive")
         return False
@@ -0,0 +1,257 @@
+import atexit
+import gzip
+import os
+import shutil
+import time
+
+from libraries.iperf.ssh_pool import SshConnectionPool, INVENTORY_FILE
+from libraries.iperf.server_pool import IperfServerPool
+from libraries.iperf.exceptions import IperfError
+from libraries.cnwave.logger import setup_logger
+from libraries.iperf.stream import IperfStreamRecorder
+from libraries.iperf.adaptive import AdaptiveDuration
+from libraries.iperf.flows import MultiFlowRunner
+from performance.plot_iperf import analyze_iperf, IperfResult
+
+
+PID_MARKER = "IPERF_PID:"
+
+
+class IperfLib:
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
+    def __init__(self, inventory_file=INVENTORY_FILE, server_ports=2):
+        self.logger = setup_logger()
+        self.pool = SshConnectionPool.from_inventory(inventory_file)
+        self.servers = IperfServerPool(self.pool, ports_per_side=server_ports)
+
+        atexit.register(self.pool.close_all)
+
+    # --------------------------------
+    # POOLED COMMAND EXECUTION
+    # --------------------------------
+    def execute_pooled_command(self, device_type, device_name, command,
+                               timeout=None):
+
+        stdout, stderr, rc = self.pool.execute(
+            device_type,
+            device_name,
+            command,
+            timeout=timeout
+        )
+
+        if stderr:
+            self.logger.info(f"[{device_name}] stderr: {stderr}")
+
+        return stdout
+
+    # --------------------------------
+    # POOL LIFECYCLE
+    # --------------------------------
+    def close_pooled_connections(self):
+        self.pool.close_all()
+
+    def get_pool_statistics(self):
+        return dict(self.pool.stats)
+
+    # --------------------------------
+    # IPERF SERVER POOL
+    # --------------------------------
+    def lease_iperf_server(self, side):
+        """Return the port of a ready iperf3 server on side, reserved for the caller."""
+        return self.servers.lease(side)
+
+    def release_iperf_server(self, side, port):
+        self.servers.release(side, port)
+
+    def shutdown_iperf_servers(self):
+        self.servers.stop_all()
+
+    # --------------------------------
+    # RESULT ANALYSIS
+    # --------------------------------
+    def analyze_iperf_result(self, result, test_name, graph_file=None):
+        """
+        Parse iperf3 -J output in-process and return an IperfResult
+        (sent_mbps, recv_mbps, retransmits, loss, jitter). The graph is
+        only rendered when graph_file is given.
+        """
+
+        if isinstance(result, IperfResult):
+            # Already analyzed while streaming
+            analysis = result
+        else:
+            try:
+                analysis = analyze_iperf(result, test_name)
+            except ValueError as e:
+                raise IperfError(f"{test_name}: invalid iperf3 output", str(e))
+
+        if not analysis.has_throughput:
+            raise IperfError("No throughput detected. Traffic did not pass.", test_name)
+
+        for line in analysis.summary_lines():
+            self.logger.info(f"[{test_name}] {line}")
+
+        for label, stats in (("sent", analysis.sent_stats), ("recv", analysis.recv_stats)):
+            if stats:
+                self.logger.info(
+                    f"[{test_name}] {label} p5/p50/p95: {stats['p5']:.1f}/"
+                    f"{stats['p50']:.1f}/{stats['p95']:.1f} Mbps | "
+                    f"std {stats['std']:.1f} | steady after {stats['time_to_steady_s']} s"
+                )
+
+        if graph_file:
+            analysis.render(graph_file)
+
+        return analysis
+
+    # --------------------------------
+    # STREAMING EXECUTION
+    # --------------------------------
+    def execute_iperf_streaming(self, side, command, artifact_path, test_name,
+                                duration_mode="fixed", min_duration=10,
+                                target_ci_pct=2.0, max_duration=60,
+                                live_log_interval=10):
+        """
+        Run an iperf3 -J client command with --json-stream, parsing
+        intervals as they arrive and writing one gzip artifact. Returns
+        the analyzed IperfResult. Falls back to buffered -J output when
+        the remote iperf3 doesn't support --json-stream (< 3.17).
+
+        duration_mode=adaptive interrupts the client (SIGINT, so iperf3
+        still reports its end summary) once the per-second mean has
+        converged to target_ci_pct; the command's -t is the upper bound.
+        """
+
+        adaptive = None
+        if str(duration_mode).lower() == "adaptive":
+            adaptive = AdaptiveDuration(min_duration, max_duration, target_ci_pct)
+
+        stream_command = command
+        if "--json-stream" not in command:
+            stream_command = f"{command} --json-stream"
+
+        if adaptive:
+            # Print the PID first so the client can be interrupted later
+            stream_command = f"sh -c 'echo {PID_MARKER}$$; exec {stream_command}'"
+
+        state = {"pid": None, "last_log": 0.0, "stopped": False}
+
+        def on_interval(live):
+            if adaptive and adaptive.observe(recorder) and state["pid"]:
+                self.logger.info(
+                    f"[{test_name}] Converged after {live['seconds']} s "
+                    f"(CI ±{adaptive.confidence_pct:.2f}%). Stopping client"
+                )
+                self.pool.execute("ubuntu", side, f"kill -INT {state['pid']}")
+                state["stopped"] = True
+
+            if time.time() - state["last_log"] < float(live_log_interval):
+                return
+            state["last_log"] = time.time()
+
+            recv = ""
+            if live["recv_mbps"] is not None:
+                recv = f" | recv {live['recv_mbps']:.1f} Mbps"
+
+            self.logger.info(
+                f"[{test_name}] {live['seconds']} s | sent {live['sent_mbps']:.1f} Mbps "
+                f"(avg {live['sent_running_avg']:.1f}){recv}"
+            )
+
+        recorder = IperfStreamRecorder(artifact_path, test_name, on_interval=on_interval)
+
+        def on_line(line):
+            if line.startswith(PID_MARKER):
+                state["pid"] = line[len(PID_MARKER):].strip()
+                return
+            recorder.feed(line)
+
+        try:
+            stderr, rc = self.pool.execute_streaming(
+                "ubuntu", side, stream_command, on_line
+            )
+        finally:
+            recorder.close()
+
+        if recorder.streamed:
+            # Our own SIGINT makes iperf3 report an "interrupt" error
+            if state["stopped"] and "interrupt" in str(recorder.error):
+                recorder.error = None
+            document = recorder.as_json_document()
+        else:
+            self.logger.warning(
+                f"[{test_name}] --json-stream not supported on {side} "
+                f"(rc={rc}, {stderr}). Falling back to buffered -J"
+            )
+
+            output = self.execute_pooled_command("ubuntu", side, command)
+
+            with gzip.open(artifact_path, "wt", encoding="utf-8") as f:
+                f.write(output)
+
+            document = output
+
+        analysis = self.analyze_iperf_result(document, test_name)
+        analysis.artifact = artifact_path
+
+        if adaptive:
+            analysis.duration_mode = "adaptive"
+            analysis.stopped_early = state["stopped"]
+
+        return analysis
+
+    # --------------------------------
+    # CONCURRENT FLOWS
+    # --------------------------------
+    def run_iperf_flows(self, test_name, *flows, artifact_dir=".", duration=60):
+        """
+        Run several iperf3 flows at once and return one merged
+        IperfResult. Each flow is a dict: name, src, dst and optionally
+        protocol (tcp/udp), streams, bitrate, bidir, extra and role
+        (sent / recv / background).
+        """
+
+        return MultiFlowRunner(self).run(
+            test_name, list(flows), artifact_dir, duration=duration
+        )
+
+    # --------------------------------
+    # DASHBOARD CSV
+    # --------------------------------
+    def ensure_csv_header(self, csv_file, header):
+        """
+        Create csv_file with header, or upgrade an older header in place
+        when columns were appended. pandas skips rows with more fields
+        than the header, so new rows would otherwise vanish.
+        """
+
+        header = header.strip()
+
+        if not os.path.exists(csv_file):
+            with open(csv_file, "w") as f:
+                f.write(header + "\n")
+            return
+
+        with open(csv_file, "r") as f:
+            current = f.readline().strip()
+
+        if current == header:
+            return
+
+        if not header.startswith(current + ","):
+            raise IperfError(
+                f"Unexpected header in {csv_file}",
+                f"found '{current}', expected a prefix of '{header}'"
+            )
+
+        self.logger.info(f"Upgrading {csv_file} header: {header}")
+
+        tmp_file = csv_file + ".tmp"
+        with open(csv_file, "r") as src, open(tmp_file, "w") as dst:
+            src.readline()
+            dst.write(header + "\n")
+            shutil.copyfileobj(src, dst)
+
+        os.replace(tmp_file, csv_file)
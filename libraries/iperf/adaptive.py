@@ -0,0 +1,50 @@
+from performance.plot_iperf import ci_half_width_pct
+
+
+class AdaptiveDuration:
+    """
+    Stop rule for adaptive-duration runs.
+
+    The client is started with -t max_duration; once at least
+    min_duration seconds are measured and the 95% CI half-width of the
+    per-second mean is within target_ci_pct of the mean in every
+    direction, the run is considered converged and can be interrupted.
+    """
+
+    def __init__(self, min_duration=10, max_duration=60, target_ci_pct=2.0):
+        self.min_duration = int(min_duration)
+        self.max_duration = int(max_duration)
+        self.target_ci_pct = float(target_ci_pct)
+
+        if self.min_duration > self.max_duration:
+            raise ValueError(
+                f"min_duration {min_duration} > max_duration {max_duration}"
+            )
+
+        self.converged_at = None
+        self.confidence_pct = None
+
+    def observe(self, recorder):
+        """Return True the first time the recorded series has converged."""
+
+        if self.converged_at is not None:
+            return False
+
+        if recorder.measured < self.min_duration:
+            return False
+
+        series = [recorder.sent_series]
+        if recorder.recv_series:
+            series.append(recorder.recv_series)
+
+        cis = [ci_half_width_pct(values) for values in series]
+        if any(ci is None for ci in cis):
+            return False
+
+        self.confidence_pct = max(cis)
+
+        if self.confidence_pct <= self.target_ci_pct:
+            self.converged_at = recorder.measured
+            return True
+
+        return False
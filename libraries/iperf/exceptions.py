@@ -0,0 +1,17 @@
+class IperfError(Exception):
+    """Base exception for the iperf traffic engine"""
+
+    def __init__(self, message=None, details=None):
+        super().__init__(message)
+        self.message = message
+        self.details = details
+
+    def __str__(self):
+        if self.details:
+            return f"{self.message} | Details: {self.details}"
+        return str(self.message)
+
+
+class SshPoolError(IperfError):
+    """Raised when a pooled SSH session cannot be opened or used"""
+    pass
@@ -0,0 +1,230 @@
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+from libraries.iperf.exceptions import IperfError
+from performance.plot_iperf import IperfResult, interval_stats, ci_half_width_pct
+
+
+# How a flow counts towards the merged record
+ROLE_SENT = "sent"
+ROLE_RECV = "recv"
+ROLE_BACKGROUND = "background"
+
+
+class FlowSpec:
+    """One iperf3 client/server pair in a multi-flow test."""
+
+    def __init__(self, name, src, dst, protocol="tcp", streams=1, bitrate=None,
+                 bidir=False, role=ROLE_SENT, extra=""):
+
+        self.name = name
+        self.src = src
+        self.dst = dst
+        self.protocol = protocol.lower()
+        self.streams = int(streams)
+        self.bitrate = bitrate
+        self.bidir = str(bidir).lower() in ("1", "true", "yes")
+        self.role = role
+        self.extra = extra
+
+        if self.role not in (ROLE_SENT, ROLE_RECV, ROLE_BACKGROUND):
+            raise IperfError(f"Unknown flow role: {role}")
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(**dict(spec))
+
+    def command(self, server_ip, port, duration):
+        parts = [f"iperf3 -c {server_ip} -i1 -t {duration} -p {port}"]
+
+        if self.protocol == "udp":
+            parts.append(f"-u -b {self.bitrate or '2G'}")
+        elif self.bitrate:
+            parts.append(f"-b {self.bitrate}")
+
+        if self.streams > 1:
+            parts.append(f"-P {self.streams}")
+        if self.bidir:
+            parts.append("--bidir")
+        if self.extra:
+            parts.append(self.extra)
+
+        parts.append("-J")
+        return " ".join(parts)
+
+
+def _sum_series(results, attr):
+    series = [getattr(r, attr) for r in results if len(getattr(r, attr))]
+    if not series:
+        return np.empty(0)
+
+    # Flows start a few ms apart; align on the shortest run
+    length = min(len(s) for s in series)
+    return np.sum([s[:length] for s in series], axis=0)
+
+
+def merge_flow_results(test_name, flows, results):
+    """
+    Merge per-flow IperfResults into one record. Roles refer to each
+    flow's client -> server direction: "sent" flows add up to sent_*,
+    "recv" flows to recv_*, "background" flows are only listed.
+    """
+
+    by_role = {ROLE_SENT: [], ROLE_RECV: []}
+    for flow, result in zip(flows, results):
+        if flow.role in by_role:
+            by_role[flow.role].append(result)
+
+    protocols = {r.protocol for r in by_role[ROLE_SENT] + by_role[ROLE_RECV]}
+    merged = IperfResult(
+        test_name,
+        protocols.pop() if len(protocols) == 1 else "MIXED",
+        "bidirectional" if by_role[ROLE_RECV] else None
+    )
+
+    sent = by_role[ROLE_SENT]
+    recv = by_role[ROLE_RECV]
+
+    if sent:
+        merged.sent_mbps = sum(r.sent_mbps or 0 for r in sent)
+        merged.sent_bw = _sum_series(sent, "sent_bw")
+        merged.times_sent = min((r.times_sent for r in sent), key=len)[:len(merged.sent_bw)]
+        merged.sent_retransmits = _sum_optional(r.sent_retransmits for r in sent)
+        merged.sent_loss_pct = _max_optional(r.sent_loss_pct for r in sent)
+        merged.sent_jitter_ms = _max_optional(r.sent_jitter_ms for r in sent)
+
+    if recv:
+        # A reverse flow's client->server direction is our receive side
+        merged.bidirectional = True
+        merged.recv_mbps = sum(r.sent_mbps or 0 for r in recv)
+        merged.recv_bw = _sum_series(recv, "sent_bw")
+        merged.times_recv = min((r.times_sent for r in recv), key=len)[:len(merged.recv_bw)]
+        merged.recv_retransmits = _sum_optional(r.sent_retransmits for r in recv)
+        merged.recv_loss_pct = _max_optional(r.sent_loss_pct for r in recv)
+        merged.recv_jitter_ms = _max_optional(r.sent_jitter_ms for r in recv)
+
+    # Clients run with -i1, so each interval starts a second before its end
+    merged.sent_stats = interval_stats(merged.sent_bw, merged.times_sent - 1)
+    merged.recv_stats = interval_stats(merged.recv_bw, merged.times_recv - 1)
+
+    durations = [r.duration_s for r in sent + recv if r.duration_s]
+    merged.duration_s = min(durations) if durations else None
+
+    cis = [ci_half_width_pct(bw) for bw in (merged.sent_bw, merged.recv_bw) if len(bw)]
+    cis = [ci for ci in cis if ci is not None]
+    merged.confidence_pct = max(cis) if cis else None
+
+    merged.flows = [
+        {
+            "name": flow.name,
+            "role": flow.role,
+            "src": flow.src,
+            "dst": flow.dst,
+            "sent_mbps": result.sent_mbps,
+            "recv_mbps": result.recv_mbps,
+            "artifact": result.artifact
+        }
+        for flow, result in zip(flows, results)
+    ]
+    # One artifact per flow; there is no merged raw output
+    merged.artifact = [r.artifact for r in results if r.artifact] or None
+
+    return merged
+
+
+def _sum_optional(values):
+    values = [v for v in values if v is not None]
+    return sum(values) if values else None
+
+
+def _max_optional(values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+class MultiFlowRunner:
+    """
+    Runs several iperf3 flows at the same time: one leased server port
+    per flow on its destination PC and one client per flow, each on its
+    own channel of the pooled SSH session to the source PC.
+    """
+
+    def __init__(self, iperf_lib):
+        self.lib = iperf_lib
+        self.logger = iperf_lib.logger
+
+    def _server_ip(self, side):
+        return self.lib.pool.devices["ubuntu"][side]["test_host"]
+
+    def run(self, test_name, flows, artifact_dir, duration=60):
+        flows = [f if isinstance(f, FlowSpec) else FlowSpec.from_dict(f) for f in flows]
+
+        names = Counter(flow.name for flow in flows)
+        duplicates = [name for name, count in names.items() if count > 1]
+        if duplicates:
+            raise IperfError(f"Duplicate flow names: {duplicates}")
+
+        per_dst = Counter(flow.dst for flow in flows)
+        for dst, count in per_dst.items():
+            if count > len(self.lib.servers.ports):
+                raise IperfError(
+                    f"{count} flows to {dst} but only "
+                    f"{len(self.lib.servers.ports)} iperf3 server ports"
+                )
+
+        leases = []
+        try:
+            for flow in flows:
+                leases.append((flow.dst, self.lib.servers.lease(flow.dst)))
+
+            results = [None] * len(flows)
+            errors = [None] * len(flows)
+
+            def run_flow(index, flow, port):
+                try:
+                    results[index] = self.lib.execute_iperf_streaming(
+                        flow.src,
+                        flow.command(self._server_ip(flow.dst), port, duration),
+                        os.path.join(artifact_dir, f"{test_name}__{flow.name}.jsonl.gz"),
+                        f"{test_name}__{flow.name}"
+                    )
+                except Exception as e:
+                    errors[index] = e
+
+            threads = [
+                threading.Thread(
+                    target=run_flow,
+                    args=(i, flow, port),
+                    name=f"iperf-flow-{flow.name}",
+                    daemon=True
+                )
+                for i, (flow, (_, port)) in enumerate(zip(flows, leases))
+            ]
+
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        finally:
+            for dst, port in leases:
+                self.lib.servers.release(dst, port)
+
+        failed = {flow.name: str(e) for flow, e in zip(flows, errors) if e}
+        if failed:
+            raise IperfError(f"{test_name}: flows failed", failed)
+
+        merged = merge_flow_results(test_name, flows, results)
+
+        for flow in merged.flows:
+            sent = flow["sent_mbps"]
+            rate = f"{sent:.2f} Mbps" if sent is not None else "no sent rate"
+            self.logger.info(
+                f"[{test_name}] flow {flow['name']} ({flow['role']}) "
+                f"{flow['src']}->{flow['dst']}: {rate}"
+            )
+
+        return merged
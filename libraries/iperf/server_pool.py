@@ -0,0 +1,185 @@
+import threading
+import time
+
+import paramiko
+
+from libraries.iperf.exceptions import IperfError
+from libraries.cnwave.logger import setup_logger
+
+
+BASE_PORT = 5201
+
+PIDFILE = "/tmp/iperf3-{port}.pid"
+
+# Start only if the pidfile doesn't point at a live server, so warm
+# servers (also those of another worker on the same PC) are reused
+ENSURE_COMMAND = (
+    "PID=$(cat {pidfile} 2>/dev/null); "
+    "if [ -n \"$PID\" ] && kill -0 $PID 2>/dev/null; then echo running; "
+    "else rm -f {pidfile}; iperf3 -s -D -p {port} -I {pidfile} && echo started; fi"
+)
+
+STOP_COMMAND = "[ -f {pidfile} ] && kill $(cat {pidfile}) 2>/dev/null; rm -f {pidfile}"
+
+LISTEN_COMMAND = "ss -ltn 'sport = :{port}' | grep -q LISTEN"
+
+
+class IperfServerPool:
+    """
+    Long-lived iperf3 servers on the traffic PCs, one daemon per port.
+
+    A test leases a port, runs its client against it and releases it;
+    the server stays up for the next test. Servers are started on first
+    use, checked with a TCP-level probe (a direct-tcpip channel through
+    the pooled SSH session) before every lease and restarted only when
+    the probe fails.
+    """
+
+    def __init__(self, ssh_pool, ports_per_side=2, base_port=BASE_PORT,
+                 probe_timeout=5, probe_interval=0.1, lease_timeout=300):
+
+        self.ssh_pool = ssh_pool
+        self.ports = [int(base_port) + i for i in range(int(ports_per_side))]
+        self.probe_timeout = float(probe_timeout)
+        self.probe_interval = float(probe_interval)
+        self.lease_timeout = float(lease_timeout)
+
+        self._cond = threading.Condition()
+        self._leased = set()
+        self._started = set()
+        self._no_forwarding = set()
+
+        self.stats = {"started": 0, "reused": 0, "restarted": 0}
+
+        self.logger = setup_logger()
+
+    # -----------------------------------------
+    # Readiness
+    # -----------------------------------------
+
+    def _probe_once(self, side, port):
+        if side in self._no_forwarding:
+            _, _, rc = self.ssh_pool.execute(
+                "ubuntu", side, LISTEN_COMMAND.format(port=port)
+            )
+            return rc == 0
+
+        transport = self.ssh_pool.get("ubuntu", side).get_transport()
+
+        try:
+            channel = transport.open_channel(
+                "direct-tcpip",
+                ("127.0.0.1", port),
+                ("127.0.0.1", 0),
+                timeout=self.probe_timeout
+            )
+        except paramiko.ChannelException as e:
+            if e.code == paramiko.common.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED:
+                # sshd has AllowTcpForwarding off: check the listener instead
+                self.logger.info(
+                    f"TCP forwarding disabled on {side}, probing with ss instead"
+                )
+                self._no_forwarding.add(side)
+                return self._probe_once(side, port)
+            return False
+
+        channel.close()
+        return True
+
+    def wait_ready(self, side, port, timeout=None):
+        deadline = time.time() + (timeout or self.probe_timeout)
+
+        while True:
+            if self._probe_once(side, port):
+                return True
+            if time.time() >= deadline:
+                return False
+            time.sleep(self.probe_interval)
+
+    # -----------------------------------------
+    # Server Lifecycle
+    # -----------------------------------------
+
+    def ensure(self, side, port):
+        key = (side, port)
+
+        # Known warm server: one probe, no remote command
+        if key in self._started and self._probe_once(side, port):
+            self.stats["reused"] += 1
+            return
+
+        if key in self._started:
+            self.logger.warning(f"iperf3 server {side}:{port} not answering. Restarting")
+            self.stop(side, port)
+            self.stats["restarted"] += 1
+
+        pidfile = PIDFILE.format(port=port)
+        output, stderr, rc = self.ssh_pool.execute(
+            "ubuntu", side, ENSURE_COMMAND.format(pidfile=pidfile, port=port)
+        )
+
+        if rc != 0:
+            raise IperfError(f"Unable to start iperf3 server on {side}:{port}", stderr)
+
+        if not self.wait_ready(side, port):
+            raise IperfError(
+                f"iperf3 server on {side}:{port} not ready after {self.probe_timeout}s"
+            )
+
+        self._started.add(key)
+        self.stats["started" if output.strip() == "started" else "reused"] += 1
+
+        self.logger.info(f"iperf3 server {side}:{port} {output.strip()}")
+
+    def stop(self, side, port):
+        self.ssh_pool.execute(
+            "ubuntu", side, STOP_COMMAND.format(pidfile=PIDFILE.format(port=port))
+        )
+        self._started.discard((side, port))
+
+    def stop_all(self):
+        for side, port in list(self._started):
+            try:
+                self.stop(side, port)
+            except Exception as e:
+                self.logger.warning(f"Failed to stop iperf3 server {side}:{port}: {e}")
+
+        self.logger.info(
+            f"iperf3 servers stopped | started: {self.stats['started']} | "
+            f"reused: {self.stats['reused']} | restarted: {self.stats['restarted']}"
+        )
+
+    # -----------------------------------------
+    # Port Leases
+    # -----------------------------------------
+
+    def lease(self, side):
+        """Reserve a free port on side with a ready server; returns the port."""
+
+        deadline = time.time() + self.lease_timeout
+
+        with self._cond:
+            while True:
+                free = [p for p in self.ports if (side, p) not in self._leased]
+                if free:
+                    port = free[0]
+                    self._leased.add((side, port))
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise IperfError(f"No free iperf3 server port on {side}")
+                self._cond.wait(remaining)
+
+        try:
+            self.ensure(side, port)
+        except Exception:
+            self.release(side, port)
+            raise
+
+        return port
+
+    def release(self, side, port):
+        with self._cond:
+            self._leased.discard((side, int(port)))
+            self._cond.notify_all()
@@ -0,0 +1,300 @@
+import os
+import socket
+import threading
+import time
+
+import paramiko
+import yaml
+
+from libraries.iperf.exceptions import SshPoolError
+from libraries.cnwave.logger import setup_logger
+
+
+PROJECT_ROOT = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+)
+INVENTORY_FILE = os.path.join(PROJECT_ROOT, "inventory.yaml")
+
+
+def load_devices(inventory_file=INVENTORY_FILE):
+    with open(inventory_file, "r") as f:
+        data = yaml.safe_load(f) or {}
+
+    return data.get("devices", {})
+
+
+class SshConnectionPool:
+    """
+    Keyed pool of long-lived paramiko sessions, one per
+    (device_type, device_name) from inventory.yaml.
+
+    Sessions are opened lazily, health-checked before reuse and
+    transparently reopened when the transport has dropped.
+    """
+
+    def __init__(self, devices, connect_timeout=30, keepalive=30,
+                 health_check_interval=10):
+
+        self.devices = devices
+        self.connect_timeout = float(connect_timeout)
+        self.keepalive = int(keepalive)
+        self.health_check_interval = float(health_check_interval)
+
+        self._clients = {}
+        self._last_checked = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+        self.stats = {"opened": 0, "reused": 0, "reconnected": 0}
+
+        self.logger = setup_logger()
+
+    @classmethod
+    def from_inventory(cls, inventory_file=INVENTORY_FILE, **kwargs):
+        return cls(load_devices(inventory_file), **kwargs)
+
+    # -----------------------------------------
+    # Session Lookup
+    # -----------------------------------------
+
+    def _device(self, device_type, device_name):
+
+        group = self.devices.get(device_type)
+        if group is None:
+            raise SshPoolError(f"Unknown device type: {device_type}")
+
+        device = group.get(device_name)
+        if device is None:
+            raise SshPoolError(
+                f"Unknown device: {device_type} -> {device_name}"
+            )
+
+        protocol = device.get("protocol", "ssh")
+        if protocol != "ssh":
+            raise SshPoolError(f"Unsupported protocol: {protocol}")
+
+        return device
+
+    def _key_lock(self, key):
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _open(self, device_type, device_name):
+
+        device = self._device(device_type, device_name)
+
+        self.logger.info(
+            f"Opening pooled SSH session to {device_type} -> "
+            f"{device_name} ({device['host']})"
+        )
+
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        try:
+            client.connect(
+                device["host"],
+                port=int(device.get("port", 22)),
+                username=device["username"],
+                password=device["password"],
+                timeout=self.connect_timeout,
+                banner_timeout=self.connect_timeout,
+                auth_timeout=self.connect_timeout,
+                allow_agent=False,
+                look_for_keys=False
+            )
+        except Exception as e:
+            client.close()
+            raise SshPoolError(
+                f"Unable to connect to {device_name}", details=str(e)
+            )
+
+        client.get_transport().set_keepalive(self.keepalive)
+
+        return client
+
+    def is_healthy(self, key):
+
+        client = self._clients.get(key)
+        if client is None:
+            return False
+
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        # Cheap round trip only when the session has been idle for a while
+        if time.time() - self._last_checked.get(key, 0) < self.health_check_interval:
+            return True
+
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+
+        self._last_checked[key] = time.time()
+        return True
+
+    def get(self, device_type, device_name):
+        """Return a live SSHClient for the device, reconnecting if needed."""
+
+        key = (device_type, device_name)
+
+        with self._key_lock(key):
+
+            if self.is_healthy(key):
+                self.stats["reused"] += 1
+                return self._clients[key]
+
+            if key in self._clients:
+                self.logger.warning(
+                    f"Pooled session to {device_name} is stale. Reconnecting..."
+                )
+                self._discard(key)
+                self.stats["reconnected"] += 1
+
+            client = self._open(device_type, device_name)
+
+            self._clients[key] = client
+            self._last_checked[key] = time.time()
+            self.stats["opened"] += 1
+
+            return client
+
+    # -----------------------------------------
+    # Command Execution
+    # -----------------------------------------
+
+    def execute(self, device_type, device_name, command, timeout=None):
+        """
+        Run a command on the pooled session.
+        Returns (stdout, stderr, exit_status).
+        """
+
+        for attempt in (1, 2):
+
+            client = self.get(device_type, device_name)
+            channel = None
+
+            try:
+                stdin, stdout, stderr = client.exec_command(
+                    command,
+                    timeout=float(timeout) if timeout else None
+                )
+                channel = stdout.channel
+                stdin.close()
+
+                out = stdout.read().decode("utf-8", errors="replace")
+                err = stderr.read().decode("utf-8", errors="replace")
+                rc = stdout.channel.recv_exit_status()
+
+                return out.rstrip("\n"), err.rstrip("\n"), rc
+
+            except socket.timeout:
+                # The command outlived timeout on a healthy session;
+                # running it again would repeat it in full (a whole
+                # iperf test), so only its channel is dropped
+                self._close_channel(channel)
+                raise
+
+            except (paramiko.SSHException, EOFError, OSError) as e:
+
+                # Transport died between the health check and the command
+                self._discard((device_type, device_name))
+
+                if attempt == 2:
+                    raise SshPoolError(
+                        f"Command failed on {device_name}: {command}",
+                        details=str(e)
+                    )
+
+                self.logger.warning(
+                    f"SSH session to {device_name} dropped ({e}). Retrying once"
+                )
+
+    def execute_streaming(self, device_type, device_name, command, on_line,
+                          timeout=None):
+        """
+        Run a command and hand each stdout line to on_line(line) as it
+        arrives instead of buffering the whole output.
+        Returns (stderr, exit_status).
+        """
+
+        for attempt in (1, 2):
+
+            client = self.get(device_type, device_name)
+            received = False
+            channel = None
+
+            try:
+                stdin, stdout, stderr = client.exec_command(
+                    command,
+                    timeout=float(timeout) if timeout else None
+                )
+                channel = stdout.channel
+                stdin.close()
+
+                for line in stdout:
+                    received = True
+                    on_line(line)
+
+                err = stderr.read().decode("utf-8", errors="replace")
+                rc = stdout.channel.recv_exit_status()
+
+                return err.rstrip("\n"), rc
+
+            except socket.timeout:
+                # Same as execute(): a timeout is not a dropped session
+                self._close_channel(channel)
+                raise
+
+            except (paramiko.SSHException, EOFError, OSError) as e:
+
+                self._discard((device_type, device_name))
+
+                # Lines already consumed can't be replayed
+                if attempt == 2 or received:
+                    raise SshPoolError(
+                        f"Streaming command failed on {device_name}: {command}",
+                        details=str(e)
+                    )
+
+                self.logger.warning(
+                    f"SSH session to {device_name} dropped ({e}). Retrying once"
+                )
+
+    # -----------------------------------------
+    # Teardown
+    # -----------------------------------------
+
+    def _close_channel(self, channel):
+        if channel is not None:
+            try:
+                channel.close()
+            except Exception:
+                pass
+
+    def _discard(self, key):
+        client = self._clients.pop(key, None)
+        self._last_checked.pop(key, None)
+
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def close(self, device_type, device_name):
+        self._discard((device_type, device_name))
+
+    def close_all(self):
+        for key in list(self._clients):
+            self._discard(key)
+
+        self.logger.info(
+            f"SSH pool closed | opened: {self.stats['opened']} | "
+            f"reused: {self.stats['reused']} | "
+            f"reconnected: {self.stats['reconnected']}"
+        )
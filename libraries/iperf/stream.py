@@ -0,0 +1,189 @@
+import gzip
+import json
+import os
+import time
+
+
+class IperfStreamRecorder:
+    """
+    Consumes iperf3 --json-stream output one line at a time.
+
+    Every line goes straight into a single gzip artifact; only the
+    fields the analysis needs are kept per interval (a few floats per
+    stream), and running aggregates are updated as intervals arrive so
+    live throughput is available during the run.
+    """
+
+    def __init__(self, artifact_path=None, test_name="", on_interval=None):
+        self.artifact_path = artifact_path
+        self.test_name = test_name
+        self.on_interval = on_interval
+
+        # No artifact_path: parse only (e.g. reading an artifact back)
+        self._artifact = None
+
+        if artifact_path:
+            artifact_dir = os.path.dirname(artifact_path)
+            if artifact_dir:
+                os.makedirs(artifact_dir, exist_ok=True)
+
+            self._artifact = gzip.open(artifact_path, "wt", encoding="utf-8")
+
+        self.start = None
+        self.end = None
+        self.error = None
+        self.intervals = []
+
+        self.events = 0
+        self.bad_lines = 0
+
+        # Running aggregates (Mbps), excluding omitted intervals
+        self.measured = 0
+        self.sent_total = 0.0
+        self.recv_total = 0.0
+        self.sent_last = None
+        self.recv_last = None
+        self.sent_min = None
+        self.sent_max = None
+
+        # Per-second Mbps of measured intervals, for convergence checks
+        self.sent_series = []
+        self.recv_series = []
+
+    # -----------------------------------------
+    # Ingestion
+    # -----------------------------------------
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return
+
+        if self._artifact is not None:
+            self._artifact.write(line + "\n")
+
+        try:
+            record = json.loads(line)
+            event = record["event"]
+        except (ValueError, KeyError, TypeError):
+            self.bad_lines += 1
+            return
+
+        self.events += 1
+        data = record.get("data", {})
+
+        if event == "start":
+            self.start = data
+        elif event == "interval":
+            self._interval(data)
+        elif event == "end":
+            self.end = data
+        elif event == "error":
+            self.error = data
+
+    def _interval(self, data):
+        total = data.get("sum") or {}
+        reverse = data.get("sum_bidir_reverse")
+
+        compact = {
+            "sum": _pick(total, ("start", "end", "bits_per_second", "omitted")),
+            "streams": [
+                _pick(s, ("socket", "start", "end", "bits_per_second", "sender"))
+                for s in data.get("streams", [])
+            ]
+        }
+        if reverse:
+            compact["sum_bidir_reverse"] = _pick(
+                reverse, ("start", "end", "bits_per_second")
+            )
+
+        self.intervals.append(compact)
+
+        if total.get("omitted"):
+            return
+
+        sent = total.get("bits_per_second", 0) / 1_000_000
+        recv = reverse.get("bits_per_second", 0) / 1_000_000 if reverse else None
+
+        self.measured += 1
+        self.sent_series.append(sent)
+        self.sent_total += sent
+        self.sent_last = sent
+        self.sent_min = sent if self.sent_min is None else min(self.sent_min, sent)
+        self.sent_max = sent if self.sent_max is None else max(self.sent_max, sent)
+
+        if recv is not None:
+            self.recv_series.append(recv)
+            self.recv_total += recv
+            self.recv_last = recv
+
+        if self.on_interval:
+            self.on_interval(self.live())
+
+    # -----------------------------------------
+    # Results
+    # -----------------------------------------
+
+    @property
+    def streamed(self):
+        """False when the remote iperf3 produced no --json-stream events."""
+        return self.events > 0
+
+    def live(self):
+        return {
+            "test_name": self.test_name,
+            "seconds": self.measured,
+            "sent_mbps": self.sent_last,
+            "recv_mbps": self.recv_last,
+            "sent_running_avg": self.sent_total / self.measured if self.measured else None,
+            "recv_running_avg": (
+                self.recv_total / self.measured
+                if self.measured and self.recv_last is not None else None
+            ),
+            "sent_min": self.sent_min,
+            "sent_max": self.sent_max,
+            "at": time.time()
+        }
+
+    def as_json_document(self):
+        """Same shape as iperf3 -J, trimmed to what analyze_iperf reads."""
+        document = {
+            "start": self.start or {},
+            "intervals": self.intervals,
+            "end": self.end or {}
+        }
+        if self.error:
+            document["error"] = self.error
+        return document
+
+    def close(self):
+        if self._artifact is not None:
+            self._artifact.close()
+            self._artifact = None
+
+
+def _pick(source, keys):
+    return {key: source[key] for key in keys if key in source}
+
+
+def read_artifact(artifact_path):
+    """Load a .jsonl.gz artifact (streamed or plain -J) as a -J style dict."""
+
+    with gzip.open(artifact_path, "rt", encoding="utf-8") as f:
+        first = f.readline()
+
+        try:
+            record = json.loads(first)
+        except ValueError:
+            record = None
+
+        # Plain -J output is one pretty-printed document, not event lines
+        if not isinstance(record, dict) or "event" not in record:
+            return json.loads(first + f.read())
+
+        recorder = IperfStreamRecorder()
+        recorder.feed(first)
+        for line in f:
+            recorder.feed(line)
+
+    return recorder.as_json_document()
@@ -0,0 +1,56 @@
+from libraries.matrix.checkpoint import CheckpointManifest, resolve_run_dir
+from libraries.cnwave.logger import setup_logger
+
+
+class CheckpointLib:
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
+    def __init__(self):
+        self.logger = setup_logger()
+        self.manifest = None
+
+    # --------------------------------
+    # RUN DIRECTORY
+    # --------------------------------
+    def resolve_resume_directory(self, model_dir, run_id):
+        return resolve_run_dir(model_dir, run_id)
+
+    def open_checkpoint(self, result_dir, csv_file=None):
+        self.manifest = CheckpointManifest(result_dir)
+
+        if csv_file:
+            imported = self.manifest.import_csv(csv_file)
+            if imported:
+                self.logger.info(
+                    f"Seeded checkpoint with {imported} cells from {csv_file}"
+                )
+
+        count = len(self.manifest.completed())
+        self.logger.info(f"Checkpoint {self.manifest.path}: {count} completed cells")
+
+        return count
+
+    # --------------------------------
+    # CELLS
+    # --------------------------------
+    def cell_is_completed(self, channel, tdd, mcs, test_name):
+        if self.manifest is None:
+            return False
+        return self.manifest.is_completed(channel, tdd, mcs, test_name)
+
+    def scenario_is_completed(self, channel, tdd, mcs, *test_names):
+        if self.manifest is None or not test_names:
+            return False
+
+        return all(
+            self.manifest.is_completed(channel, tdd, mcs, name)
+            for name in test_names
+        )
+
+    def record_completed_cell(self, channel, tdd, mcs, test_name, status="PASS"):
+        if self.manifest is None:
+            self.logger.warning("No checkpoint open, cell not recorded")
+            return
+
+        self.manifest.record(channel, tdd, mcs, test_name, status=status)
@@ -0,0 +1,27 @@
+from libraries.matrix.locks import ResourceLockManager, traffic_resources, LOCK_DIR
+from libraries.cnwave.logger import setup_logger
+
+
+class LockLib:
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
+    def __init__(self, lock_dir=LOCK_DIR):
+        self.logger = setup_logger()
+        self.locks = ResourceLockManager(lock_dir)
+
+    # --------------------------------
+    # TESTBED LOCKS
+    # --------------------------------
+    def acquire_testbed_locks(self, setup, traffic_pc, timeout=3600):
+        names = sorted(traffic_resources(setup, traffic_pc))
+
+        self.logger.info(f"Waiting for testbed locks: {names}")
+        self.locks.acquire_all(names, timeout=timeout)
+        self.logger.info(f"Acquired testbed locks: {names}")
+
+        return names
+
+    def release_testbed_locks(self):
+        self.locks.release_all()
+        self.logger.info("Released testbed locks")
@@ -0,0 +1,112 @@
+import re
+
+from robot.api import SuiteVisitor
+
+from libraries.matrix.scheduler import MatrixScheduler
+
+
+SCENARIO_KEYWORD = re.compile(r"^Run \w+ Scenario$", re.IGNORECASE)
+
+
+def _suite_variable(suite, name, default=None):
+    for variable in suite.resource.variables:
+        if variable.name == name and variable.value:
+            return variable.value[0]
+    return default
+
+
+def collect_cells(suite):
+    """
+    Build scheduler cells from a matrix suite: every test whose first
+    scenario step is `Run <CB> Scenario  <tdd_value>  <tdd_label>  <mcs>`.
+    Tests that don't follow that shape are left out and keep their place
+    after the matrix.
+    """
+
+    channel = _suite_variable(suite, "${CB_NAME}")
+    cells = []
+
+    for test in suite.tests:
+        for step in test.body:
+            name = getattr(step, "name", None)
+
+            if not name or not SCENARIO_KEYWORD.match(name):
+                continue
+
+            args = list(step.args)
+            if len(args) < 3:
+                break
+
+            cells.append({
+                "name": test.name,
+                "test": test,
+                "channel": channel,
+                "tdd": args[0],
+                "tdd_label": args[1],
+                "mcs": args[2]
+            })
+            break
+
+    return cells
+
+
+class MatrixOrder(SuiteVisitor):
+    """
+    Pre-run modifier that reorders a CB matrix suite so TDD and MCS
+    reconfigurations happen as rarely as possible.
+
+    Usage:
+        robot --prerunmodifier libraries.matrix.MatrixOrder cnwave/cnwave_cb1_matrix.robot
+        robot --prerunmodifier libraries.matrix.MatrixOrder:current_tdd=0:current_mcs=12 ...
+
+    current_tdd / current_mcs describe what the controller is already
+    configured with, so the first cell can reuse it. For a plan without
+    running anything use:
+        python -m libraries.matrix.scheduler cnwave/cnwave_cb1_matrix.robot
+    """
+
+    def __init__(self, current_tdd=None, current_mcs=None,
+                 tdd_change_cost=None, mcs_change_cost=None,
+                 traffic_test_cost=None):
+
+        costs = {}
+        if tdd_change_cost is not None:
+            costs["tdd_change_cost"] = tdd_change_cost
+        if mcs_change_cost is not None:
+            costs["mcs_change_cost"] = mcs_change_cost
+        if traffic_test_cost is not None:
+            costs["traffic_test_cost"] = traffic_test_cost
+
+        self.scheduler = MatrixScheduler(**costs)
+        self.current_tdd = current_tdd
+        self.current_mcs = current_mcs
+
+    def start_suite(self, suite):
+        cells = collect_cells(suite)
+
+        if not cells:
+            return
+
+        channel = cells[0]["channel"]
+
+        steps = self.scheduler.plan(
+            cells,
+            current_channel=channel,
+            current_tdd=self.current_tdd,
+            current_mcs=self.current_mcs
+        )
+        baseline = self.scheduler.authored_steps(
+            cells,
+            current_channel=channel,
+            current_tdd=self.current_tdd,
+            current_mcs=self.current_mcs
+        )
+
+        print(f"\n===== Matrix plan: {suite.name} =====")
+        print(self.scheduler.format_report(steps, baseline=baseline))
+
+        planned = [step["cell"]["test"] for step in steps]
+        planned_ids = {id(test) for test in planned}
+        remaining = [test for test in suite.tests if id(test) not in planned_ids]
+
+        suite.tests = planned + remaining
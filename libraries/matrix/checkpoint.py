@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import threading
+import time
+
+
+MANIFEST_NAME = "checkpoint.jsonl"
+
+
+def cell_key(channel, tdd, mcs, test_name):
+    return (str(channel), str(tdd), str(mcs), str(test_name))
+
+
+class CheckpointManifest:
+    """
+    Append-only record of the matrix cells completed in one run
+    directory, stored as checkpoint.jsonl next to the raw results.
+
+    One JSON object per line, flushed and fsync'ed per cell, so an
+    aborted run keeps everything it finished and a truncated last line
+    is simply ignored on reload.
+    """
+
+    def __init__(self, result_dir):
+        self.result_dir = result_dir
+        self.path = os.path.join(result_dir, MANIFEST_NAME)
+        self.run_id = os.path.basename(os.path.normpath(result_dir))
+        # Run folders sit under results/<board_model>/
+        self.board_model = os.path.basename(
+            os.path.dirname(os.path.normpath(os.path.abspath(result_dir)))
+        )
+
+        self._cells = {}
+        self._lock = threading.Lock()
+        self._needs_newline = False
+
+        self._load()
+
+    # -----------------------------------------
+    # Load / Bootstrap
+    # -----------------------------------------
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r") as f:
+            content = f.read()
+
+        # Don't append the next entry onto a half-written line
+        self._needs_newline = bool(content) and not content.endswith("\n")
+
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Partial line from a run killed mid-write
+                continue
+
+            key = cell_key(
+                entry.get("channel"),
+                entry.get("tdd"),
+                entry.get("mcs"),
+                entry.get("test_name")
+            )
+            self._cells[key] = entry
+
+    def import_csv(self, csv_file):
+        """
+        Seed the manifest from dashboard_data.csv rows of this run_id
+        and board_model, for run directories created before
+        checkpointing existed. Run ids are timestamps, so two setups
+        started in the same second share one; the board_model keeps
+        another setup's cells from being marked done here.
+        """
+
+        if self._cells or not os.path.exists(csv_file):
+            return 0
+
+        imported = 0
+
+        with open(csv_file, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("run_id") != self.run_id:
+                    continue
+                if row.get("board_model") != self.board_model:
+                    continue
+
+                self.record(
+                    row.get("channel"),
+                    row.get("tdd"),
+                    row.get("mcs"),
+                    row.get("test_name"),
+                    status=row.get("status"),
+                    source="csv"
+                )
+                imported += 1
+
+        return imported
+
+    # -----------------------------------------
+    # Query / Record
+    # -----------------------------------------
+
+    def is_completed(self, channel, tdd, mcs, test_name):
+        return cell_key(channel, tdd, mcs, test_name) in self._cells
+
+    def completed(self):
+        return list(self._cells.values())
+
+    def record(self, channel, tdd, mcs, test_name, status="PASS", **extra):
+        entry = {
+            "channel": str(channel),
+            "tdd": str(tdd),
+            "mcs": str(mcs),
+            "test_name": str(test_name),
+            "status": status,
+            "completed_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        entry.update(extra)
+
+        with self._lock:
+            os.makedirs(self.result_dir, exist_ok=True)
+
+            with open(self.path, "a") as f:
+                if self._needs_newline:
+                    f.write("\n")
+                    self._needs_newline = False
+
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._cells[cell_key(channel, tdd, mcs, test_name)] = entry
+
+        return entry
+
+
+def resolve_run_dir(model_dir, run_id):
+    """
+    Map a resume request to an existing run directory under
+    results/<PTP_SETUP>. run_id is a folder name, a path, or "latest".
+    """
+
+    if os.path.isdir(run_id):
+        return run_id
+
+    if run_id.lower() == "latest":
+        if not os.path.isdir(model_dir):
+            raise FileNotFoundError(f"No runs found under {model_dir}")
+
+        runs = sorted(
+            name for name in os.listdir(model_dir)
+            if os.path.isdir(os.path.join(model_dir, name))
+        )
+
+        if not runs:
+            raise FileNotFoundError(f"No runs found under {model_dir}")
+
+        # Run folders are %Y%m%d_%H%M%S so name order is time order
+        return os.path.join(model_dir, runs[-1])
+
+    run_dir = os.path.join(model_dir, run_id)
+
+    if not os.path.isdir(run_dir):
+        raise FileNotFoundError(f"Run directory not found: {run_dir}")
+
+    return run_dir
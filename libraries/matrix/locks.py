@@ -0,0 +1,203 @@
+import json
+import os
+import socket
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from libraries.iperf.ssh_pool import PROJECT_ROOT
+
+
+LOCK_DIR = os.environ.get(
+    "CNWAVE_LOCK_DIR",
+    os.path.join(PROJECT_ROOT, "results", ".locks")
+)
+
+
+class LockTimeoutError(Exception):
+    """Raised when a shared testbed resource stays locked past the timeout"""
+    pass
+
+
+def _try_lock(f):
+    """Non-blocking exclusive OS lock on an open file; False if held elsewhere."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ResourceLockManager:
+    """
+    Cross-process locks for shared testbed resources (bridge routers,
+    traffic PCs), one lock file per resource in a shared directory.
+
+    Each lock is an OS file lock (fcntl.flock on Linux, msvcrt.locking
+    on Windows) on the resource's lock file, held for as long as the
+    file stays open. The OS drops it when the holder exits or is
+    killed, so a dead worker can't wedge the testbed and no liveness
+    check of other processes is needed. The holder's host, pid and
+    start time go to a .owner file next to it, for timeout messages.
+    """
+
+    def __init__(self, lock_dir=LOCK_DIR, owner=None):
+        self.lock_dir = lock_dir
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+
+        # name -> open lock file
+        self._held = {}
+
+        os.makedirs(lock_dir, exist_ok=True)
+
+    def _path(self, name, suffix=".lock"):
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        return os.path.join(self.lock_dir, f"{safe}{suffix}")
+
+    # -----------------------------------------
+    # Single Resource
+    # -----------------------------------------
+
+    def _read(self, name):
+        try:
+            with open(self._path(name, ".owner"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def try_acquire(self, name):
+        if name in self._held:
+            return True
+
+        # The lock file itself is never removed: removing it would let
+        # two processes lock different files under the same name
+        f = open(self._path(name), "a+")
+        if not _try_lock(f):
+            f.close()
+            return False
+
+        with open(self._path(name, ".owner"), "w") as owner:
+            json.dump({
+                "owner": self.owner,
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "acquired_at": time.time()
+            }, owner)
+
+        self._held[name] = f
+        return True
+
+    def release(self, name):
+        f = self._held.pop(name, None)
+        if f is None:
+            return
+
+        info = self._read(name)
+        if info is None or info.get("owner") == self.owner:
+            try:
+                os.remove(self._path(name, ".owner"))
+            except FileNotFoundError:
+                pass
+
+        try:
+            _unlock(f)
+        finally:
+            f.close()
+
+    def holds(self, name):
+        return name in self._held
+
+    def holder(self, name):
+        """Owner recorded by the last holder; may outlive a killed one."""
+        info = self._read(name)
+        return info.get("owner") if info else None
+
+    # -----------------------------------------
+    # Resource Sets
+    # -----------------------------------------
+
+    def acquire_all(self, names, timeout=3600, interval=2):
+        """
+        Acquire every lock in names or none of them. Locks are taken in
+        sorted order and dropped again if any is busy, so two workers
+        asking for overlapping sets can't deadlock.
+        """
+
+        names = sorted(set(names))
+        deadline = time.time() + float(timeout)
+
+        while True:
+            taken = []
+
+            for name in names:
+                if self.holds(name):
+                    continue
+                if not self.try_acquire(name):
+                    break
+                taken.append(name)
+            else:
+                return names
+
+            for name in taken:
+                self.release(name)
+
+            if time.time() >= deadline:
+                busy = {n: self.holder(n) for n in names if self.holder(n)}
+                raise LockTimeoutError(
+                    f"Timed out after {timeout}s waiting for testbed locks: {busy}"
+                )
+
+            time.sleep(float(interval))
+
+    def release_all(self, names=None):
+        for name in list(self._held if names is None else names):
+            self.release(name)
+
+
+# -----------------------------------------
+# Resource Mapping
+# -----------------------------------------
+
+def controller_key(pop_device):
+    # V5000POP -> pop_v5000, same rule as Full Pre-Setup
+    return "pop_" + pop_device.replace("POP", "").lower()
+
+
+def setup_resources(setup):
+    """Resources a PTP setup needs for its whole run (radios, controller)."""
+    pop_device = setup["pop_side"]["device"]
+    cn_device = setup["cn_side"]["device"]
+
+    return {
+        f"radio:{pop_device}",
+        f"radio:{cn_device}",
+        f"controller:{controller_key(pop_device)}"
+    }
+
+
+def traffic_resources(setup, traffic_pc):
+    """Shared resources held only while traffic runs (bridge + PCs)."""
+    resources = {"ubuntu:pop", "ubuntu:dn"}
+
+    for side in ("pop_side", "cn_side"):
+        resources.add(f"router:{setup[side]['router']}")
+        resources.add(f"router:{traffic_pc[side]['router']}")
+
+    return resources
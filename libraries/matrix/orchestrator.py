@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import os
+import subprocess
+import sys
+import time
+
+import yaml
+
+from libraries.iperf.ssh_pool import PROJECT_ROOT
+from libraries.matrix.locks import setup_resources, LOCK_DIR
+
+
+PTP_SETUPS_FILE = os.path.join(PROJECT_ROOT, "mikrotik", "ptp_setups.yaml")
+
+
+def load_ptp_setups(path=PTP_SETUPS_FILE):
+    with open(path, "r") as f:
+        return (yaml.safe_load(f) or {}).get("ptp_setups", {})
+
+
+class SetupWorker:
+
+    def __init__(self, name, resources, command, output_dir):
+        self.name = name
+        self.resources = resources
+        self.command = command
+        self.output_dir = output_dir
+
+        self.process = None
+        self.log_file = None
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.log_file = open(os.path.join(self.output_dir, "console.log"), "w")
+        self.started_at = time.time()
+
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=PROJECT_ROOT,
+            stdout=self.log_file,
+            stderr=subprocess.STDOUT
+        )
+
+    def poll(self):
+        rc = self.process.poll()
+
+        if rc is not None and self.finished_at is None:
+            self.finished_at = time.time()
+            self.log_file.close()
+
+        return rc
+
+    @property
+    def duration(self):
+        end = self.finished_at or time.time()
+        return end - self.started_at if self.started_at else 0
+
+
+class MultiSetupOrchestrator:
+    """
+    Runs one Robot worker process per PTP setup.
+
+    Setups that share a radio or a controller never run together. The
+    bridge routers and traffic PCs are shared by every setup, so workers
+    run with PARALLEL_WORKER=True and take the testbed lock (see
+    LockLib) only around their traffic phase. Workers never disable
+    another setup's PoP-side bridge port, which carries its controller
+    traffic; the lock holder only narrows the CN-side bridge to its own
+    link. Link bring-up, TDD/MCS changes and stabilization of one setup
+    therefore overlap with traffic on another.
+    """
+
+    def __init__(self, suites, setups=None, workers=2, robot_args=None,
+                 ptp_setups_file=PTP_SETUPS_FILE, poll_interval=5):
+
+        all_setups = load_ptp_setups(ptp_setups_file)
+
+        names = setups or list(all_setups)
+        unknown = [n for n in names if n not in all_setups]
+        if unknown:
+            raise ValueError(f"Unknown PTP setups: {unknown}")
+
+        self.suites = suites
+        self.setups = {name: all_setups[name] for name in names}
+        self.workers = int(workers)
+        self.robot_args = robot_args or []
+        self.poll_interval = float(poll_interval)
+
+        self.stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def _command(self, name, output_dir):
+        return [
+            sys.executable, "-m", "robot",
+            "--outputdir", output_dir,
+            "--variable", f"PTP_SETUP:{name}",
+            "--variable", "PARALLEL_WORKER:True",
+            *self.robot_args,
+            *self.suites
+        ]
+
+    def _worker(self, name):
+        # Kept out of results/<setup>/ so RESUME_RUN:latest never picks it
+        output_dir = os.path.join(
+            PROJECT_ROOT, "results", "orchestrator", self.stamp, name
+        )
+        return SetupWorker(
+            name,
+            setup_resources(self.setups[name]),
+            self._command(name, output_dir),
+            output_dir
+        )
+
+    def conflicts(self):
+        """Pairs of setups that can never overlap and the shared resources."""
+        names = list(self.setups)
+        pairs = []
+
+        for i, a in enumerate(names):
+            for b in names[i + 1:]:
+                shared = setup_resources(self.setups[a]) & setup_resources(self.setups[b])
+                if shared:
+                    pairs.append((a, b, sorted(shared)))
+
+        return pairs
+
+    def run(self):
+        pending = [self._worker(name) for name in self.setups]
+        running = []
+        finished = []
+
+        print(f"Lock directory: {LOCK_DIR}")
+
+        while pending or running:
+
+            for worker in list(running):
+                rc = worker.poll()
+                if rc is not None:
+                    running.remove(worker)
+                    finished.append(worker)
+                    print(f"[{worker.name}] finished rc={rc} "
+                          f"in {worker.duration / 60:.1f} min")
+
+            busy = set()
+            for worker in running:
+                busy |= worker.resources
+
+            # Start in declared order, skipping setups that clash with a
+            # running one so later independent setups aren't held back
+            for worker in list(pending):
+                if len(running) >= self.workers:
+                    break
+                if worker.resources & busy:
+                    continue
+
+                worker.start()
+                pending.remove(worker)
+                running.append(worker)
+                busy |= worker.resources
+
+                print(f"[{worker.name}] started -> {worker.output_dir}")
+
+            if pending or running:
+                time.sleep(self.poll_interval)
+
+        return finished
+
+    def summary(self, finished):
+        lines = ["===== Multi-setup summary ====="]
+        for worker in finished:
+            status = "PASS" if worker.process.returncode == 0 else "FAIL"
+            lines.append(
+                f"{worker.name:<22} {status:<5} rc={worker.process.returncode:<3} "
+                f"{worker.duration / 60:.1f} min  {worker.output_dir}"
+            )
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a matrix suite across several PTP setups in parallel",
+        epilog="Arguments after -- are passed to robot unchanged"
+    )
+    parser.add_argument("suites", nargs="+", help="Robot suite files")
+    parser.add_argument("--setups", nargs="*", help="PTP setups (default: all)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--plan", action="store_true",
+                        help="Only print which setups conflict")
+
+    argv = sys.argv[1:] if argv is None else argv
+    robot_args = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, robot_args = argv[:index], argv[index + 1:]
+
+    args = parser.parse_args(argv)
+
+    orchestrator = MultiSetupOrchestrator(
+        args.suites,
+        setups=args.setups,
+        workers=args.workers,
+        robot_args=robot_args
+    )
+
+    if args.plan:
+        for a, b, shared in orchestrator.conflicts():
+            print(f"{a} <-> {b}: {', '.join(shared)}")
+        return 0
+
+    finished = orchestrator.run()
+    print(orchestrator.summary(finished))
+
+    return max((w.process.returncode for w in finished), default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
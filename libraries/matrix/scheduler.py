@@ -0,0 +1,261 @@
+import itertools
+import sys
+
+
+# Relative cost (seconds) of each reconfiguration on a CB1/CB2 matrix.
+# A TDD change pushes network overrides and then waits for the link to
+# drop, come back and hold for the 60 s stability window; an MCS change
+# only pushes node overrides and waits for the link to be active again.
+CHANNEL_CHANGE_COST = 600
+TDD_CHANGE_COST = 150
+MCS_CHANGE_COST = 15
+
+# 9 iperf runs (TCP 4S/1S, UDP x DL/UL/Bidir) of 60 s + setup each
+TRAFFIC_TESTS_PER_CELL = 9
+TRAFFIC_TEST_COST = 65
+
+# Above this many (channel, tdd) groups fall back to the given order
+MAX_PERMUTED_GROUPS = 7
+
+
+def _mcs_entry_changes(mcs_values, prev_mcs, last_mcs):
+    """MCS pushes needed to visit every value in a group ending on last_mcs."""
+    if len(mcs_values) == 1:
+        return 0 if prev_mcs == last_mcs else 1
+
+    # k values need k-1 changes, plus one on entry unless we can start
+    # on the MCS the previous group left behind
+    starts_free = prev_mcs in mcs_values and prev_mcs != last_mcs
+    return len(mcs_values) - 1 + (0 if starts_free else 1)
+
+
+def _order_group(cells, prev_mcs, last_mcs):
+    """Order one (channel, tdd) group: start on prev_mcs, end on last_mcs."""
+    mcs_order = []
+    for cell in cells:
+        if cell["mcs"] not in mcs_order:
+            mcs_order.append(cell["mcs"])
+
+    middle = [m for m in mcs_order if m not in (prev_mcs, last_mcs)]
+    ordered_mcs = []
+
+    if prev_mcs in mcs_order and prev_mcs != last_mcs:
+        ordered_mcs.append(prev_mcs)
+
+    ordered_mcs += middle
+    ordered_mcs.append(last_mcs)
+
+    return [cell for mcs in ordered_mcs for cell in cells if cell["mcs"] == mcs]
+
+
+class MatrixScheduler:
+    """
+    Orders a channel x TDD x MCS scenario matrix so the expensive
+    reconfigurations happen as rarely as possible.
+
+    Cells are dicts with at least channel, tdd and mcs keys (anything
+    else, e.g. the Robot test object, is carried through). Each
+    (channel, tdd) group is visited once and MCS values are chained
+    across group boundaries, so the MCS left by one group is reused as
+    the first MCS of the next where possible.
+    """
+
+    def __init__(self, channel_change_cost=CHANNEL_CHANGE_COST,
+                 tdd_change_cost=TDD_CHANGE_COST,
+                 mcs_change_cost=MCS_CHANGE_COST,
+                 traffic_tests_per_cell=TRAFFIC_TESTS_PER_CELL,
+                 traffic_test_cost=TRAFFIC_TEST_COST):
+
+        self.channel_change_cost = float(channel_change_cost)
+        self.tdd_change_cost = float(tdd_change_cost)
+        self.mcs_change_cost = float(mcs_change_cost)
+        self.cell_cost = float(traffic_tests_per_cell) * float(traffic_test_cost)
+
+    # -----------------------------------------
+    # Planning
+    # -----------------------------------------
+
+    def _groups(self, cells):
+        groups = {}
+        for cell in cells:
+            groups.setdefault((cell.get("channel"), str(cell["tdd"])), []).append(cell)
+        return groups
+
+    def _group_entry_cost(self, key, prev_key):
+        # Unknown starting config always pays the first TDD push
+        if prev_key is None:
+            return self.tdd_change_cost
+        cost = 0
+        if key[0] != prev_key[0]:
+            cost += self.channel_change_cost
+        if key[1] != prev_key[1]:
+            cost += self.tdd_change_cost
+        return cost
+
+    def _best_for_order(self, order, groups, current_key, current_mcs):
+        # DP over the MCS each group finishes on. States and MCS values
+        # are visited in authored order and only a strictly cheaper plan
+        # replaces one, so ties go to the authored order (not hash order)
+        states = {current_mcs: (0.0, [])}
+        prev_key = current_key
+
+        for key in order:
+            mcs_values = list(dict.fromkeys(cell["mcs"] for cell in groups[key]))
+            entry = self._group_entry_cost(key, prev_key)
+
+            next_states = {}
+            for prev_mcs, (cost, path) in states.items():
+                for last_mcs in mcs_values:
+                    changes = _mcs_entry_changes(mcs_values, prev_mcs, last_mcs)
+                    total = cost + entry + changes * self.mcs_change_cost
+                    if last_mcs not in next_states or total < next_states[last_mcs][0]:
+                        next_states[last_mcs] = (total, path + [(key, prev_mcs, last_mcs)])
+
+            states = next_states
+            prev_key = key
+
+        return min(states.values(), key=lambda state: state[0])
+
+    def plan(self, cells, current_channel=None, current_tdd=None, current_mcs=None):
+        """
+        Return the execution order as a list of steps:
+        {cell, change_channel, change_tdd, change_mcs, reconfig_cost}
+        """
+
+        if not cells:
+            return []
+
+        cells = [dict(cell, mcs=str(cell["mcs"]), tdd=str(cell["tdd"])) for cell in cells]
+        groups = self._groups(cells)
+
+        current_key = None
+        if current_tdd is not None:
+            current_key = (current_channel, str(current_tdd))
+        current_mcs = None if current_mcs is None else str(current_mcs)
+
+        keys = list(groups)
+
+        if len(keys) <= MAX_PERMUTED_GROUPS:
+            candidates = itertools.permutations(keys)
+        else:
+            # Too many groups to search: keep authored order, but start
+            # on the group already configured on the controller
+            keys.sort(key=lambda k: k != current_key)
+            candidates = [keys]
+
+        # permutations() yields the authored order first; on equal cost
+        # the earlier candidate is kept
+        best = None
+        for order in candidates:
+            result = self._best_for_order(order, groups, current_key, current_mcs)
+            if best is None or result[0] < best[0]:
+                best = result
+
+        ordered = []
+        for key, prev_mcs, last_mcs in best[1]:
+            ordered += _order_group(groups[key], prev_mcs, last_mcs)
+
+        return self._annotate(ordered, current_channel, current_key, current_mcs)
+
+    def _annotate(self, ordered, current_channel, current_key, current_mcs):
+        steps = []
+        channel = current_channel if current_key else None
+        tdd = current_key[1] if current_key else None
+        mcs = current_mcs
+
+        for cell in ordered:
+            change_channel = channel is not None and cell.get("channel") != channel
+            change_tdd = tdd is None or change_channel or cell["tdd"] != tdd
+            change_mcs = mcs is None or cell["mcs"] != mcs
+
+            cost = 0.0
+            if change_channel:
+                cost += self.channel_change_cost
+            if change_tdd:
+                cost += self.tdd_change_cost
+            if change_mcs:
+                cost += self.mcs_change_cost
+
+            steps.append({
+                "cell": cell,
+                "change_channel": change_channel,
+                "change_tdd": change_tdd,
+                "change_mcs": change_mcs,
+                "reconfig_cost": cost
+            })
+
+            channel, tdd, mcs = cell.get("channel"), cell["tdd"], cell["mcs"]
+
+        return steps
+
+    # -----------------------------------------
+    # Estimation / Reporting
+    # -----------------------------------------
+
+    def estimate(self, steps):
+        reconfig = sum(step["reconfig_cost"] for step in steps)
+        traffic = self.cell_cost * len(steps)
+
+        return {
+            "cells": len(steps),
+            "tdd_changes": sum(1 for step in steps if step["change_tdd"]),
+            "mcs_changes": sum(1 for step in steps if step["change_mcs"]),
+            "reconfig_seconds": reconfig,
+            "traffic_seconds": traffic,
+            "total_seconds": reconfig + traffic
+        }
+
+    def format_report(self, steps, baseline=None):
+        lines = ["#   Cell                                  TDD   MCS   Reconfig (s)"]
+
+        for index, step in enumerate(steps, start=1):
+            cell = step["cell"]
+            lines.append(
+                f"{index:<3} {str(cell.get('name', '')):<37} "
+                f"{'*' if step['change_tdd'] else '-':<5} "
+                f"{'*' if step['change_mcs'] else '-':<5} "
+                f"{step['reconfig_cost']:.0f}"
+            )
+
+        est = self.estimate(steps)
+        lines.append(
+            f"Estimated duration: {est['total_seconds'] / 60:.1f} min "
+            f"({est['tdd_changes']} TDD / {est['mcs_changes']} MCS changes, "
+            f"{est['reconfig_seconds'] / 60:.1f} min reconfiguration)"
+        )
+
+        if baseline is not None:
+            base = self.estimate(baseline)
+            saved = base["total_seconds"] - est["total_seconds"]
+            lines.append(
+                f"Authored order: {base['total_seconds'] / 60:.1f} min "
+                f"| saved {saved / 60:.1f} min"
+            )
+
+        return "\n".join(lines)
+
+    def authored_steps(self, cells, current_channel=None, current_tdd=None,
+                       current_mcs=None):
+        """Steps for the cells in their given order, for comparison."""
+        cells = [dict(cell, mcs=str(cell["mcs"]), tdd=str(cell["tdd"])) for cell in cells]
+        current_key = None if current_tdd is None else (current_channel, str(current_tdd))
+        current_mcs = None if current_mcs is None else str(current_mcs)
+        return self._annotate(cells, current_channel, current_key, current_mcs)
+
+
+if __name__ == "__main__":
+    # Dry run: python -m libraries.matrix.scheduler cnwave/cnwave_cb1_matrix.robot
+    from robot.api import TestSuiteBuilder
+    from libraries.matrix.MatrixOrder import collect_cells
+
+    scheduler = MatrixScheduler()
+
+    for path in sys.argv[1:]:
+        suite = TestSuiteBuilder().build(path)
+        cells = collect_cells(suite)
+
+        print(f"===== {suite.name} =====")
+        print(scheduler.format_report(
+            scheduler.plan(cells),
+            baseline=scheduler.authored_steps(cells)
+        ))
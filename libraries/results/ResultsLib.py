@@ -0,0 +1,60 @@
+from performance.results_store import ResultsStore, DB_FILE
+from libraries.cnwave.logger import setup_logger
+
+
+class ResultsLib:
+
+    ROBOT_LIBRARY_SCOPE = "GLOBAL"
+
+    def __init__(self, db_file=DB_FILE):
+        self.logger = setup_logger()
+        self.db_file = db_file
+        self.store = None
+
+    # --------------------------------
+    # STORE
+    # --------------------------------
+    def open_results_store(self, db_file=None, csv_file=None):
+        """Open the store; an empty store is seeded from csv_file history."""
+
+        self.store = ResultsStore(db_file or self.db_file)
+
+        if csv_file and self.store.count() == 0:
+            imported = self.store.import_csv(csv_file)
+            if imported:
+                self.logger.info(f"Imported {imported} rows from {csv_file}")
+
+        self.logger.info(f"Results store: {self.store.db_file}")
+        return self.store.db_file
+
+    # --------------------------------
+    # RESULTS
+    # --------------------------------
+    def record_result(self, timestamp, board_model, run_id, channel, tdd, mcs,
+                      test_name, sent_avg, recv_avg, status, pop_version="",
+                      dn_version="", duration_s=None, confidence_pct=None):
+
+        if self.store is None:
+            self.open_results_store()
+
+        stored = self.store.insert({
+            "timestamp": timestamp,
+            "board_model": board_model,
+            "run_id": run_id,
+            "channel": channel,
+            "tdd": tdd,
+            "mcs": mcs,
+            "test_name": test_name,
+            "sent_avg": sent_avg,
+            "recv_avg": recv_avg,
+            "status": status,
+            "pop_version": pop_version,
+            "dn_version": dn_version,
+            "duration_s": duration_s,
+            "confidence_pct": confidence_pct
+        })
+
+        if not stored:
+            self.logger.warning(f"{test_name} at {timestamp} already in results store")
+
+        return stored
@@ -2,27 +2,37 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
 RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+import sys
+import threading
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 import io
+import base64
+import gzip
+import itertools
+import json
 import pandas as pd
-from flask import Flask, render_template, request, send_file, jsonify
+from functools import wraps
+from flask import Flask, Response, render_template, request, send_file, jsonify
 from waitress import serve
-import yaml
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-plt.rcParams.update({
-    "font.family": "Segoe UI",   # Windows-safe
-    "font.size": 12,
-    "axes.titlesize": 14,
-    "axes.labelsize": 12,
-    "xtick.labelsize": 10,
-    "ytick.labelsize": 10,
-    "legend.fontsize": 10,
-})
-
-import numpy as np
-from matplotlib.patches import FancyBboxPatch
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from performance.results_store import (
+    ResultsStore, DB_FILE, TEXT_COLS, CATEGORY_COLS, REAL_COLUMNS, GROUPINGS,
+    SORT_KEYS, normalize_frame, filter_frame, aggregate_frame, page_frame,
+    summary_frame, gains_frame
+)
+from performance.graph_cache import GraphCache
+from performance import downsample, export, graphs, rendering
+from performance.render_service import RenderService
+from performance.run_catalog import RunCatalog
+
+# Set once here; routes draw on their own Figure objects (thread-safe)
+rendering.configure(rendering.DASHBOARD_STYLE)
 
 app = Flask(__name__)
 
@@ -30,199 +40,344 @@ CSV_FILE = os.path.join(PROJECT_ROOT, "dashboard_data.csv")
 
 
 
+def _concat_frames(old, new):
+    # Keep categoricals categorical: concat of differing categories is object
+    for col in CATEGORY_COLS:
+        if col in old.columns and col in new.columns:
+            merged = pd.api.types.union_categoricals(
+                [old[col], new[col]], ignore_order=True
+            ).categories
+            old[col] = old[col].cat.set_categories(merged)
+            new[col] = new[col].cat.set_categories(merged)
+
+    return pd.concat([old, new], ignore_index=True)
+
+
+class CsvFrameCache:
+    """
+    Parsed, normalized dashboard_data.csv shared by all requests.
+
+    The file is only stat'ed per request. Appended rows (the normal case:
+    Log Raw Results appends one row per test) are parsed from the last
+    read offset; anything else (truncation, a rewritten header, a new
+    inode) triggers a full reload.
+    """
+
+    def __init__(self, csv_file):
+        self.csv_file = csv_file
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.frame = pd.DataFrame()
+        self.header = None
+        self.offset = 0
+        self.signature = None
+
+    def _parse(self, f, columns):
+        f.seek(self.offset)
+        data = f.read()
+
+        # A writer may be mid-row: leave the partial line for next time
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return None
+
+        self.offset += end
+
+        # Text columns as written, so chunks don't infer 2 vs 2.0
+        frame = pd.read_csv(
+            io.BytesIO(data[:end]),
+            header=None,
+            names=columns,
+            dtype={col: str for col in TEXT_COLS + CATEGORY_COLS if col in columns},
+            on_bad_lines="skip"
+        )
+        return normalize_frame(frame)
+
+    def _refresh(self, stat):
+        with open(self.csv_file, "rb") as f:
+            header = f.readline()
+
+            if self.header is not None and (
+                header != self.header
+                or stat.st_ino != self.signature[0]
+                or stat.st_size < self.offset
+            ):
+                self._reset()
+
+            if self.header is None:
+                if not header.endswith(b"\n"):
+                    return
+                self.header = header
+                self.offset = len(header)
+
+            columns = self.header.decode().strip().split(",")
+            new_rows = self._parse(f, columns)
+
+        if new_rows is None:
+            return
+
+        if self.frame.empty:
+            self.frame = new_rows
+        elif not new_rows.empty:
+            self.frame = _concat_frames(self.frame, new_rows)
+
+    def load(self):
+        try:
+            stat = os.stat(self.csv_file)
+        except FileNotFoundError:
+            with self.lock:
+                self._reset()
+            return pd.DataFrame()
+
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self.lock:
+            if signature != self.signature:
+                self._refresh(stat)
+                self.signature = signature
+
+            # Routes add and overwrite columns on their copy
+            return self.frame.copy()
+
+
+_csv_cache = CsvFrameCache(CSV_FILE)
+
+
 def load_csv():
-    if not os.path.exists(CSV_FILE):
-        return pd.DataFrame()
-    return pd.read_csv(CSV_FILE, on_bad_lines="skip")
+    return _csv_cache.load()
 
-# =====================================================
-# NEW: Load Board Models from ptp_setups.yaml
-# =====================================================
-def get_board_models():
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    yaml_file = os.path.abspath(
-        os.path.join(BASE_DIR, "..", "mikrotik", "ptp_setups.yaml")
-    )
+_store = None
 
-    if not os.path.exists(yaml_file):
-        print("YAML NOT FOUND")
-        return []
+def get_store():
+    """The SQLite results store, once a run (or the importer) created it."""
+    global _store
+    if _store is None and os.path.exists(DB_FILE):
+        _store = ResultsStore(DB_FILE)
+    return _store
 
-    with open(yaml_file, "r") as f:
-        data = yaml.safe_load(f)
 
-    if not data or "ptp_setups" not in data:
-        print("ptp_setups key missing")
-        return []
+def has_results():
+    return get_store() is not None or os.path.exists(CSV_FILE)
 
-    return list(data["ptp_setups"].keys())
 
+def load_results(columns=None, **filters):
+    """
+    Normalized result rows, filtered in SQL when the results store
+    exists. Falls back to the cached dashboard_data.csv frame (filters
+    are then applied by the routes themselves, which they still do in
+    both cases). columns limits what is read from the store.
+    """
+    store = get_store()
+    if store is None:
+        return load_csv()
 
-# =====================================================
+    filters = {k: v.strip() if isinstance(v, str) else v for k, v in filters.items()}
+    return normalize_frame(store.query(columns=columns, **filters))
 
-def get_runs_for_model(board_model):
-    if not board_model:
-        return []
 
-    model_path = os.path.join(RESULTS_DIR, board_model)
+def load_summary(**filters):
+    """run_summary rows; computed from the cached CSV without a store."""
+    store = get_store()
+    filters = {k: v.strip() if isinstance(v, str) else v for k, v in filters.items()}
+
+    if store is None:
+        return summary_frame(filter_frame(load_csv(), **filters))
+
+    return store.summary(**filters)
+
 
-    if not os.path.exists(model_path):
-        return []
+def data_version(**filters):
+    """Changes when rows matching filters are added (any row, for the CSV)."""
+    store = get_store()
+    if store is not None:
+        filters = {k: v.strip() if isinstance(v, str) else v for k, v in filters.items()}
+        return store.version(**filters)
 
-    runs = [
-        folder for folder in os.listdir(model_path)
-        if os.path.isdir(os.path.join(model_path, folder))
-    ]
+    try:
+        stat = os.stat(CSV_FILE)
+    except FileNotFoundError:
+        return "no-data"
+    return f"{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
 
-    return sorted(runs, reverse=True)
 # =====================================================
-def generate_message_image(message):
-    plt.figure(figsize=(8, 3))
-    plt.style.use("dark_background")
-    plt.text(0.5, 0.5,
-             message,
-             ha='center', va='center', fontsize=11)
-    plt.xticks([])
-    plt.yticks([])
-    plt.tight_layout()
-
-    img = io.BytesIO()
-    plt.savefig(img, format="png", facecolor="#0b1220")
-    plt.close()
-    img.seek(0)
-
-    return send_file(img, mimetype="image/png")
+# Rendered graph cache
+# =====================================================
+GRAPH_CACHE = GraphCache(os.path.join(RESULTS_DIR, ".graph_cache"))
+
+# Precomputes standard run graphs in worker processes; 0 disables it
+RENDER_WORKERS = int(os.environ.get("DASHBOARD_RENDER_WORKERS", "2"))
+RENDER_SERVICE = None
+
+
+def graph_response(data, etag):
+    response = Response(data, mimetype="image/png")
+    response.set_etag(etag)
+    # Revalidate every time; unchanged images cost a 304
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def cached_graph(version_of):
+    """
+    Serve a PNG route from GRAPH_CACHE. version_of(args) returns the
+    data version of what the route would plot for those query args.
+    """
+    def decorator(route):
+        @wraps(route)
+        def wrapper():
+            args = request.args.to_dict()
+            version = version_of(args)
+            key = GRAPH_CACHE.make_key(request.path, args, version)
+
+            if key in request.if_none_match:
+                response = Response(status=304)
+                response.set_etag(key)
+                return response
+
+            data = GRAPH_CACHE.get(key)
+
+            precomputed = None
+            if data is None and RENDER_SERVICE is not None:
+                precomputed = RENDER_SERVICE.lookup(request.endpoint, args, version)
+
+            if precomputed:
+                with open(precomputed, "rb") as f:
+                    data = f.read()
+                GRAPH_CACHE.put(key, data)
+
+            elif data is None:
+                response = route()
+                if response.status_code != 200 or response.mimetype != "image/png":
+                    return response
+
+                # send_file responses stream; read them to cache the bytes
+                response.direct_passthrough = False
+                data = response.get_data()
+                GRAPH_CACHE.put(key, data)
+
+            return graph_response(data, key)
+        return wrapper
+    return decorator
 
-# ==========================================
-# HTML Dashboard Route
+# =====================================================
+# NEW: Load Board Models from ptp_setups.yaml
+# =====================================================
+# Setups, runs and run artifacts, kept in memory between requests
+CATALOG = RunCatalog(RESULTS_DIR)
 
-@app.route("/")
-def home():
 
-    selected_model = request.args.get("board_model")
-    selected_run = request.args.get("run")
+def get_board_models():
+    return CATALOG.setups()
 
-    channel = request.args.get("channel")
-    tdd = request.args.get("tdd")
-    mcs = request.args.get("mcs")
 
-    board_models = get_board_models()
-    runs = get_runs_for_model(selected_model)
+# =====================================================
 
-    df = load_csv()
+def get_runs_for_model(board_model):
+    return CATALOG.runs(board_model)
+# =====================================================
+def png_bytes_response(data):
+    return send_file(io.BytesIO(data), mimetype="image/png")
 
-    if df.empty:
-        return render_template(
-            "index.html",
-            data=[],
-            tests=[],
-            selected_test=None,
-            pass_rate=0,
-            last_run=None,
-            devices=[],
-            board_models=board_models,
-            selected_model=selected_model,
-            runs=runs,
-            selected_run=selected_run,
-            failed_cases=[]
-        )
 
-    # -----------------------------
-    # Normalize structured columns
-    # -----------------------------
-    normalize_cols = ["run_id", "board_model", "channel", "tdd", "mcs", "test_name", "pop_version", "dn_version"]
-    for col in normalize_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+def generate_message_image(message):
+    return png_bytes_response(graphs.message_png(message))
+
+# ==========================================
+# HTML Dashboard Route
+
+def frame_overview(df, test_name=None, start=None, end=None):
+    """
+    (test names, ResultsStore.overview()) computed from a normalized
+    frame, for the CSV fallback. The test names ignore test/date filters.
+    """
 
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
     df = df.sort_values("timestamp")
+    tests = df["test_name"].dropna().unique().tolist()
 
-    test_filter = request.args.get("test_name")
-    start_date = request.args.get("start")
-    end_date = request.args.get("end")
+    df = filter_frame(df, start=start, end=end, test_name=test_name)
+    status = df["status"].astype(str).str.strip().str.upper()
 
-    # -----------------------------
-    # Structured Filtering
-    # -----------------------------
+    last = None
+    if len(df) > 0:
+        last = df.iloc[-1].to_dict()
 
-    if selected_model:
-        df = df[df["board_model"] == selected_model]
+        # Latest known version, even if the last row has none
+        for col in ("pop_version", "dn_version"):
+            known = df[col].dropna() if col in df.columns else []
+            last[col] = known.iloc[-1] if len(known) else None
 
-    if selected_run:
-        df = df[df["run_id"] == selected_run]
+    return tests, {
+        "count": len(df),
+        "pass_count": int((status == "PASS").sum()),
+        "fail_count": int((status == "FAIL").sum()),
+        "last": last,
+    }
 
-    if channel and "channel" in df.columns:
-        df = df[df["channel"] == channel]
 
-    if tdd and "tdd" in df.columns:
-        df = df[df["tdd"] == tdd]
+@app.route("/")
+def home():
 
-    if mcs and "mcs" in df.columns:
-        df = df[df["mcs"] == mcs]
+    selected_model = request.args.get("board_model")
+    selected_run = request.args.get("run")
 
-    # -----------------------------
-    # Build dropdown list BEFORE applying test filter
-    # -----------------------------
-    dropdown_df = df.copy()
-    all_tests = dropdown_df["test_name"].dropna().unique().tolist()
+    channel = request.args.get("channel")
+    tdd = request.args.get("tdd")
+    mcs = request.args.get("mcs")
 
-    # -----------------------------
-    # Exact test match (apply only to main df)
-    # -----------------------------
-    if test_filter:
-        df = df[df["test_name"] == test_filter]
+    test_filter = request.args.get("test_name")
+    start_date = request.args.get("start")
+    end_date = request.args.get("end")
 
-    # -----------------------------
-    # Date Filtering (Corrected)
-    # -----------------------------
-    if start_date:
-        start_date = pd.to_datetime(start_date)
-        df = df[df["timestamp"] >= start_date]
+    board_models = get_board_models()
+    runs = get_runs_for_model(selected_model)
 
-    if end_date:
-        end_date = pd.to_datetime(end_date) + pd.Timedelta(days=1)
-        df = df[df["timestamp"] < end_date]
+    # Test and date filters come later: the test dropdown ignores them
+    filters = {
+        "board_model": selected_model,
+        "run_id": selected_run,
+        "channel": channel,
+        "tdd": tdd,
+        "mcs": mcs,
+    }
+    filters = {k: v.strip() for k, v in filters.items() if v and v.strip()}
+
+    # Counts and the latest row come from SQL; only the CSV fallback
+    # loads the rows themselves
+    store = get_store()
+    if store is not None:
+        all_tests = store.tests(**filters)
+        overview = store.overview(
+            start=start_date, end=end_date, test_name=test_filter, **filters
+        )
+    elif os.path.exists(CSV_FILE):
+        all_tests, overview = frame_overview(
+            filter_frame(load_csv(), **filters), test_filter, start_date, end_date
+        )
+    else:
+        all_tests = []
+        overview = {"count": 0, "pass_count": 0, "fail_count": 0, "last": None}
 
     # -----------------------------
     # PASS RATE
     # -----------------------------
     pass_rate = 0
-    if len(df) > 0:
-        pass_count = len(df[df["status"].str.strip().str.upper() == "PASS"])
-        pass_rate = round((pass_count / len(df)) * 100, 2)
+    if overview["count"] > 0:
+        pass_rate = round((overview["pass_count"] / overview["count"]) * 100, 2)
 
-    last_run = df.iloc[-1].to_dict() if len(df) > 0 else None
     # -----------------------------
     # POP / DN Software Version
     # -----------------------------
-    pop_version = None
-    dn_version = None
-
-    if not df.empty:
-
-        if "pop_version" in df.columns:
-            latest_pop = df["pop_version"].dropna()
-            if not latest_pop.empty:
-                pop_version = latest_pop.iloc[-1]
-
-        if "dn_version" in df.columns:
-            latest_dn = df["dn_version"].dropna()
-            if not latest_dn.empty:
-                dn_version = latest_dn.iloc[-1]
-
-    # -----------------------------
-    # Failed Cases
-    # -----------------------------
-    failed_cases = []
-    if "status" in df.columns:
-        failed_df = df[df["status"].str.strip().str.upper() == "FAIL"]
-        failed_cases = failed_df.to_dict(orient="records")
+    last_run = overview["last"]
+    pop_version = last_run.get("pop_version") if last_run else None
+    dn_version = last_run.get("dn_version") if last_run else None
 
+    # Both tables load their rows from /api/results as they scroll
     return render_template(
         "index.html",
-        data=df.to_dict(orient="records"),
+        record_count=overview["count"],
         tests=all_tests,
         selected_test=test_filter,
         pass_rate=pass_rate,
@@ -235,7 +390,7 @@ def home():
         channel=channel,
         tdd=tdd,
         mcs=mcs,
-        failed_cases=failed_cases,
+        failed_count=overview["fail_count"],
         pop_version=pop_version,
         dn_version=dn_version
     )
@@ -243,627 +398,498 @@ def home():
 # ==========================================
 # JSON API
 # ==========================================
-@app.route("/device_data")
-def device_data():
-    df = load_csv()
+# Default point budget of /device_data; ?points=0 returns every row
+DEVICE_DATA_POINTS = 2000
 
-    if df.empty:
-        return render_template(
-            "index.html",
-            data=[],
-            tests=[],
-            selected_test=None,
-            pass_rate=0,
-            last_run=None,
-            devices=[],
-            board_models=board_models,
-            selected_model=selected_model,
-            runs=runs,
-            selected_run=selected_run
-        )
-
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
 
+def json_body(payload):
+    """Compact JSON bytes; orjson when installed, it is much faster."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
 
-    df = df.sort_values("timestamp")
 
-    device = request.args.get("device")
+def json_response(payload):
+    return Response(json_body(payload), mimetype="application/json")
 
-    if device:
-        df = df[df["test_name"] == device]
 
-    return jsonify([
-        {
-            "timestamp": row["timestamp"].strftime("%H:%M:%S"),
-            "uplink": row["sent_avg"],
-            "downlink": row["recv_avg"],
-            "status": row["status"]
-        }
-        for _, row in df.iterrows()
-    ])
+def _values(series):
+    """Column as a list, NaN as null."""
+    values = series.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    return values.tolist()
 
 
-# ==========================================
-# UPDATED GRAPH LOGIC
-# ==========================================
-# ==========================================
-# UPDATED GRAPH LOGIC (DARK THEME + FIT FIX)
-# ==========================================
-@app.route("/device_graph_image")
-def device_graph_image():
+@app.route("/device_data")
+def device_data():
+    """
+    Time series of one test ("device"), downsampled to ?points rows
+    (LTTB per series; ?method=minmax keeps bucket extremes instead).
+    """
 
-    plt.close('all')
+    try:
+        points = int(request.args.get("points", DEVICE_DATA_POINTS))
+    except ValueError:
+        return "points must be an integer", 400
 
-    # ===============================
-    # SAFE PARAM EXTRACTION FIRST
-    # ===============================
-    selected_model = request.args.get("board_model")
-    selected_run = request.args.get("run")
-    test_filter = request.args.get("test_name")
-    start_date = request.args.get("start")
-    end_date = request.args.get("end")
-    channel = request.args.get("channel") or ""
-    tdd = request.args.get("tdd") or ""
-    mcs = request.args.get("mcs") or ""
+    method = request.args.get("method", "lttb")
 
-    if not os.path.exists(CSV_FILE):
-        return generate_message_image(
-            "For selected filter we can not plot graph"
-        )
+    device = request.args.get("device")
+    df = load_results(
+        columns=["timestamp", "test_name", "sent_avg", "recv_avg", "status"],
+        test_name=device
+    )
 
-    df = load_csv()
     if df.empty:
-        return generate_message_image(
-            "For selected filter we can not plot graph"
-        )
-
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df = df.sort_values("timestamp")
-
-    # ===============================
-    # FILTERING
-    # ===============================
-    if selected_model and selected_run:
-        try:
-            run_time = pd.to_datetime(selected_run, format="%Y%m%d_%H%M%S")
-            run_end = run_time + pd.Timedelta(minutes=10)
-            df = df[(df["timestamp"] >= run_time) &
-                    (df["timestamp"] <= run_end)]
-        except:
-            pass
-
-    if test_filter:
-        df = df[df["test_name"] == test_filter]
+        return json_response([])
 
+    if device:
+        df = df[df["test_name"] == device]
 
-    if start_date:
-        df = df[df["timestamp"] >= pd.to_datetime(start_date)]
-
-    if end_date:
-        df = df[df["timestamp"] <
-                pd.to_datetime(end_date) + pd.Timedelta(days=1)]
+    df = df.sort_values("timestamp", kind="stable")
 
-    if df.empty:
-        return generate_message_image(
-            "For selected filter we can not plot graph"
+    if points and len(df) > points:
+        seconds = df["timestamp"].to_numpy(dtype="datetime64[ns]").astype("int64") / 1e9
+        kept = downsample.downsample_indices(
+            seconds,
+            [df["sent_avg"].to_numpy(dtype=float), df["recv_avg"].to_numpy(dtype=float)],
+            points,
+            method
         )
+        df = df.iloc[kept]
 
-    # ===============================
-    # NUMERIC CLEANING
-    # ===============================
-    sent = pd.to_numeric(df["sent_avg"], errors="coerce")
-    recv = pd.to_numeric(df["recv_avg"], errors="coerce")
-
-    valid_mask = sent.notna() & recv.notna()
-    sent = sent[valid_mask]
-    recv = recv[valid_mask]
-
-    time_series = pd.to_datetime(df["timestamp"])[valid_mask]
-    seconds_axis = (time_series - time_series.min()).dt.total_seconds()
+    columns = zip(
+        _values(df["timestamp"].dt.strftime("%H:%M:%S")),
+        _values(df["sent_avg"]),
+        _values(df["recv_avg"]),
+        _values(df["status"])
+    )
 
+    return json_response([
+        {"timestamp": timestamp, "uplink": uplink, "downlink": downlink, "status": status}
+        for timestamp, uplink, downlink, status in columns
+    ])
 
-    if len(sent) == 0:
-        return generate_message_image(
-            "For selected filter we can not plot graph"
-        )
-        # ===============================
-    # SMOOTHING (Wave Effect)
-    # ===============================
-    sent = sent.rolling(window=3, min_periods=1).mean()
-    recv = recv.rolling(window=3, min_periods=1).mean()
-    # ===============================
-    # ORIGINAL PLOTTING LOGIC (UNCHANGED)
-    # ===============================
-    plt.style.use("dark_background")
-    plt.figure(figsize=(9,4), dpi=120)
-
-    ax = plt.gca()
-    ax.set_facecolor("#0b1220")
-    plt.gcf().set_facecolor("#0b1220")
-
-    plt.xlabel("Time (seconds)", fontsize=8)
-    plt.ylabel("Mbps", fontsize=8)
-    plt.title("iPerf Performance - Selected Run", fontsize=9)
-
-    plt.grid(True, alpha=0.2)
-    plt.xticks(rotation=30)
-    plt.tight_layout(pad=1.2)
-
-    plt.rcParams.update({'font.size': 8})
-
-    # =====================================
-    # KEEPING YOUR ORIGINAL CONDITIONAL LOGIC
-    # =====================================
-    test_name = (test_filter or "").lower()
-
-    is_uplink = "uplink" in test_name
-    is_downlink = "downlink" in test_name
-    is_bidir = "bidir" in test_name or "bidirectional" in test_name
-
-    if is_uplink:
-        avg_val = sent.mean()
-        plt.plot(seconds_axis, sent, color="#f1e208", linewidth=2,
-                 label="Uplink Throughput")
-        plt.axhline(y=avg_val, linestyle="--", color="#f1e208",
-                    label=f"Avg Uplink: {avg_val:.2f} Mbps")
-
-    elif is_downlink:
-        avg_val = sent.mean()
-        plt.plot(seconds_axis, sent, color="#3b82f6", linewidth=2,
-                 label="Downlink Throughput")
-        plt.axhline(y=avg_val, linestyle="--", color="#3b82f6",
-                    label=f"Avg Downlink: {avg_val:.2f} Mbps")
 
+# ==========================================
+# Results table pages
+# ==========================================
+RESULTS_PAGE_SIZE = 100
+RESULTS_PAGE_MAX = 1000
+
+TABLE_COLUMNS = [
+    "timestamp", "channel", "tdd", "mcs", "test_name",
+    "sent_avg", "recv_avg", "status"
+]
+
+
+def encode_cursor(cursor):
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json_body(cursor)).decode()
+
+
+def decode_cursor(token, sort):
+    """[sort value, row id] of an opaque cursor of sort; ValueError if invalid."""
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        row_id = int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {token}")
+
+    # A cursor of another sort column would compare str with float
+    expected = (int, float) if sort in REAL_COLUMNS else str
+    if isinstance(value, bool) or not isinstance(value, expected):
+        raise ValueError(f"Cursor does not belong to sort={sort}")
+
+    return value, row_id
+
+
+@app.route("/api/results")
+def api_results():
+    """
+    One page of the results table: the home page filters plus
+    status, ?sort=<column>&order=asc|desc, ?limit and the ?after
+    cursor of the previous page. The first page also has the total.
+    """
+
+    sort = request.args.get("sort", "timestamp")
+    if sort not in SORT_KEYS:
+        return api_error(f"sort must be one of: {', '.join(SORT_KEYS)}")
+
+    descending = request.args.get("order", "asc").lower() == "desc"
+
+    try:
+        limit = min(int(request.args.get("limit", RESULTS_PAGE_SIZE)), RESULTS_PAGE_MAX)
+        after = request.args.get("after")
+        after = decode_cursor(after, sort) if after else None
+    except ValueError as e:
+        return api_error(str(e))
+
+    if limit < 1:
+        return api_error("limit must be positive")
+
+    filters = api_filters(request.args)
+
+    store = get_store()
+    if store is not None:
+        rows, cursor = store.page(sort, descending, after, limit, **filters)
+        rows = normalize_frame(rows)
+        total = store.count(**filters) if after is None else None
+    elif os.path.exists(CSV_FILE):
+        df = filter_frame(load_csv(), **filters)
+        rows, cursor = page_frame(df, sort, descending, after, limit)
+        total = len(df) if after is None else None
     else:
-        plt.plot(seconds_axis, sent, color="#f1e208", linewidth=2,
-                 label="Uplink Throughput")
-        plt.plot(seconds_axis, recv, color="#3b82f6", linewidth=2,
-                 label="Downlink Throughput")
-
-        plt.axhline(y=sent.mean(), linestyle="--", color="#f1e208",
-                    label=f"Avg Uplink: {sent.mean():.2f} Mbps")
-        plt.axhline(y=recv.mean(), linestyle="--", color="#3b82f6",
-                    label=f"Avg Downlink: {recv.mean():.2f} Mbps")
-
-    plt.xlabel("Time", fontsize=8)
-    plt.ylabel("Mbps", fontsize=8)
+        rows, cursor, total = pd.DataFrame(columns=TABLE_COLUMNS), None, 0
 
-    ax.ticklabel_format(style='plain', axis='y')
-    ax.yaxis.get_major_formatter().set_useOffset(False)
+    rows = rows.reindex(columns=TABLE_COLUMNS)
+    rows["timestamp"] = pd.to_datetime(rows["timestamp"])
 
-    plt.title("iPerf Performance - Selected Run", fontsize=9)
+    return json_response({
+        "columns": TABLE_COLUMNS,
+        "rows": [list(row) for row in zip(*columnar(rows, TABLE_COLUMNS).values())],
+        "next": encode_cursor(cursor),
+        "total": total
+    })
 
-    plt.grid(True, alpha=0.2)
-    plt.xticks(rotation=30)
-    plt.tight_layout(pad=1.2)
 
-    img = io.BytesIO()
-    plt.savefig(img, format="png",
-                bbox_inches="tight",
-                facecolor="#0b1220")
-    plt.close()
-    img.seek(0)
-    return send_file(img, mimetype="image/png")
+# ==========================================
+# JSON API (v1) - data for charts drawn in the browser
+# ==========================================
+API_VERSION = "v1"
 
+# Smaller bodies are not worth the compression overhead
+API_GZIP_MIN_BYTES = 1024
 
-@app.route("/export")
-def export_excel():
+# Query args of the v1 endpoints -> results store filters
+API_FILTERS = {
+    "board_model": "board_model",
+    "run": "run_id",
+    "channel": "channel",
+    "tdd": "tdd",
+    "mcs": "mcs",
+    "test_name": "test_name",
+    "status": "status",
+}
 
-    if not os.path.exists(CSV_FILE):
-        return "No data available"
 
-    df=load_csv()
+def api_filters(args):
+    filters = {
+        column: args.get(arg) for arg, column in API_FILTERS.items() if args.get(arg)
+    }
+    filters["start"] = args.get("start")
+    filters["end"] = args.get("end")
+    return filters
 
-    if df.empty:
-        return "No data available"
 
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+def api_error(message, status=400):
+    response = jsonify({"error": message})
+    response.status_code = status
+    return response
 
-    # safe trimming of params
-    selected_model = request.args.get("board_model") or ""
-    selected_model = selected_model.strip()
 
-    channel = request.args.get("channel") or ""
-    tdd = request.args.get("tdd") or ""
-    mcs = request.args.get("mcs") or ""
+def columnar(df, columns):
+    """{column: [values]} with NaN as null and floats to 2 decimals."""
 
-    selected_run = request.args.get("run") or ""
-    selected_run = selected_run.strip()
+    data = {}
+    for col in columns:
+        series = df[col]
 
-    test_filter = request.args.get("test_name") or ""
-    test_filter = test_filter.strip()
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+        elif pd.api.types.is_float_dtype(series):
+            values = series.round(2)
+        else:
+            values = series.astype(object)
 
-    start_date = request.args.get("start") or ""
-    start_date = start_date.strip()
+        data[col] = values.astype(object).where(series.notna(), None).tolist()
 
-    end_date = request.args.get("end") or ""
-    end_date = end_date.strip()
+    return data
 
 
-    if selected_model and selected_run:
-        try:
-            run_time = pd.to_datetime(selected_run, format="%Y%m%d_%H%M%S")
-            run_end = run_time + pd.Timedelta(minutes=10)
+def json_api(version_of):
+    """
+    Serve a v1 JSON route: compact JSON, ETag from the data version
+    (304 when unchanged) and gzip for clients that accept it.
+    """
+    def decorator(route):
+        @wraps(route)
+        def wrapper():
+            args = request.args.to_dict()
+            etag = GRAPH_CACHE.make_key(request.path, args, version_of(args))
 
-            df = df[
-                (df["timestamp"] >= run_time) &
-                (df["timestamp"] <= run_end)
-            ]
-        except:
-            pass
+            if etag in request.if_none_match:
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
 
-    if test_filter:
-        df = df[df["test_name"].str.contains(test_filter, na=False)]
-    
-    # # Apply only if CSV actually contains these strings
-    # if channel and df["test_name"].str.contains(channel, na=False).any():
-    #     df = df[df["test_name"].str.contains(channel, na=False)]
+            payload = route()
+            if isinstance(payload, Response):
+                return payload
 
-    # if tdd and df["test_name"].str.contains(tdd, na=False).any():
-    #     df = df[df["test_name"].str.contains(tdd, na=False)]
+            body = json_body(payload)
 
-    # if mcs and df["test_name"].str.contains(f"MCS{mcs}", na=False).any():
-    #     df = df[df["test_name"].str.contains(f"MCS{mcs}", na=False)]
+            response = Response(body, mimetype="application/json")
+            response.vary.add("Accept-Encoding")
 
-    if start_date:
-        start_date = pd.to_datetime(start_date)
-        df = df[df["timestamp"] >= start_date]
+            if (len(body) >= API_GZIP_MIN_BYTES
+                    and "gzip" in request.accept_encodings):
+                response.set_data(gzip.compress(body, compresslevel=6))
+                response.headers["Content-Encoding"] = "gzip"
 
-    if end_date:
-        end_date = pd.to_datetime(end_date) + pd.Timedelta(days=1)
-        df = df[df["timestamp"] < end_date]
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
 
-    if df.empty:
-        return "No filtered data available"
 
-    df = df.sort_values("timestamp")
+@app.route(f"/api/{API_VERSION}/series")
+@json_api(lambda args: data_version(**graphs.device_graph_filters(args)))
+def api_series():
+    """Per-test time series (the device graph), one array per column."""
 
-    output = io.BytesIO()
-
-    metadata = pd.DataFrame({
-        "Filter": [
-            "Board Model",
-            "Run",
-            "Channel",
-            "TDD",
-            "MCS",
-            "Test",
-            "Start Date",
-            "End Date"
-        ],
-        "Value": [
-            selected_model or "All",
-            selected_run or "All",
-            channel or "All",
-            tdd or "All",
-            mcs or "All",
-            test_filter or "All",
-            start_date if start_date else "All",
-            end_date if end_date else "All"
-        ]
-    })
+    if not request.args.get("test_name"):
+        return api_error("test_name is required")
 
-    export_df = df.rename(columns={
-            "timestamp":   "Timestamp",
-            "board_model": "Board Model",
-            "run_id":      "Run ID",
-            "channel":     "Channel",
-            "tdd":         "TDD",
-            "mcs":         "MCS",
-            "test_name":   "Test Name",
-            "sent_avg":    "Uplink (Mbps)",
-            "recv_avg":    "Downlink (Mbps)",
-            "status":      "Status",
-            "pop_version": "POP Version",
-            "dn_version":  "DN Version"
-        })
-
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        metadata.to_excel(writer, sheet_name="Test Details", index=False)
-        export_df.to_excel(writer, sheet_name="Test Results", index=False)
-
-    output.seek(0)
-
-    filename = "iperf_throughput_report.xlsx"
-
-    return send_file(
-        output,
-        download_name=filename,
-        as_attachment=True
-    )
+    if not has_results():
+        return {"version": API_VERSION, "rows": 0, "columns": {}}
 
+    df = load_results(**graphs.device_graph_filters(request.args))
+    df = graphs.device_graph_rows(df, request.args)
 
-@app.route("/run_graph")
-def run_graph():
-
-    board_model = request.args.get("board_model")
-    run = request.args.get("run")
-    channel = request.args.get("channel")
-    tdd = request.args.get("tdd")
-    mcs = request.args.get("mcs")
-    test_name = request.args.get("test_name")
-
-    if not all([board_model, run, channel, tdd, mcs, test_name]):
-        return generate_message_image("Graph parameters missing")
-
-    tdd_folder = f"TDD {tdd}"
-    mcs_folder = f"MCS{mcs}"
-    graph_name = f"{test_name}_graph.png"
-
-    graph_path = os.path.join(
-        RESULTS_DIR,
-        board_model,
-        run,
-        channel,
-        tdd_folder,
-        mcs_folder,
-        graph_name
-    )
-
-    if not os.path.exists(graph_path):
-        return generate_message_image(
-            f"Graph not found:\n{graph_path}"
-        )
-
-    return send_file(graph_path, mimetype="image/png")
-
-@app.route("/stream_comparison_graph")
-def stream_comparison_graph():
-
-    if not os.path.exists(CSV_FILE):
-        return generate_message_image("No CSV data found")
-
-    df = load_csv()
+    columns = ["timestamp", "sent_avg", "recv_avg", "status", "run_id"]
     if df.empty:
-        return generate_message_image("CSV file is empty")
+        return {"version": API_VERSION, "rows": 0, "columns": {c: [] for c in columns}}
 
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    return {
+        "version": API_VERSION,
+        "rows": len(df),
+        "columns": columnar(df, columns)
+    }
 
-    # Normalize filter columns
-    normalize_cols = ["run_id", "board_model", "channel", "tdd", "mcs", "test_name"]
-    for col in normalize_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
 
-    selected_run = request.args.get("run")
-    selected_model = request.args.get("board_model")
-    channel = request.args.get("channel")
-    tdd = request.args.get("tdd")
-    mcs = request.args.get("mcs")
-    test_filter = request.args.get("test_name")
+def gains_filters(args):
+    """api_filters() the gains are selected by; summaries have no test/status/date."""
+    return {
+        k: v for k, v in api_filters(args).items()
+        if k in ("board_model", "run_id", "channel", "tdd", "mcs")
+    }
 
-    if selected_run: selected_run = str(selected_run).strip()
-    if selected_model: selected_model = str(selected_model).strip()
-    if channel: channel = str(channel).strip()
-    if tdd: tdd = str(tdd).strip()
-    if mcs: mcs = str(mcs).strip()
-    if test_filter: test_filter = str(test_filter).strip()
 
-    if not selected_run:
-        return generate_message_image("Select a Run ID")
+@app.route(f"/api/{API_VERSION}/gains")
+@json_api(lambda args: data_version(**gains_filters(args)))
+def api_gains():
+    """1 Stream vs 4 Stream means and gain per run, cell and test family."""
 
-    if not test_filter:
-        return generate_message_image("Select a test")
+    df = gains_frame(load_summary(**gains_filters(request.args)))
 
-    if "run_id" not in df.columns:
-        return generate_message_image("run_id column missing in CSV")
+    return {
+        "version": API_VERSION,
+        "rows": len(df),
+        "columns": columnar(df, list(df.columns))
+    }
 
-    # Structured filtering
-    df = df[df["run_id"] == selected_run]
 
-    if selected_model and "board_model" in df.columns:
-        df = df[df["board_model"] == selected_model]
+@app.route(f"/api/{API_VERSION}/catalog")
+def api_catalog():
+    """Setups; with ?board_model its runs; with ?run too, the run's cells."""
 
-    if channel and "channel" in df.columns:
-        df = df[df["channel"] == channel]
+    board_model = (request.args.get("board_model") or "").strip()
+    run = (request.args.get("run") or "").strip()
 
-    if tdd and "tdd" in df.columns:
-        df = df[df["tdd"] == tdd]
+    payload = {"version": API_VERSION, "setups": CATALOG.setups()}
 
-    if mcs and "mcs" in df.columns:
-        df = df[df["mcs"] == mcs]
+    if board_model:
+        payload["runs"] = CATALOG.runs(board_model)
 
-    if df.empty:
-        return generate_message_image("No data for selected filters")
-
-    base_name = test_filter.replace("-1Stream", "").replace("-4Stream", "")
-
-    plt.figure(figsize=(8, 5))
-    plt.style.use("dark_background")
-
-    width = 0.28
-    gap = 0.05
+    if board_model and run:
+        entry = CATALOG.run(board_model, run)
+        payload["cells"] = [
+            {"channel": channel, "tdd": tdd, "mcs": mcs,
+             "tests": sorted(entry["cells"][(channel, tdd, mcs)]["graphs"])}
+            for channel, tdd, mcs in sorted(entry["cells"])
+        ]
+        payload["artifacts"] = sorted(entry["artifacts"])
 
-    # =====================================================
-    # 🔥 NEW: UDP GRAPH LOGIC (NO STREAM SPLIT REQUIRED)
-    # =====================================================
-    if "udp" in base_name.lower():
+    return json_response(payload)
 
-        udp_row = df[df["test_name"].str.contains(base_name, na=False)].copy()
 
-        if udp_row.empty:
-            return generate_message_image("UDP data not found")
+@app.route(f"/api/{API_VERSION}/aggregates")
+@json_api(lambda args: data_version(**api_filters(args)))
+def api_aggregates():
+    """
+    Throughput aggregates per test, run or channel/TDD/MCS cell
+    (group_by=test|run|cell) of the rows matching the filters.
+    """
 
-        udp_row["sent_avg"] = pd.to_numeric(udp_row["sent_avg"], errors="coerce")
-        udp_row["recv_avg"] = pd.to_numeric(udp_row["recv_avg"], errors="coerce")
+    group_by = request.args.get("group_by", "test")
+    if group_by not in GROUPINGS:
+        return api_error(f"group_by must be one of: {', '.join(GROUPINGS)}")
 
-        sent_value = udp_row["sent_avg"].mean()
-        recv_value = udp_row["recv_avg"].mean()
+    filters = api_filters(request.args)
 
-        labels = []
-        values = []
+    store = get_store()
+    if store is not None:
+        df = store.aggregate(group_by, **filters)
+    elif os.path.exists(CSV_FILE):
+        df = aggregate_frame(filter_frame(load_csv(), **filters), group_by)
+    else:
+        df = aggregate_frame(pd.DataFrame(), group_by)
 
-        if sent_value > 0:
-            labels.append("Uplink")
-            values.append(sent_value)
+    return {
+        "version": API_VERSION,
+        "group_by": group_by,
+        "rows": len(df),
+        "columns": columnar(df, list(df.columns))
+    }
 
-        if recv_value > 0:
-            labels.append("Downlink")
-            values.append(recv_value)
 
-        if not values:
-            return generate_message_image("UDP throughput invalid")
+# ==========================================
+# UPDATED GRAPH LOGIC
+# ==========================================
+# ==========================================
+# UPDATED GRAPH LOGIC (DARK THEME + FIT FIX)
+# ==========================================
+@app.route("/device_graph_image")
+@cached_graph(lambda args: data_version(**graphs.device_graph_filters(args)))
+def device_graph_image():
 
-        x = np.arange(len(labels))
+    if not has_results():
+        return generate_message_image(graphs.NO_GRAPH)
 
-        if len(values) == 0:
-            return generate_message_image("UDP throughput invalid")
+    df = load_results(**graphs.device_graph_filters(request.args))
+    return png_bytes_response(graphs.device_graph_png(df, request.args))
 
-        bar_width = 0.3  # make it slimmer
 
-        bars = plt.bar(
-            x,
-            values,
-            width=bar_width,
-            color="#08c284"
-        )
+EXPORT_CHUNK_ROWS = 10000
 
-        # Control horizontal space
-        if len(labels) == 1:
-            plt.xlim(-0.8, 0.8)
-        else:
-            plt.xlim(-0.6, len(labels) - 0.4)
 
-        # Add vertical headroom
-        plt.ylim(0, max(values) * 1.2)
+def export_frames(query):
+    """Normalized, filtered result rows in chunks of EXPORT_CHUNK_ROWS."""
 
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(
-                bar.get_x() + bar.get_width() / 2,
-                height + 5,
-                f"{height:.1f}",
-                ha="center"
-            )
+    store = get_store()
+    if store is not None:
+        for chunk in store.iter_query(chunk_size=EXPORT_CHUNK_ROWS, **query):
+            # An empty result still comes back as one empty chunk
+            if not chunk.empty:
+                yield normalize_frame(chunk)
+        return
 
-        plt.xticks(x, labels)
-        plt.ylabel("Throughput (Mbps)")
-        plt.title(f"{base_name} Throughput")
-        plt.grid(axis="y", alpha=0.2)
+    with open(CSV_FILE, "r", newline="") as f:
+        columns = f.readline().strip().split(",")
 
-        plt.tight_layout(pad=2.0)
-
-        img = io.BytesIO()
-        plt.savefig(img, format="png", facecolor="#0b1220")
-        plt.close()
-        img.seek(0)
+    reader = pd.read_csv(
+        CSV_FILE,
+        chunksize=EXPORT_CHUNK_ROWS,
+        dtype={col: str for col in TEXT_COLS + CATEGORY_COLS if col in columns},
+        on_bad_lines="skip"
+    )
+    for chunk in reader:
+        chunk = export.filter_chunk(normalize_frame(chunk), **query)
+        if not chunk.empty:
+            yield chunk
 
-        return send_file(img, mimetype="image/png")
 
-    # =====================================================
-    # TCP LOGIC (CLEAN + CONSISTENT)
-    # =====================================================
+@app.route("/export")
+def export_excel():
+    """
+    Filtered results as xlsx (default), csv, ndjson or parquet
+    (?format=...), streamed chunk by chunk from the results store.
+    """
 
-    one_stream = df[df["test_name"] == f"{base_name}-1Stream"].copy()
-    four_stream = df[df["test_name"] == f"{base_name}-4Stream"].copy()
+    export_format = (request.args.get("format") or "xlsx").strip().lower()
+    if export_format not in export.FORMATS:
+        return f"Unknown export format: {export_format}", 400
 
-    if one_stream.empty or four_stream.empty:
-        return generate_message_image(
-            "Both 1Stream and 4Stream must exist in same run"
-        )
+    if export_format == "parquet" and not export.parquet_available():
+        return "Parquet export needs pyarrow installed", 400
 
-    for col in ["sent_avg", "recv_avg"]:
-        if col in one_stream.columns:
-            one_stream[col] = pd.to_numeric(one_stream[col], errors="coerce")
-        if col in four_stream.columns:
-            four_stream[col] = pd.to_numeric(four_stream[col], errors="coerce")
+    if not has_results():
+        return "No data available"
 
-    one_stream.dropna(subset=["sent_avg"], inplace=True)
-    four_stream.dropna(subset=["sent_avg"], inplace=True)
+    frames = export_frames(export.export_filters(request.args))
 
-    if one_stream.empty or four_stream.empty:
-        return generate_message_image("Numeric throughput data missing")
+    # Read the first chunk up front so an empty export is a plain message
+    first = next(frames, None)
+    if first is None:
+        return "No filtered data available"
 
-    test_name_lower = base_name.lower()
+    frames = itertools.chain([first], frames)
 
-    # -------------------------------
-    # Determine direction correctly
-    # -------------------------------
-    if "bidir" in test_name_lower or "bidirectional" in test_name_lower:
+    if export_format == "xlsx":
+        body = export.xlsx_chunks(frames, export.metadata_rows(request.args))
+    else:
+        body = export.WRITERS[export_format](frames)
 
-        labels = ["Uplink", "Downlink"]
+    mimetype, extension = export.FORMATS[export_format]
 
-        one_values = [
-            one_stream["sent_avg"].mean(),
-            one_stream["recv_avg"].mean()
-        ]
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition":
+                f"attachment; filename={export.FILE_STEM}.{extension}"
+        }
+    )
 
-        four_values = [
-            four_stream["sent_avg"].mean(),
-            four_stream["recv_avg"].mean()
-        ]
 
-    elif "uplink" in test_name_lower:
+def run_graph_path(args):
+    board_model = args.get("board_model")
+    run = args.get("run")
+    channel = args.get("channel")
+    tdd = args.get("tdd")
+    mcs = args.get("mcs")
+    test_name = args.get("test_name")
 
-        labels = ["Uplink"]
+    if not all([board_model, run, channel, tdd, mcs, test_name]):
+        return None
 
-        one_values = [one_stream["sent_avg"].mean()]
-        four_values = [four_stream["sent_avg"].mean()]
+    return (
+        CATALOG.graph_path(board_model, run, channel, tdd, mcs, test_name)
+        or CATALOG.expected_graph_path(board_model, run, channel, tdd, mcs, test_name)
+    )
 
-    elif "downlink" in test_name_lower:
 
-        labels = ["Downlink"]
+def graph_file_version(args):
+    graph_path = run_graph_path(args)
+    try:
+        stat = os.stat(graph_path)
+    except (TypeError, OSError):
+        return "missing"
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
 
-        one_values = [one_stream["sent_avg"].mean()]
-        four_values = [four_stream["sent_avg"].mean()]
 
-    else:
-        # fallback
-        labels = ["Throughput"]
-        one_values = [one_stream["sent_avg"].mean()]
-        four_values = [four_stream["sent_avg"].mean()]
-
-    x = np.arange(len(labels))
-
-    # -------------------------------
-    # Symmetric spacing (correct way)
-    # -------------------------------
-    bars1 = plt.bar(
-        x - (width/2 + gap/2),
-        one_values,
-        width,
-        label="1 Stream",
-        color="#08e4a2"
-    )
+@app.route("/run_graph")
+@cached_graph(graph_file_version)
+def run_graph():
 
-    bars2 = plt.bar(
-        x + (width/2 + gap/2),
-        four_values,
-        width,
-        label="4 Stream",
-        color="#15ade9"
-    )
+    graph_path = run_graph_path(request.args)
 
-    # Add value labels
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(
-                bar.get_x() + bar.get_width()/2,
-                height + 5,
-                f"{height:.1f}",
-                ha="center"
-            )
+    if graph_path is None:
+        return generate_message_image("Graph parameters missing")
 
-    # Proper axis limits
-    plt.xlim(-0.6, len(labels) - 0.4)
-    plt.ylim(0, max(one_values + four_values) * 1.2)
+    if not os.path.exists(graph_path):
+        return generate_message_image(
+            f"Graph not found:\n{graph_path}"
+        )
 
-    plt.xticks(x, labels)
-    plt.ylabel("Throughput (Mbps)")
-    plt.title(f"{base_name} Throughput: 1 Stream vs 4 Stream")
-    plt.legend()
-    plt.grid(axis="y", alpha=0.2)
+    return send_file(graph_path, mimetype="image/png")
 
-    plt.tight_layout(pad=2.0)
+@app.route("/stream_comparison_graph")
+@cached_graph(lambda args: data_version(**graphs.stream_comparison_filters(args)))
+def stream_comparison_graph():
 
-    img = io.BytesIO()
-    plt.savefig(img, format="png", facecolor="#0b1220")
-    plt.close()
-    img.seek(0)
+    if not has_results():
+        return generate_message_image("No CSV data found")
 
-    return send_file(img, mimetype="image/png")
+    df = load_summary(**graphs.stream_comparison_filters(request.args))
+    return png_bytes_response(graphs.stream_comparison_png(df, request.args))
 
 if __name__ == "__main__":
+    if RENDER_WORKERS > 0:
+        RENDER_SERVICE = RenderService(DB_FILE, RESULTS_DIR, workers=RENDER_WORKERS)
+        RENDER_SERVICE.start()
+
     serve(app, host="0.0.0.0", port=8000)
\ No newline at end of file
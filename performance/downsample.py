@@ -0,0 +1,91 @@
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps to draw
+    y(x) with threshold points: the first and last point, plus per
+    bucket the point forming the largest triangle with the previously
+    kept point and the mean of the next bucket. x must be sorted.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(x)
+
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    kept = np.empty(threshold, dtype=int)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_stop = n - 1, n
+
+        next_x = x[next_start:next_stop].mean()
+        next_y = y[next_start:next_stop].mean()
+
+        # Twice the triangle areas; only the argmax matters
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+
+        previous = start + int(areas.argmax())
+        kept[i + 1] = previous
+
+    return kept
+
+
+def minmax_indices(y, threshold):
+    """Indices of the min and max of each of threshold/2 equal buckets."""
+
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(y)
+
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+
+    kept = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            bucket = y[start:stop]
+            kept.append(start + int(bucket.argmin()))
+            kept.append(start + int(bucket.argmax()))
+
+    return np.unique(kept)
+
+
+def downsample_indices(x, series, threshold, method="lttb"):
+    """
+    Sorted row indices that keep the shape of every series in a point
+    budget of threshold rows, shared out between the series.
+    """
+
+    n = len(x)
+    if not threshold or threshold >= n:
+        return np.arange(n)
+
+    per_series = max(int(threshold) // max(len(series), 1), 3)
+
+    kept = []
+    for y in series:
+        if method == "minmax":
+            kept.append(minmax_indices(y, per_series))
+        else:
+            kept.append(lttb_indices(x, y, per_series))
+
+    return np.unique(np.concatenate(kept))
@@ -0,0 +1,296 @@
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from performance.results_store import REAL_COLUMNS, TIMESTAMP_FORMAT
+
+
+# Formats of /export?format=...; xlsx is the dashboard's Export button
+FORMATS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+FILE_STEM = "iperf_throughput_report"
+
+# Column headers of the Excel report
+DISPLAY_NAMES = {
+    "timestamp":   "Timestamp",
+    "board_model": "Board Model",
+    "run_id":      "Run ID",
+    "channel":     "Channel",
+    "tdd":         "TDD",
+    "mcs":         "MCS",
+    "test_name":   "Test Name",
+    "sent_avg":    "Uplink (Mbps)",
+    "recv_avg":    "Downlink (Mbps)",
+    "status":      "Status",
+    "pop_version": "POP Version",
+    "dn_version":  "DN Version"
+}
+
+# Bytes per yielded piece when streaming a finished file
+FILE_CHUNK = 256 * 1024
+
+
+# -----------------------------------------
+# Filters
+# -----------------------------------------
+
+def export_filters(args):
+    """
+    Query arguments of ResultsStore.iter_query for the /export args.
+
+    Same selection as the old in-memory export: the run is the 10
+    minute window after the run ID's timestamp (only with a board
+    model), test_name is a substring and start/end are inclusive dates.
+    Channel/TDD/MCS are shown in the report but not filtered on.
+    """
+
+    selected_model = (args.get("board_model") or "").strip()
+    selected_run = (args.get("run") or "").strip()
+    test_filter = (args.get("test_name") or "").strip()
+
+    query = {
+        "start": (args.get("start") or "").strip() or None,
+        "end": (args.get("end") or "").strip() or None,
+        "test_contains": test_filter or None,
+    }
+
+    if selected_model and selected_run:
+        try:
+            run_time = pd.to_datetime(selected_run, format="%Y%m%d_%H%M%S")
+        except ValueError:
+            run_time = None
+
+        if run_time is not None:
+            query["since"] = run_time.strftime(TIMESTAMP_FORMAT)
+            query["until"] = (run_time + pd.Timedelta(minutes=10)).strftime(TIMESTAMP_FORMAT)
+
+    return query
+
+
+def filter_chunk(df, start=None, end=None, since=None, until=None, test_contains=None):
+    """export_filters() applied to a normalized frame (the CSV fallback)."""
+
+    if since:
+        df = df[df["timestamp"] >= pd.to_datetime(since)]
+
+    if until:
+        df = df[df["timestamp"] <= pd.to_datetime(until)]
+
+    if test_contains:
+        df = df[df["test_name"].astype(str).str.contains(test_contains, regex=False, na=False)]
+
+    if start:
+        df = df[df["timestamp"] >= pd.to_datetime(start)]
+
+    if end:
+        df = df[df["timestamp"] < pd.to_datetime(end) + pd.Timedelta(days=1)]
+
+    return df
+
+
+def metadata_rows(args):
+    values = [
+        ("Board Model", args.get("board_model")),
+        ("Run", args.get("run")),
+        ("Channel", args.get("channel")),
+        ("TDD", args.get("tdd")),
+        ("MCS", args.get("mcs")),
+        ("Test", args.get("test_name")),
+        ("Start Date", args.get("start")),
+        ("End Date", args.get("end")),
+    ]
+    return [(name, (value or "").strip() or "All") for name, value in values]
+
+
+# -----------------------------------------
+# Writers: frames in, bytes out
+# -----------------------------------------
+
+def _records(df):
+    """Row tuples with timestamps as datetimes and NaN as None."""
+
+    df = df.astype(object).where(df.notna(), None)
+    if "timestamp" in df.columns:
+        df["timestamp"] = [
+            ts.to_pydatetime() if isinstance(ts, pd.Timestamp) else ts
+            for ts in df["timestamp"]
+        ]
+    return df.itertuples(index=False, name=None)
+
+
+def _text_frame(df):
+    if "timestamp" in df.columns:
+        df = df.assign(timestamp=df["timestamp"].dt.strftime(TIMESTAMP_FORMAT))
+    return df
+
+
+def csv_chunks(frames):
+    header = True
+    for df in frames:
+        buffer = io.StringIO()
+        _text_frame(df).to_csv(buffer, index=False, header=header)
+        header = False
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(frames):
+    for df in frames:
+        df = _text_frame(df).astype(object)
+        df = df.where(df.notna(), None)
+        columns = list(df.columns)
+
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n"
+            for row in df.itertuples(index=False, name=None)
+        ).encode()
+
+
+class _StreamSink:
+    """Write-only file object whose contents are drained after each write."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parquet_schema(columns):
+    """
+    Arrow schema from the store's column types. Inferring it from the
+    first frame types a column that is empty there (e.g. no status or
+    version yet) as null, and a later frame with values then fails.
+    """
+
+    import pyarrow as pa
+
+    fields = []
+    for col in columns:
+        if col == "timestamp":
+            fields.append(pa.field(col, pa.timestamp("us")))
+        elif col in REAL_COLUMNS:
+            fields.append(pa.field(col, pa.float64()))
+        else:
+            fields.append(pa.field(col, pa.string()))
+
+    return pa.schema(fields)
+
+
+def parquet_chunks(frames):
+    """One row group per frame; needs pyarrow."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _StreamSink()
+    writer = None
+    schema = None
+
+    try:
+        for df in frames:
+            # object keeps missing values as nulls instead of "nan"
+            for col in df.select_dtypes("category").columns:
+                df[col] = df[col].astype(object)
+
+            if schema is None:
+                schema = parquet_schema(df.columns)
+                writer = pq.ParquetWriter(sink, schema)
+
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            writer.write_table(table)
+
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        if writer is not None:
+            writer.close()
+
+    yield sink.drain()
+
+
+def xlsx_chunks(frames, metadata):
+    """
+    Write-only workbook: rows go to a temporary file as they arrive, so
+    memory stays bounded. The zip is only complete at save(), so the
+    file is streamed from disk once it has been written.
+    """
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+
+    details = workbook.create_sheet("Test Details")
+    details.append(["Filter", "Value"])
+    for row in metadata:
+        details.append(list(row))
+
+    results = workbook.create_sheet("Test Results")
+    header = True
+
+    for df in frames:
+        if header:
+            results.append([DISPLAY_NAMES.get(col, col) for col in df.columns])
+            header = False
+        for row in _records(df):
+            results.append(list(row))
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+
+    try:
+        workbook.save(path)
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(FILE_CHUNK)
+                if not data:
+                    break
+                yield data
+    finally:
+        os.remove(path)
+
+
+# Streaming writers of the non-Excel formats
+WRITERS = {
+    "csv": csv_chunks,
+    "ndjson": ndjson_chunks,
+    "parquet": parquet_chunks,
+}
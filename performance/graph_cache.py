@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class GraphCache:
+    """
+    Rendered PNGs keyed by (route, normalized params, data version).
+
+    Two levels: an in-memory LRU bounded by max_memory_bytes, and a
+    directory of <key>.png files bounded by max_disk_bytes (least
+    recently used first, using the file mtime). The key doubles as the
+    ETag. A new data version gives a new key, so stale entries are never
+    served; they age out of both levels.
+    """
+
+    def __init__(self, cache_dir, max_memory_bytes=64 * 1024 * 1024,
+                 max_disk_bytes=512 * 1024 * 1024):
+
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.max_disk_bytes = int(max_disk_bytes)
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None
+
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    # -----------------------------------------
+    # Keys
+    # -----------------------------------------
+
+    @staticmethod
+    def make_key(route, params, version):
+        normalized = sorted(
+            (k, str(v).strip()) for k, v in params.items()
+            if v is not None and str(v).strip() != ""
+        )
+        raw = json.dumps([route, normalized, str(version)])
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    # -----------------------------------------
+    # Lookup / Store
+    # -----------------------------------------
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return data
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+            self._remember(key, data)
+
+        return data
+
+    def put(self, key, data):
+        with self._lock:
+            self._remember(key, data)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            # Concurrent writers of the same key write identical bytes
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Disk level is best effort; memory still serves the image
+            return
+
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += len(data)
+            self._evict_disk()
+
+    def _remember(self, key, data):
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    # -----------------------------------------
+    # Disk Eviction
+    # -----------------------------------------
+
+    def _disk_entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".png"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _evict_disk(self):
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # Rescan: other processes share the directory
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+
+        # Down to 90% so every put doesn't rescan
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+            for _, _, path in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+            self._disk_bytes = 0
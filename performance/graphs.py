@@ -0,0 +1,414 @@
+import pandas as pd
+import numpy as np
+
+from performance import rendering
+from performance.rendering import DARK_BG
+from performance.results_store import normalize_frame, summary_mean
+
+
+# Dashboard graphs as PNG bytes, shared by the Flask routes and the
+# render service. Each graph is (filters, render, source): filters(args)
+# gives the results-store filters, source whether render(df, args) draws
+# from the raw rows or the run_summary rows.
+
+NO_GRAPH = "For selected filter we can not plot graph"
+
+
+def message_png(message):
+    fig = rendering.new_figure(figsize=(8, 3))
+    ax = fig.add_subplot()
+    ax.text(0.5, 0.5,
+            message,
+            ha='center', va='center', fontsize=11)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    fig.tight_layout()
+
+    return rendering.to_png(fig, facecolor=DARK_BG)
+
+
+# =====================================================
+# Per-test time series
+# =====================================================
+def device_graph_filters(args):
+    return {
+        "test_name": args.get("test_name"),
+        "start": args.get("start"),
+        "end": args.get("end")
+    }
+
+
+def device_graph_rows(df, args):
+    """Rows the per-test time series plots, oldest first."""
+
+    selected_model = args.get("board_model")
+    selected_run = args.get("run")
+    test_filter = args.get("test_name")
+    start_date = args.get("start")
+    end_date = args.get("end")
+
+    if df.empty:
+        return df
+
+    df = df.sort_values("timestamp")
+
+    # ===============================
+    # FILTERING
+    # ===============================
+    if selected_model and selected_run:
+        try:
+            run_time = pd.to_datetime(selected_run, format="%Y%m%d_%H%M%S")
+            run_end = run_time + pd.Timedelta(minutes=10)
+            df = df[(df["timestamp"] >= run_time) &
+                    (df["timestamp"] <= run_end)]
+        except:
+            pass
+
+    if test_filter:
+        df = df[df["test_name"] == test_filter]
+
+
+    if start_date:
+        df = df[df["timestamp"] >= pd.to_datetime(start_date)]
+
+    if end_date:
+        df = df[df["timestamp"] <
+                pd.to_datetime(end_date) + pd.Timedelta(days=1)]
+
+    return df
+
+
+def device_graph_png(df, args):
+
+    test_filter = args.get("test_name")
+
+    df = device_graph_rows(df, args)
+    if df.empty:
+        return message_png(NO_GRAPH)
+
+    # ===============================
+    # NUMERIC CLEANING
+    # ===============================
+    sent = pd.to_numeric(df["sent_avg"], errors="coerce")
+    recv = pd.to_numeric(df["recv_avg"], errors="coerce")
+
+    valid_mask = sent.notna() & recv.notna()
+    sent = sent[valid_mask]
+    recv = recv[valid_mask]
+
+    time_series = pd.to_datetime(df["timestamp"])[valid_mask]
+    seconds_axis = (time_series - time_series.min()).dt.total_seconds()
+
+
+    if len(sent) == 0:
+        return message_png(NO_GRAPH)
+        # ===============================
+    # SMOOTHING (Wave Effect)
+    # ===============================
+    sent = sent.rolling(window=3, min_periods=1).mean()
+    recv = recv.rolling(window=3, min_periods=1).mean()
+    # ===============================
+    # ORIGINAL PLOTTING LOGIC (UNCHANGED)
+    # ===============================
+    fig = rendering.new_figure(figsize=(9,4), dpi=120, facecolor=DARK_BG)
+
+    ax = fig.add_subplot()
+    ax.set_facecolor(DARK_BG)
+
+    # =====================================
+    # KEEPING YOUR ORIGINAL CONDITIONAL LOGIC
+    # =====================================
+    test_name = (test_filter or "").lower()
+
+    is_uplink = "uplink" in test_name
+    is_downlink = "downlink" in test_name
+    is_bidir = "bidir" in test_name or "bidirectional" in test_name
+
+    if is_uplink:
+        avg_val = sent.mean()
+        ax.plot(seconds_axis, sent, color="#f1e208", linewidth=2,
+                label="Uplink Throughput")
+        ax.axhline(y=avg_val, linestyle="--", color="#f1e208",
+                   label=f"Avg Uplink: {avg_val:.2f} Mbps")
+
+    elif is_downlink:
+        avg_val = sent.mean()
+        ax.plot(seconds_axis, sent, color="#3b82f6", linewidth=2,
+                label="Downlink Throughput")
+        ax.axhline(y=avg_val, linestyle="--", color="#3b82f6",
+                   label=f"Avg Downlink: {avg_val:.2f} Mbps")
+
+    else:
+        ax.plot(seconds_axis, sent, color="#f1e208", linewidth=2,
+                label="Uplink Throughput")
+        ax.plot(seconds_axis, recv, color="#3b82f6", linewidth=2,
+                label="Downlink Throughput")
+
+        ax.axhline(y=sent.mean(), linestyle="--", color="#f1e208",
+                   label=f"Avg Uplink: {sent.mean():.2f} Mbps")
+        ax.axhline(y=recv.mean(), linestyle="--", color="#3b82f6",
+                   label=f"Avg Downlink: {recv.mean():.2f} Mbps")
+
+    ax.set_xlabel("Time", fontsize=8)
+    ax.set_ylabel("Mbps", fontsize=8)
+
+    ax.ticklabel_format(style='plain', axis='y')
+    ax.yaxis.get_major_formatter().set_useOffset(False)
+
+    ax.set_title("iPerf Performance - Selected Run", fontsize=9)
+
+    ax.grid(True, alpha=0.2)
+    ax.tick_params(axis="x", labelrotation=30)
+    fig.tight_layout(pad=1.2)
+
+    return rendering.to_png(fig, facecolor=DARK_BG, bbox_inches="tight")
+
+
+# =====================================================
+# 1 Stream vs 4 Stream / UDP bars
+# =====================================================
+def stream_comparison_filters(args):
+    return {
+        "run_id": args.get("run"),
+        "board_model": args.get("board_model"),
+        "channel": args.get("channel"),
+        "tdd": args.get("tdd"),
+        "mcs": args.get("mcs")
+    }
+
+
+def stream_comparison_png(df, args):
+    """df: run_summary rows (ResultsStore.summary / summary_frame)."""
+
+    if df.empty:
+        return message_png("CSV file is empty")
+
+    selected_run = args.get("run")
+    selected_model = args.get("board_model")
+    channel = args.get("channel")
+    tdd = args.get("tdd")
+    mcs = args.get("mcs")
+    test_filter = args.get("test_name")
+
+    if selected_run: selected_run = str(selected_run).strip()
+    if selected_model: selected_model = str(selected_model).strip()
+    if channel: channel = str(channel).strip()
+    if tdd: tdd = str(tdd).strip()
+    if mcs: mcs = str(mcs).strip()
+    if test_filter: test_filter = str(test_filter).strip()
+
+    if not selected_run:
+        return message_png("Select a Run ID")
+
+    if not test_filter:
+        return message_png("Select a test")
+
+    if "run_id" not in df.columns:
+        return message_png("run_id column missing in CSV")
+
+    # Structured filtering
+    df = df[df["run_id"] == selected_run]
+
+    if selected_model and "board_model" in df.columns:
+        df = df[df["board_model"] == selected_model]
+
+    if channel and "channel" in df.columns:
+        df = df[df["channel"] == channel]
+
+    if tdd and "tdd" in df.columns:
+        df = df[df["tdd"] == tdd]
+
+    if mcs and "mcs" in df.columns:
+        df = df[df["mcs"] == mcs]
+
+    if df.empty:
+        return message_png("No data for selected filters")
+
+    base_name = test_filter.replace("-1Stream", "").replace("-4Stream", "")
+
+    fig = rendering.new_figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+
+    width = 0.28
+    gap = 0.05
+
+    # =====================================================
+    # 🔥 NEW: UDP GRAPH LOGIC (NO STREAM SPLIT REQUIRED)
+    # =====================================================
+    if "udp" in base_name.lower():
+
+        udp_row = df[df["test_name"].str.contains(base_name, na=False, regex=False)]
+
+        if udp_row.empty:
+            return message_png("UDP data not found")
+
+        sent_value = summary_mean(udp_row, "sent")
+        recv_value = summary_mean(udp_row, "recv")
+
+        labels = []
+        values = []
+
+        if sent_value > 0:
+            labels.append("Uplink")
+            values.append(sent_value)
+
+        if recv_value > 0:
+            labels.append("Downlink")
+            values.append(recv_value)
+
+        if not values:
+            return message_png("UDP throughput invalid")
+
+        x = np.arange(len(labels))
+
+        if len(values) == 0:
+            return message_png("UDP throughput invalid")
+
+        bar_width = 0.3  # make it slimmer
+
+        bars = ax.bar(
+            x,
+            values,
+            width=bar_width,
+            color="#08c284"
+        )
+
+        # Control horizontal space
+        if len(labels) == 1:
+            ax.set_xlim(-0.8, 0.8)
+        else:
+            ax.set_xlim(-0.6, len(labels) - 0.4)
+
+        # Add vertical headroom
+        ax.set_ylim(0, max(values) * 1.2)
+
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width() / 2,
+                height + 5,
+                f"{height:.1f}",
+                ha="center"
+            )
+
+        ax.set_xticks(x, labels)
+        ax.set_ylabel("Throughput (Mbps)")
+        ax.set_title(f"{base_name} Throughput")
+        ax.grid(axis="y", alpha=0.2)
+
+        fig.tight_layout(pad=2.0)
+
+        return rendering.to_png(fig, facecolor=DARK_BG)
+
+    # =====================================================
+    # TCP LOGIC (CLEAN + CONSISTENT)
+    # =====================================================
+
+    one_stream = df[df["test_name"] == f"{base_name}-1Stream"]
+    four_stream = df[df["test_name"] == f"{base_name}-4Stream"]
+
+    if one_stream.empty or four_stream.empty:
+        return message_png(
+            "Both 1Stream and 4Stream must exist in same run"
+        )
+
+    if one_stream["sent_n"].sum() == 0 or four_stream["sent_n"].sum() == 0:
+        return message_png("Numeric throughput data missing")
+
+    test_name_lower = base_name.lower()
+
+    # -------------------------------
+    # Determine direction correctly
+    # -------------------------------
+    if "bidir" in test_name_lower or "bidirectional" in test_name_lower:
+
+        labels = ["Uplink", "Downlink"]
+
+        one_values = [
+            summary_mean(one_stream, "sent"),
+            summary_mean(one_stream, "recv")
+        ]
+
+        four_values = [
+            summary_mean(four_stream, "sent"),
+            summary_mean(four_stream, "recv")
+        ]
+
+    elif "uplink" in test_name_lower:
+
+        labels = ["Uplink"]
+
+        one_values = [summary_mean(one_stream, "sent")]
+        four_values = [summary_mean(four_stream, "sent")]
+
+    elif "downlink" in test_name_lower:
+
+        labels = ["Downlink"]
+
+        one_values = [summary_mean(one_stream, "sent")]
+        four_values = [summary_mean(four_stream, "sent")]
+
+    else:
+        # fallback
+        labels = ["Throughput"]
+        one_values = [summary_mean(one_stream, "sent")]
+        four_values = [summary_mean(four_stream, "sent")]
+
+    x = np.arange(len(labels))
+
+    # -------------------------------
+    # Symmetric spacing (correct way)
+    # -------------------------------
+    bars1 = ax.bar(
+        x - (width/2 + gap/2),
+        one_values,
+        width,
+        label="1 Stream",
+        color="#08e4a2"
+    )
+
+    bars2 = ax.bar(
+        x + (width/2 + gap/2),
+        four_values,
+        width,
+        label="4 Stream",
+        color="#15ade9"
+    )
+
+    # Add value labels
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(
+                bar.get_x() + bar.get_width()/2,
+                height + 5,
+                f"{height:.1f}",
+                ha="center"
+            )
+
+    # Proper axis limits
+    ax.set_xlim(-0.6, len(labels) - 0.4)
+    ax.set_ylim(0, max(one_values + four_values) * 1.2)
+
+    ax.set_xticks(x, labels)
+    ax.set_ylabel("Throughput (Mbps)")
+    ax.set_title(f"{base_name} Throughput: 1 Stream vs 4 Stream")
+    ax.legend()
+    ax.grid(axis="y", alpha=0.2)
+
+    fig.tight_layout(pad=2.0)
+
+    return rendering.to_png(fig, facecolor=DARK_BG)
+
+
+def load_frame(store, source, filters):
+    """Rows a graph renders from: raw "rows" or "summary" rows."""
+    if source == "summary":
+        return store.summary(**filters)
+    return normalize_frame(store.query(**filters))
+
+
+GRAPHS = {
+    "device_graph_image": (device_graph_filters, device_graph_png, "rows"),
+    "stream_comparison_graph": (stream_comparison_filters, stream_comparison_png, "summary"),
+}
@@ -1,211 +1,450 @@
 import json
 import sys
 import os
-import matplotlib.pyplot as plt
 
+import numpy as np
 
-def plot_iperf(json_file, output_image):
 
-    test_name = os.path.basename(json_file).lower()
+# Steady state: rolling mean stays within this fraction of the
+# second-half median from some interval to the end of the run
+STEADY_WINDOW = 5
+STEADY_TOLERANCE = 0.10
+
+# Confidence: 95% CI half-width of the per-second mean, as % of the
+# mean, ignoring the first seconds of TCP ramp-up
+CI_Z = 1.96
+CI_WARMUP_INTERVALS = 3
+
+
+class IperfResult:
+    """
+    Parsed iperf3 -J output for one traffic test.
+
+    sent_* is the client -> server direction, recv_* the reverse
+    direction of a --bidir run (None otherwise). Throughput is in Mbps;
+    for UDP it is the effective rate after loss.
+    """
+
+    def __init__(self, test_name, protocol, direction):
+        self.test_name = test_name
+        self.protocol = protocol
+        self.direction = direction
+        self.bidirectional = False
+
+        self.sent_mbps = None
+        self.recv_mbps = None
+
+        # TCP only
+        self.sent_retransmits = None
+        self.recv_retransmits = None
+
+        # UDP only
+        self.sent_loss_pct = None
+        self.recv_loss_pct = None
+        self.sent_jitter_ms = None
+        self.recv_jitter_ms = None
+
+        # Per-interval series (numpy arrays, Mbps) and their stats
+        self.times_sent = np.empty(0)
+        self.sent_bw = np.empty(0)
+        self.times_recv = np.empty(0)
+        self.recv_bw = np.empty(0)
+
+        # intervals x streams, one column per socket
+        self.sent_streams_bw = np.empty((0, 0))
+        self.recv_streams_bw = np.empty((0, 0))
+
+        self.sent_stats = None
+        self.recv_stats = None
+
+        # Measured seconds and the relative CI the mean was reached at
+        self.duration_s = None
+        self.confidence_pct = None
+        self.duration_mode = "fixed"
+        self.stopped_early = False
+
+        # Compressed raw output, when the run was recorded to one
+        # (a list of the per-flow files for merged flows)
+        self.artifact = None
+
+        # Per-flow breakdown when merged from concurrent flows
+        self.flows = None
+
+    @property
+    def has_throughput(self):
+        return self.sent_mbps is not None
+
+    def to_dict(self):
+        return {
+            key: value for key, value in vars(self).items()
+            if not isinstance(value, np.ndarray)
+        }
+
+    def summary_lines(self):
+        # Same text plot_iperf.py has always printed
+        if self.bidirectional:
+            return [
+                f"Average Sent Throughput: {self.sent_mbps:.2f} Mbps",
+                f"Average Received Throughput: {self.recv_mbps:.2f} Mbps"
+            ]
+        return [f"Average Throughput: {self.sent_mbps:.2f} Mbps"]
+
+    def render(self, output_image):
+        render_graph(self, output_image)
+        return output_image
+
+
+# -----------------------------
+# Analysis
+# -----------------------------
+
+def _test_flags(test_name):
+    name = test_name.lower()
+
+    protocol = "UDP" if "udp" in name else "TCP"
+
+    if "uplink" in name:
+        direction = "uplink"
+    elif "downlink" in name:
+        direction = "downlink"
+    elif "bidir" in name:
+        direction = "bidirectional"
+    else:
+        direction = None
 
-    is_uplink = "uplink" in test_name
-    is_downlink = "downlink" in test_name
-    is_bidir = "bidir" in test_name or "bidirectional" in test_name
-    is_udp = "udp" in test_name
-    is_tcp = "tcp" in test_name
+    return protocol, direction
 
-    with open(json_file, 'r') as f:
-        data = json.load(f)
 
-    intervals = data["intervals"]
-
-    # Keep original lists (for compatibility)
-    times = []
-    sent_bw = []
-    recv_bw = []
-
-    # NEW: Separate time tracking to prevent dimension mismatch
-    times_sent = []
-    times_recv = []
-
-    ### Process intervals safely with checks for expected keys and structures
-    
-    if is_udp:
-        # UDP logic stays the same
-        if "end" in data:
-            end_data = data["end"]
-            if "streams" in end_data and len(end_data["streams"]) >= 1:
-                sender_stream = end_data["streams"][0]["udp"]
-                sent_bps = sender_stream["bits_per_second"]
-                sent_loss = sender_stream.get("lost_percent", 0)
-                avg_sent = (sent_bps * (1 - sent_loss / 100)) / 1_000_000
-                if len(end_data["streams"]) > 1:
-                    recv_stream = end_data["streams"][1]["udp"]
-                    recv_bps = recv_stream["bits_per_second"]
-                    recv_loss = recv_stream.get("lost_percent", 0)
-                    avg_recv = (recv_bps * (1 - recv_loss / 100)) / 1_000_000
-                    bidirectional = True
-                else:
-                    bidirectional = False
-            else:
-                avg_sent = sum(sent_bw) / len(sent_bw)
-        else:
-            avg_sent = sum(sent_bw) / len(sent_bw)
-    else:
-        # TCP — use end.streams to get accurate totals
-        # Avoid duplicate key problem by reading streams directly
-        end_streams = data.get("end", {}).get("streams", [])
-
-        sender_total = 0
-        receiver_total = 0
-        sender_count = 0
-        receiver_count = 0
-
-        for s in end_streams:
-            sender_info   = s.get("sender", {})
-            receiver_info = s.get("receiver", {})
-
-            # Check if this stream is a sending stream or receiving stream
-            # sender block has retransmits, receiver block doesn't
-            if sender_info.get("sender", True) == True and "retransmits" in sender_info:
-                sender_total += sender_info["bits_per_second"] / 1_000_000
-                sender_count += 1
-            elif sender_info.get("sender", True) == False:
-                receiver_total += sender_info["bits_per_second"] / 1_000_000
-                receiver_count += 1
-
-        if sender_count > 0:
-            avg_sent = sender_total
-        else:
-            avg_sent = sum(sent_bw) / len(sent_bw) if sent_bw else 0
-
-        if receiver_count > 0:
-            avg_recv = receiver_total
-            bidirectional = True
-        else:
-            bidirectional = len(recv_bw) > 0
-            if bidirectional:
-                avg_recv = sum(recv_bw) / len(recv_bw)
-
-    ## end of "streams" processing"
-    #     elif "sum" in interval:
-    #         value = interval["sum"]["bits_per_second"] / 1_000_000
-    #         sent_bw.append(value)
-    #         times_sent.append(current_time)
-
-    # if not sent_bw:
-    #     print("No throughput data found")
-    #     return
+def _extract_intervals(result, intervals):
+    """
+    One pass over intervals[] into dense arrays: per-direction totals
+    (from sum / sum_bidir_reverse) and per-stream matrices keyed by
+    socket. Missing sums are rebuilt from the stream columns.
+    """
 
-    # -----------------------------
-    # Correct Average Calculation
-    # -----------------------------
+    n = len(intervals)
+    if not n:
+        return
+
+    starts = np.zeros(n)
+    ends = np.zeros(n)
+    sent_sum = np.full(n, np.nan)
+    recv_sum = np.full(n, np.nan)
+
+    sockets = {False: {}, True: {}}
+    cells = {False: [], True: []}
+
+    for i, interval in enumerate(intervals):
+        total = interval.get("sum")
+        if total:
+            starts[i] = total.get("start", 0)
+            ends[i] = total.get("end", 0)
+            sent_sum[i] = total.get("bits_per_second", np.nan)
+
+        reverse = interval.get("sum_bidir_reverse")
+        if reverse:
+            recv_sum[i] = reverse.get("bits_per_second", np.nan)
+
+        for stream in interval.get("streams", []):
+            # Only --bidir splits directions; -R streams are all ours
+            is_rev = reverse is not None and _is_reverse(stream)
+            column = sockets[is_rev].setdefault(
+                stream.get("socket"), len(sockets[is_rev])
+            )
+            cells[is_rev].append((i, column, stream.get("bits_per_second", 0)))
+
+            if not total:
+                starts[i] = stream.get("start", 0)
+                ends[i] = stream.get("end", 0)
+
+    matrices = {}
+    for is_rev in (False, True):
+        matrix = np.zeros((n, len(sockets[is_rev])))
+        if cells[is_rev]:
+            rows, cols, values = np.array(cells[is_rev]).T
+            matrix[rows.astype(int), cols.astype(int)] = values
+        matrices[is_rev] = matrix / 1_000_000
+
+    result.sent_streams_bw = matrices[False]
+    result.recv_streams_bw = matrices[True]
+
+    sent = np.where(np.isnan(sent_sum), matrices[False].sum(axis=1) * 1_000_000, sent_sum)
+    recv = np.where(np.isnan(recv_sum), matrices[True].sum(axis=1) * 1_000_000, recv_sum)
+
+    # Omitted intervals (-O) carry "omitted": true and are not measured
+    keep = np.array([not iv.get("sum", {}).get("omitted", False) for iv in intervals])
+
+    result.times_sent = ends[keep]
+    result.sent_bw = sent[keep] / 1_000_000
+
+    if matrices[True].shape[1] or not np.isnan(recv_sum).all():
+        result.times_recv = ends[keep]
+        result.recv_bw = recv[keep] / 1_000_000
+
+    result.sent_stats = interval_stats(result.sent_bw, starts[keep])
+    result.recv_stats = interval_stats(result.recv_bw, starts[keep])
+
+
+def interval_stats(values, starts):
+    """mean / p5 / p50 / p95 / std and time-to-steady-state of one series."""
+
+    if not len(values):
+        return None
+
+    p5, p50, p95 = np.percentile(values, [5, 50, 95])
+
+    return {
+        "mean": float(values.mean()),
+        "p5": float(p5),
+        "p50": float(p50),
+        "p95": float(p95),
+        "std": float(values.std()),
+        "time_to_steady_s": _time_to_steady(values, starts)
+    }
+
+
+def ci_half_width_pct(values, warmup=CI_WARMUP_INTERVALS):
+    """95% CI half-width of the mean as a percentage of the mean."""
+
+    values = np.asarray(values[warmup:], dtype=float)
+
+    if len(values) < 3:
+        return None
+
+    mean = values.mean()
+    if mean <= 0:
+        return None
+
+    half_width = CI_Z * values.std(ddof=1) / np.sqrt(len(values))
+    return float(100 * half_width / mean)
+
+
+def _time_to_steady(values, starts):
+    n = len(values)
+    if n < STEADY_WINDOW * 2:
+        return None
+
+    level = np.median(values[n // 2:])
+    if level <= 0:
+        return None
+
+    # Trailing rolling mean via cumulative sums
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    rolling = (csum[STEADY_WINDOW:] - csum[:-STEADY_WINDOW]) / STEADY_WINDOW
+
+    outside = np.abs(rolling - level) > STEADY_TOLERANCE * level
+    if not outside.any():
+        return float(starts[0])
+
+    last_out = np.flatnonzero(outside)[-1]
+    if last_out + 1 >= len(rolling):
+        # Never settled
+        return None
+
+    # rolling[k] covers values[k .. k+window-1]; steady from its first sample
+    return float(starts[last_out + 1])
+
+
+def _is_reverse(block):
+    # --bidir: streams of the reverse direction carry "sender": false
+    return block.get("sender", True) is False
+
+
+def _analyze_tcp(result, end):
+    sent = []
+    recv = []
+
+    for stream in end.get("streams", []):
+        sender_info = stream.get("sender", {})
+
+        if _is_reverse(sender_info):
+            recv.append(sender_info)
+        elif "retransmits" in sender_info:
+            sent.append(sender_info)
 
-    bidirectional = len(recv_bw) > 0
-
-    if is_udp:
-        if "end" in data:
-            end_data = data["end"]
-
-            # Handle iperf UDP structure safely
-            if "streams" in end_data and len(end_data["streams"]) >= 1:
-                # Sender stream
-                sender_stream = end_data["streams"][0]["udp"]
-                sent_bps = sender_stream["bits_per_second"]
-                sent_loss = sender_stream.get("lost_percent", 0)
-
-                # Effective throughput after loss
-                avg_sent = (sent_bps * (1 - sent_loss / 100)) / 1_000_000
-
-                # Receiver stream (bidirectional case)
-                if len(end_data["streams"]) > 1:
-                    recv_stream = end_data["streams"][1]["udp"]
-                    recv_bps = recv_stream["bits_per_second"]
-                    recv_loss = recv_stream.get("lost_percent", 0)
-
-                    avg_recv = (recv_bps * (1 - recv_loss / 100)) / 1_000_000
-                    bidirectional = True
-                else:
-                    bidirectional = False
-            else:
-                avg_sent = sum(sent_bw) / len(sent_bw)
-        else:
-            avg_sent = sum(sent_bw) / len(sent_bw)
+    if sent:
+        result.sent_mbps = sum(s["bits_per_second"] for s in sent) / 1_000_000
+        result.sent_retransmits = end.get("sum_sent", {}).get(
+            "retransmits", sum(s.get("retransmits", 0) for s in sent)
+        )
+
+    if recv:
+        result.bidirectional = True
+        result.recv_mbps = sum(s["bits_per_second"] for s in recv) / 1_000_000
+        result.recv_retransmits = end.get("sum_sent_bidir_reverse", {}).get(
+            "retransmits"
+        )
+
+
+def _effective_udp(udp):
+    loss = udp.get("lost_percent", 0) or 0
+    return udp["bits_per_second"] * (1 - loss / 100) / 1_000_000, loss
+
+
+def _analyze_udp(result, end):
+    streams = [s["udp"] for s in end.get("streams", []) if "udp" in s]
+
+    if not streams:
+        return
+
+    if any(_is_reverse(s) for s in streams):
+        sent = [s for s in streams if not _is_reverse(s)]
+        recv = [s for s in streams if _is_reverse(s)]
     else:
-        avg_sent = sum(sent_bw) / len(sent_bw)
+        # Older iperf3 builds don't tag direction: first stream is ours
+        sent, recv = streams[:1], streams[1:2]
 
-    if bidirectional and not is_udp:
-        avg_recv = sum(recv_bw) / len(recv_bw)
+    if sent:
+        result.sent_mbps, result.sent_loss_pct = _effective_udp(sent[0])
+        result.sent_jitter_ms = sent[0].get("jitter_ms")
 
-    # -----------------------------
-    # PRINT VALUES FOR ROBOT PARSING
-    # -----------------------------
-    if bidirectional:
-        print(f"Average Sent Throughput: {avg_sent:.2f} Mbps")
-        print(f"Average Received Throughput: {avg_recv:.2f} Mbps")
+    if recv:
+        result.bidirectional = True
+        result.recv_mbps, result.recv_loss_pct = _effective_udp(recv[0])
+        result.recv_jitter_ms = recv[0].get("jitter_ms")
+
+
+def analyze_iperf(data, test_name=""):
+    """
+    Analyze iperf3 -J output (dict or JSON text) and return an
+    IperfResult. Raises ValueError when iperf3 itself reported an error.
+    """
+
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+
+    if data.get("error"):
+        raise ValueError(f"iperf3 error: {data['error']}")
+
+    protocol, direction = _test_flags(test_name)
+    result = IperfResult(test_name, protocol, direction)
+
+    _extract_intervals(result, data.get("intervals", []))
+
+    end = data.get("end", {})
+
+    if protocol == "UDP":
+        _analyze_udp(result, end)
     else:
-        print(f"Average Throughput: {avg_sent:.2f} Mbps")
+        _analyze_tcp(result, end)
+
+    # No end summary (aborted run): fall back to the interval average
+    if result.sent_mbps is None and len(result.sent_bw):
+        result.sent_mbps = float(result.sent_bw.mean())
+
+    if result.recv_mbps is None and len(result.recv_bw):
+        result.bidirectional = True
+        result.recv_mbps = float(result.recv_bw.mean())
+
+    result.duration_s = _duration(end, result.times_sent)
+
+    # Worst direction decides how trustworthy the row is
+    cis = [ci_half_width_pct(bw) for bw in (result.sent_bw, result.recv_bw) if len(bw)]
+    cis = [ci for ci in cis if ci is not None]
+    result.confidence_pct = max(cis) if cis else None
+
+    return result
+
+
+def _duration(end, times):
+    for key in ("sum_sent", "sum"):
+        if end.get(key, {}).get("end"):
+            return float(end[key]["end"])
+
+    return float(times[-1]) if len(times) else None
+
+
+def analyze_iperf_file(json_file):
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+
+    return analyze_iperf(data, os.path.basename(json_file))
+
+
+# -----------------------------
+# Graph
+# -----------------------------
+
+def render_graph(result, output_image):
+    # Imported here so analysis alone never pays for matplotlib
+    from performance import rendering
 
     # -----------------------------
     # Dynamic Title
     # -----------------------------
-    protocol = "UDP" if is_udp else "TCP"
-
-    if is_uplink:
-        title = f"iPerf {protocol} Uplink Performance"
-    elif is_downlink:
-        title = f"iPerf {protocol} Downlink Performance"
-    elif is_bidir:
-        title = f"iPerf {protocol} Bidirectional Performance"
+    if result.direction == "uplink":
+        title = f"iPerf {result.protocol} Uplink Performance"
+    elif result.direction == "downlink":
+        title = f"iPerf {result.protocol} Downlink Performance"
+    elif result.direction == "bidirectional":
+        title = f"iPerf {result.protocol} Bidirectional Performance"
     else:
         title = "iPerf Performance Graph"
 
-    plt.figure()
+    fig = rendering.new_figure()
+    ax = fig.add_subplot()
 
     # -----------------------------
     # Safe Plot Logic
     # -----------------------------
-    if is_downlink:
-        plt.plot(times_sent, sent_bw, label="Downlink Throughput")
-        plt.axhline(y=avg_sent, linestyle="--",
-                    label=f"Avg Downlink: {avg_sent:.2f} Mbps")
+    avg_sent = result.sent_mbps or 0
+
+    if result.direction == "downlink":
+        ax.plot(result.times_sent, result.sent_bw, label="Downlink Throughput")
+        ax.axhline(y=avg_sent, linestyle="--",
+                   label=f"Avg Downlink: {avg_sent:.2f} Mbps")
 
-    elif is_uplink:
-        plt.plot(times_sent, sent_bw, label="Uplink Throughput")
-        plt.axhline(y=avg_sent, linestyle="--",
-                    label=f"Avg Uplink: {avg_sent:.2f} Mbps")
+    elif result.direction == "uplink":
+        ax.plot(result.times_sent, result.sent_bw, label="Uplink Throughput")
+        ax.axhline(y=avg_sent, linestyle="--",
+                   label=f"Avg Uplink: {avg_sent:.2f} Mbps")
 
     else:
         # Bidirectional
-        plt.plot(times_sent, sent_bw, label="Uplink Throughput")
-        plt.axhline(y=avg_sent, linestyle="--",
-                    label=f"Avg Uplink: {avg_sent:.2f} Mbps")
+        ax.plot(result.times_sent, result.sent_bw, label="Uplink Throughput")
+        ax.axhline(y=avg_sent, linestyle="--",
+                   label=f"Avg Uplink: {avg_sent:.2f} Mbps")
 
-        if bidirectional:
-            plt.plot(times_recv, recv_bw, label="Downlink Throughput")
-            plt.axhline(y=avg_recv, linestyle="--",
-                        label=f"Avg Downlink: {avg_recv:.2f} Mbps")
+        if result.bidirectional:
+            ax.plot(result.times_recv, result.recv_bw, label="Downlink Throughput")
+            ax.axhline(y=result.recv_mbps, linestyle="--",
+                       label=f"Avg Downlink: {result.recv_mbps:.2f} Mbps")
 
-    plt.xlabel("Time (seconds)")
-    plt.ylabel("Throughput (Mbps)")
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
+    ax.set_xlabel("Time (seconds)")
+    ax.set_ylabel("Throughput (Mbps)")
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
 
     # Disable scientific offset like +2e3
-    ax = plt.gca()
     ax.ticklabel_format(style='plain', axis='y')
     ax.yaxis.get_major_formatter().set_useOffset(False)
 
-    # Ensure directory exists before saving
-    output_dir = os.path.dirname(output_image)
+    # Creates the output directory if needed
+    rendering.save_png(fig, output_image)
+
+
+def plot_iperf(json_file, output_image=None):
+
+    result = analyze_iperf_file(json_file)
+
+    if not result.has_throughput:
+        print("No throughput data found")
+        return result
+
+    # -----------------------------
+    # PRINT VALUES FOR ROBOT PARSING
+    # -----------------------------
+    for line in result.summary_lines():
+        print(line)
 
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    if output_image:
+        result.render(output_image)
 
-    plt.savefig(output_image)
-    plt.close()
+    return result
 
 
 if __name__ == "__main__":
-    plot_iperf(sys.argv[1], sys.argv[2])
\ No newline at end of file
+    # Run as a script: make the performance package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    plot_iperf(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
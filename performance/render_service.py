@@ -0,0 +1,358 @@
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from libraries.cnwave.logger import setup_logger
+from performance import graphs, rendering
+from performance.graph_cache import GraphCache
+from performance.results_store import ResultsStore, DB_FILE
+
+
+logger = setup_logger("render_service")
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+
+# Precomputed images live next to the run's raw results
+GRAPHS_DIR = "graphs"
+MANIFEST_NAME = "manifest.json"
+
+
+def graph_key(route, args):
+    """Cache key of a graph request, independent of the data version."""
+    return GraphCache.make_key(route, args, "")
+
+
+def _file_name(route, args):
+    parts = [route] + [
+        str(args[k]) for k in ("channel", "tdd", "mcs", "test_name") if args.get(k)
+    ]
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", "__".join(parts)) + ".png"
+
+
+# -----------------------------------------
+# Worker Process
+# -----------------------------------------
+
+_worker_store = None
+
+
+def _init_worker(db_file):
+    global _worker_store
+    rendering.configure(rendering.DASHBOARD_STYLE)
+    _worker_store = ResultsStore(db_file)
+
+
+def _render_job(route, args, path):
+    filters, render, source = graphs.GRAPHS[route]
+
+    df = graphs.load_frame(_worker_store, source, filters(args))
+    data = render(df, args)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    return len(data)
+
+
+class RenderService:
+    """
+    Precomputes the standard graphs of a run in a process pool and
+    stores them in results/<setup>/<run_id>/graphs/ with a manifest of
+    the data version each image was rendered from.
+
+    Standard set: the per-test time series (/device_graph_image) and,
+    per channel/TDD/MCS, the 1 Stream vs 4 Stream chart of every TCP
+    test and the UDP bars (/stream_comparison_graph). A watcher thread
+    picks up runs as soon as their rows land in the results store.
+    """
+
+    def __init__(self, db_file=DB_FILE, results_dir=RESULTS_DIR, workers=2,
+                 poll_interval=5):
+
+        self.db_file = db_file
+        self.results_dir = results_dir
+        self.workers = int(workers)
+        self.poll_interval = float(poll_interval)
+
+        self._store = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._manifests = {}
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.stats = {"rendered": 0, "skipped": 0, "failed": 0}
+
+    # -----------------------------------------
+    # Setup
+    # -----------------------------------------
+
+    @property
+    def store(self):
+        if self._store is None and os.path.exists(self.db_file):
+            self._store = ResultsStore(self.db_file)
+        return self._store
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: forking a threaded web server can deadlock the child
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.db_file,)
+            )
+        return self._executor
+
+    def shutdown(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    # -----------------------------------------
+    # Manifest
+    # -----------------------------------------
+
+    def _graphs_dir(self, board_model, run_id):
+        return os.path.join(self.results_dir, board_model, run_id, GRAPHS_DIR)
+
+    def _manifest(self, board_model, run_id):
+        path = os.path.join(self._graphs_dir(board_model, run_id), MANIFEST_NAME)
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return {}
+
+        cached = self._manifests.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        self._manifests[path] = (mtime, manifest)
+        return manifest
+
+    def _write_manifest(self, board_model, run_id, manifest):
+        graphs_dir = self._graphs_dir(board_model, run_id)
+        path = os.path.join(graphs_dir, MANIFEST_NAME)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    # -----------------------------------------
+    # Jobs
+    # -----------------------------------------
+
+    def jobs_for_run(self, board_model, run_id):
+        """[(route, args, aliases)] of the standard graphs of a run."""
+
+        rows = self.store.query(board_model=board_model, run_id=run_id)
+        run_args = {"board_model": board_model, "run": run_id}
+
+        jobs = []
+
+        for test_name in sorted(rows["test_name"].unique()):
+            jobs.append((
+                "device_graph_image", dict(run_args, test_name=test_name), []
+            ))
+
+        cells = rows[["channel", "tdd", "mcs", "test_name"]].drop_duplicates()
+
+        for (channel, tdd, mcs), cell in cells.groupby(["channel", "tdd", "mcs"], sort=True):
+            cell_args = dict(run_args, channel=channel, tdd=tdd, mcs=mcs)
+            tests = set(cell["test_name"])
+
+            for test_name in sorted(tests):
+                if "udp" in test_name.lower():
+                    jobs.append(("stream_comparison_graph", dict(cell_args, test_name=test_name), []))
+                    continue
+
+                if not test_name.endswith("-1Stream"):
+                    continue
+
+                # Same chart for either stream count of the pair
+                four_stream = test_name.replace("-1Stream", "-4Stream")
+                if four_stream in tests:
+                    jobs.append((
+                        "stream_comparison_graph",
+                        dict(cell_args, test_name=test_name),
+                        [dict(cell_args, test_name=four_stream)]
+                    ))
+
+        return jobs
+
+    def precompute_run(self, board_model, run_id):
+        """Render the run's graphs whose data changed; returns the count."""
+
+        if self.store is None:
+            return 0
+
+        # Only runs that have a results folder here (not imported history)
+        if not os.path.isdir(os.path.join(self.results_dir, board_model, run_id)):
+            return 0
+
+        with self._lock:
+            graphs_dir = self._graphs_dir(board_model, run_id)
+            os.makedirs(graphs_dir, exist_ok=True)
+
+            manifest = dict(self._manifest(board_model, run_id))
+            pending = []
+
+            for route, args, aliases in self.jobs_for_run(board_model, run_id):
+                filters, _, _ = graphs.GRAPHS[route]
+                version = self.store.version(**filters(args))
+                key = graph_key(route, args)
+
+                entry = manifest.get(key)
+                if entry and entry["version"] == version:
+                    self.stats["skipped"] += 1
+                    continue
+
+                name = _file_name(route, args)
+                future = self._pool().submit(
+                    _render_job, route, args, os.path.join(graphs_dir, name)
+                )
+                pending.append((future, route, args, aliases, name, version))
+
+            for future, route, args, aliases, name, version in pending:
+                try:
+                    future.result()
+                except Exception:
+                    self.stats["failed"] += 1
+                    logger.exception(f"{board_model}/{run_id}: rendering {route} {args} failed")
+                    continue
+
+                entry = {"file": name, "version": version}
+                for key_args in [args] + aliases:
+                    manifest[graph_key(route, key_args)] = entry
+                self.stats["rendered"] += 1
+
+            if pending:
+                self._write_manifest(board_model, run_id, manifest)
+
+            return len(pending)
+
+    # -----------------------------------------
+    # Lookup (dashboard routes)
+    # -----------------------------------------
+
+    def lookup(self, route, args, version):
+        """Path of a precomputed image for exactly these args, if current."""
+
+        board_model = (args.get("board_model") or "").strip()
+        run_id = (args.get("run") or "").strip()
+        if not board_model or not run_id or route not in graphs.GRAPHS:
+            return None
+
+        entry = self._manifest(board_model, run_id).get(graph_key(route, args))
+        if not entry or entry["version"] != version:
+            return None
+
+        path = os.path.join(self._graphs_dir(board_model, run_id), entry["file"])
+        return path if os.path.exists(path) else None
+
+    # -----------------------------------------
+    # Watcher
+    # -----------------------------------------
+
+    def start(self):
+        """Watch the store and precompute runs as their rows arrive."""
+
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._watch, name="render-service", daemon=True
+        )
+        self._thread.start()
+
+    def _watch(self):
+        last_id = None
+        timeout = 0
+
+        # Only the first pass is immediate; without a store yet (dashboard
+        # started before the first run) every later pass waits too
+        while not self._stop.wait(timeout):
+            timeout = self.poll_interval
+
+            store = self.store
+            if store is None:
+                continue
+
+            # Existing history is backfilled with the CLI, not on start-up
+            if last_id is None:
+                last_id = store.last_id()
+                continue
+
+            current = store.last_id()
+            if current == last_id:
+                continue
+
+            for board_model, run_id in store.runs_since(last_id):
+                try:
+                    self.precompute_run(board_model, run_id)
+                except Exception:
+                    logger.exception(f"{board_model}/{run_id}: precompute failed")
+
+            last_id = current
+
+
+def main(argv=None):
+    """
+    python -m performance.render_service SETUP RUN_ID
+    python -m performance.render_service --all
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    service = RenderService()
+    if service.store is None:
+        print(f"No results store at {service.db_file}")
+        return
+
+    if argv == ["--all"]:
+        runs = service.store.runs_since(0)
+    elif len(argv) == 2:
+        runs = [tuple(argv)]
+    else:
+        print(main.__doc__)
+        return
+
+    try:
+        for board_model, run_id in runs:
+            count = service.precompute_run(board_model, run_id)
+            print(f"{board_model}/{run_id}: {count} graphs rendered")
+    finally:
+        service.shutdown()
+
+    print(
+        f"Rendered: {service.stats['rendered']} | "
+        f"up to date: {service.stats['skipped']} | "
+        f"failed: {service.stats['failed']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import io
+import os
+
+import matplotlib
+from matplotlib import style as mpl_style
+from matplotlib import font_manager
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+DARK_BG = "#0b1220"
+
+# Dashboard look: dark_background plus the dashboard font sizes. Font
+# names are fallbacks, so hosts without Segoe UI don't warn per figure.
+DASHBOARD_STYLE = dict(mpl_style.library["dark_background"])
+DASHBOARD_STYLE.update({
+    "font.family": "sans-serif",
+    "font.sans-serif": ["Segoe UI", "DejaVu Sans", "Arial"],
+    "font.size": 12,
+    "axes.titlesize": 14,
+    "axes.labelsize": 12,
+    "xtick.labelsize": 10,
+    "ytick.labelsize": 10,
+    "legend.fontsize": 10,
+})
+
+
+def configure(style=None):
+    """
+    Apply style to rcParams once, at process start-up.
+
+    Artists read rcParams when they are created, so rcParams must not
+    change while figures are being drawn in other threads; everything
+    else in this module only touches per-figure objects.
+    """
+
+    if style:
+        matplotlib.rcParams.update(style)
+
+    # Resolve and cache the font now instead of in the first request
+    font_manager.findfont(font_manager.FontProperties(
+        family=matplotlib.rcParams["font.family"]
+    ))
+
+
+def new_figure(figsize=None, dpi=None, facecolor=None):
+    """A Figure with its own Agg canvas; not registered with pyplot."""
+
+    fig = Figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def to_png(fig, **savefig_kwargs):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", **savefig_kwargs)
+    return buffer.getvalue()
+
+
+def save_png(fig, output_image, **savefig_kwargs):
+    output_dir = os.path.dirname(output_image)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    fig.savefig(output_image, format="png", **savefig_kwargs)
@@ -0,0 +1,882 @@
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+# Override with CNWAVE_RESULTS_DB, e.g. to share one store between checkouts
+DB_FILE = os.environ.get(
+    "CNWAVE_RESULTS_DB", os.path.join(PROJECT_ROOT, "results.sqlite")
+)
+
+# Column order of dashboard_data.csv, which the dashboard also relies on
+COLUMNS = [
+    "timestamp", "board_model", "run_id", "channel", "tdd", "mcs",
+    "test_name", "sent_avg", "recv_avg", "status", "pop_version",
+    "dn_version", "duration_s", "confidence_pct"
+]
+
+REAL_COLUMNS = ["sent_avg", "recv_avg", "duration_s", "confidence_pct"]
+
+# DataFrame normalization shared by the dashboard and render workers
+TEXT_COLS = ["run_id", "pop_version", "dn_version"]
+CATEGORY_COLS = ["board_model", "channel", "tdd", "mcs", "test_name"]
+NUMERIC_COLS = REAL_COLUMNS
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id              INTEGER PRIMARY KEY,
+    timestamp       TEXT NOT NULL,
+    board_model     TEXT NOT NULL DEFAULT '',
+    run_id          TEXT NOT NULL DEFAULT '',
+    channel         TEXT NOT NULL DEFAULT '',
+    tdd             TEXT NOT NULL DEFAULT '',
+    mcs             TEXT NOT NULL DEFAULT '',
+    test_name       TEXT NOT NULL,
+    sent_avg        REAL,
+    recv_avg        REAL,
+    status          TEXT,
+    pop_version     TEXT,
+    dn_version      TEXT,
+    duration_s      REAL,
+    confidence_pct  REAL,
+    UNIQUE (board_model, run_id, channel, tdd, mcs, test_name, timestamp)
+);
+
+CREATE INDEX IF NOT EXISTS idx_results_cell
+    ON results (board_model, run_id, channel, tdd, mcs, test_name, timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_results_run
+    ON results (run_id, channel, tdd, mcs, test_name);
+
+CREATE INDEX IF NOT EXISTS idx_results_test_time
+    ON results (test_name, timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_results_time
+    ON results (timestamp);
+"""
+
+# Per run/cell/test summaries, kept up to date at ingest by a trigger,
+# so comparison views read one small row per test instead of the raw
+# rows. Sums and counts (not means) so groups of rows combine exactly.
+SUMMARY_KEY = ["board_model", "run_id", "channel", "tdd", "mcs", "test_name"]
+
+SUMMARY_COLUMNS = SUMMARY_KEY + [
+    "family", "streams", "count", "pass_count",
+    "sent_sum", "sent_n", "sent_min", "sent_max",
+    "recv_sum", "recv_n", "recv_min", "recv_max",
+    "first", "last"
+]
+
+# Test family: the test name without its stream count, as the 1 Stream
+# vs 4 Stream chart pairs them
+FAMILY_SQL = "REPLACE(REPLACE({0}, '-1Stream', ''), '-4Stream', '')"
+STREAMS_SQL = (
+    "CASE WHEN {0} LIKE '%-1Stream' THEN 1 "
+    "WHEN {0} LIKE '%-4Stream' THEN 4 END"
+)
+PASS_SQL = "COALESCE(UPPER(TRIM({0})) = 'PASS', 0)"
+
+SUMMARY_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS run_summary (
+    board_model  TEXT NOT NULL,
+    run_id       TEXT NOT NULL,
+    channel      TEXT NOT NULL,
+    tdd          TEXT NOT NULL,
+    mcs          TEXT NOT NULL,
+    test_name    TEXT NOT NULL,
+    family       TEXT NOT NULL,
+    streams      INTEGER,
+    count        INTEGER NOT NULL,
+    pass_count   INTEGER NOT NULL,
+    sent_sum     REAL NOT NULL,
+    sent_n       INTEGER NOT NULL,
+    sent_min     REAL,
+    sent_max     REAL,
+    recv_sum     REAL NOT NULL,
+    recv_n       INTEGER NOT NULL,
+    recv_min     REAL,
+    recv_max     REAL,
+    first        TEXT,
+    last         TEXT,
+    PRIMARY KEY (board_model, run_id, channel, tdd, mcs, test_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_run
+    ON run_summary (run_id, channel, tdd, mcs);
+
+CREATE TRIGGER IF NOT EXISTS results_summary AFTER INSERT ON results
+BEGIN
+    INSERT INTO run_summary ({', '.join(SUMMARY_COLUMNS)})
+    VALUES (
+        NEW.board_model, NEW.run_id, NEW.channel, NEW.tdd, NEW.mcs, NEW.test_name,
+        {FAMILY_SQL.format("NEW.test_name")},
+        {STREAMS_SQL.format("NEW.test_name")},
+        1, {PASS_SQL.format("NEW.status")},
+        IFNULL(NEW.sent_avg, 0), NEW.sent_avg IS NOT NULL, NEW.sent_avg, NEW.sent_avg,
+        IFNULL(NEW.recv_avg, 0), NEW.recv_avg IS NOT NULL, NEW.recv_avg, NEW.recv_avg,
+        NEW.timestamp, NEW.timestamp
+    )
+    ON CONFLICT ({', '.join(SUMMARY_KEY)}) DO UPDATE SET
+        count = count + 1,
+        pass_count = pass_count + excluded.pass_count,
+        sent_sum = sent_sum + excluded.sent_sum,
+        sent_n = sent_n + excluded.sent_n,
+        sent_min = MIN(IFNULL(sent_min, excluded.sent_min), IFNULL(excluded.sent_min, sent_min)),
+        sent_max = MAX(IFNULL(sent_max, excluded.sent_max), IFNULL(excluded.sent_max, sent_max)),
+        recv_sum = recv_sum + excluded.recv_sum,
+        recv_n = recv_n + excluded.recv_n,
+        recv_min = MIN(IFNULL(recv_min, excluded.recv_min), IFNULL(excluded.recv_min, recv_min)),
+        recv_max = MAX(IFNULL(recv_max, excluded.recv_max), IFNULL(excluded.recv_max, recv_max)),
+        first = MIN(first, excluded.first),
+        last = MAX(last, excluded.last);
+END;
+"""
+
+# Full rebuild from the raw rows: the same numbers the trigger keeps
+SUMMARY_REBUILD = f"""
+    INSERT INTO run_summary ({', '.join(SUMMARY_COLUMNS)})
+    SELECT {', '.join(SUMMARY_KEY)},
+           {FAMILY_SQL.format("test_name")},
+           {STREAMS_SQL.format("test_name")},
+           COUNT(*), SUM({PASS_SQL.format("status")}),
+           IFNULL(SUM(sent_avg), 0), COUNT(sent_avg), MIN(sent_avg), MAX(sent_avg),
+           IFNULL(SUM(recv_avg), 0), COUNT(recv_avg), MIN(recv_avg), MAX(recv_avg),
+           MIN(timestamp), MAX(timestamp)
+    FROM results
+    GROUP BY {', '.join(SUMMARY_KEY)}
+"""
+
+# Groupings accepted by aggregate()
+GROUPINGS = {
+    "test": ["test_name"],
+    "run": ["board_model", "run_id"],
+    "cell": ["channel", "tdd", "mcs", "test_name"],
+}
+
+# Sort orders of page(): SQL sort key per column. NULL throughput
+# sorts first, as the lowest value, so the key is never NULL.
+SORT_KEYS = {
+    "timestamp": "timestamp",
+    "channel": "channel",
+    "tdd": "tdd",
+    "mcs": "mcs",
+    "test_name": "test_name",
+    "sent_avg": "IFNULL(sent_avg, -1e308)",
+    "recv_avg": "IFNULL(recv_avg, -1e308)",
+    "status": "IFNULL(status, '')",
+}
+
+# Equality filters accepted by query(), in index order
+FILTERS = ["board_model", "run_id", "channel", "tdd", "mcs", "test_name", "status"]
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        # pandas reads integer columns with gaps as float: 9.0 -> "9"
+        value = int(value)
+    return str(value).strip()
+
+
+def _real(value):
+    if value is None or value == "":
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if value != value else value
+
+
+def _scalar(value):
+    # numpy scalars from a frame row -> plain Python values
+    return value.item() if hasattr(value, "item") else value
+
+
+def _timestamp(value):
+    value = _text(value)
+    if not value:
+        return value
+
+    # Store one sortable format so range queries can use the index;
+    # rows written by Log Raw Results already use it
+    try:
+        datetime.strptime(value, TIMESTAMP_FORMAT)
+        return value
+    except ValueError:
+        pass
+
+    parsed = pd.to_datetime(value, errors="coerce")
+    if pd.isna(parsed):
+        return value
+    return parsed.strftime(TIMESTAMP_FORMAT)
+
+
+def _strip(series):
+    # Few distinct values per column: strip those, not every row
+    codes, uniques = pd.factorize(series.astype(str), use_na_sentinel=False)
+    return pd.Series(
+        pd.Index(uniques).str.strip().take(codes), index=series.index, name=series.name
+    )
+
+
+def normalize_frame(df):
+    """Strip text columns, make filter columns categorical, type the rest."""
+
+    for col in TEXT_COLS + CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = _strip(df[col])
+
+    for col in CATEGORY_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    if "timestamp" in df.columns:
+        # Store rows all use TIMESTAMP_FORMAT; older CSV rows may not
+        raw = df["timestamp"]
+        parsed = pd.to_datetime(raw, format=TIMESTAMP_FORMAT, errors="coerce")
+        if (parsed.isna() & raw.notna()).any():
+            parsed = pd.to_datetime(raw, errors="coerce")
+        df["timestamp"] = parsed
+
+    return df
+
+
+def filter_frame(df, start=None, end=None, **filters):
+    """query() filters applied to a normalized frame (the CSV fallback)."""
+
+    for column in FILTERS:
+        value = filters.get(column)
+        if value is None or _text(value) == "" or column not in df.columns:
+            continue
+        df = df[df[column].astype(str).str.strip() == _text(value)]
+
+    if start and "timestamp" in df.columns:
+        df = df[df["timestamp"] >= pd.to_datetime(start)]
+
+    if end and "timestamp" in df.columns:
+        df = df[df["timestamp"] < pd.to_datetime(end) + pd.Timedelta(days=1)]
+
+    return df
+
+
+def page_frame(df, sort="timestamp", descending=False, after=None, limit=100):
+    """
+    page() over a normalized frame (the CSV fallback); the frame's
+    index plays the part of the row id.
+    """
+
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort column: {sort}")
+
+    if sort in REAL_COLUMNS:
+        key = df[sort].fillna(-1e308).astype(float)
+    elif sort == "timestamp":
+        key = df[sort].dt.strftime(TIMESTAMP_FORMAT).fillna("")
+    else:
+        key = df[sort].astype(str).fillna("")
+
+    ids = pd.Series(df.index, index=df.index)
+
+    if after is not None:
+        value, row_id = after
+        if descending:
+            mask = (key < value) | ((key == value) & (ids < row_id))
+        else:
+            mask = (key > value) | ((key == value) & (ids > row_id))
+        df, key, ids = df[mask], key[mask], ids[mask]
+
+    order = pd.DataFrame({"key": key, "id": ids}).sort_values(
+        ["key", "id"], ascending=not descending
+    )
+    rows = df.loc[order.index[:limit]]
+
+    cursor = None
+    if len(order) > limit:
+        last = order.iloc[limit - 1]
+        cursor = [_scalar(last["key"]), int(last["id"])]
+
+    return rows, cursor
+
+
+def summary_frame(df):
+    """ResultsStore.summary() computed with pandas, for rows not in a store."""
+
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    df = df.assign(
+        passed=df["status"].astype(str).str.strip().str.upper() == "PASS",
+        timestamp=df["timestamp"].dt.strftime(TIMESTAMP_FORMAT)
+    )
+    for col in SUMMARY_KEY:
+        df[col] = df[col].astype(str)
+
+    summary = df.groupby(SUMMARY_KEY, sort=True).agg(
+        count=("test_name", "size"),
+        pass_count=("passed", "sum"),
+        sent_sum=("sent_avg", "sum"),
+        sent_n=("sent_avg", "count"),
+        sent_min=("sent_avg", "min"),
+        sent_max=("sent_avg", "max"),
+        recv_sum=("recv_avg", "sum"),
+        recv_n=("recv_avg", "count"),
+        recv_min=("recv_avg", "min"),
+        recv_max=("recv_avg", "max"),
+        first=("timestamp", "min"),
+        last=("timestamp", "max"),
+    ).reset_index()
+
+    names = summary["test_name"]
+    summary["family"] = names.str.replace("-1Stream", "").str.replace("-4Stream", "")
+    summary["streams"] = np.select(
+        [names.str.endswith("-1Stream"), names.str.endswith("-4Stream")], [1, 4], None
+    )
+
+    return summary[SUMMARY_COLUMNS]
+
+
+def summary_mean(rows, direction):
+    """Mean sent/recv throughput over all raw rows behind summary rows."""
+    n = rows[f"{direction}_n"].sum()
+    return rows[f"{direction}_sum"].sum() / n if n else np.nan
+
+
+def gains_frame(summary):
+    """
+    Per run, cell and test family of summary rows: mean throughput of
+    the 1 Stream and 4 Stream tests and the 4S/1S gain per direction.
+    Families without both stream counts (UDP) have no gain.
+    """
+
+    key = ["board_model", "run_id", "channel", "tdd", "mcs", "family"]
+    if summary.empty:
+        return pd.DataFrame(columns=key)
+
+    summary = summary.assign(streams=summary["streams"].fillna(0).astype(int))
+
+    records = []
+    for values, rows in summary.groupby(key, sort=True):
+        one = rows[rows["streams"] == 1]
+        four = rows[rows["streams"] == 4]
+
+        record = dict(zip(key, values))
+        record["count"] = int(rows["count"].sum())
+
+        for direction in ("sent", "recv"):
+            record[f"{direction}_mean"] = summary_mean(rows, direction)
+            record[f"{direction}_1s"] = summary_mean(one, direction)
+            record[f"{direction}_4s"] = summary_mean(four, direction)
+            record[f"{direction}_gain"] = (
+                record[f"{direction}_4s"] / record[f"{direction}_1s"]
+                if record[f"{direction}_1s"] else np.nan
+            )
+
+        records.append(record)
+
+    return pd.DataFrame(records)
+
+
+def aggregate_frame(df, group_by="test"):
+    """aggregate() computed with pandas, for rows not in a store."""
+
+    if group_by not in GROUPINGS:
+        raise ValueError(f"Unknown grouping: {group_by}")
+
+    columns = GROUPINGS[group_by]
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+
+    df = df.assign(
+        passed=df["status"].astype(str).str.strip().str.upper() == "PASS",
+        timestamp=df["timestamp"].dt.strftime(TIMESTAMP_FORMAT)
+    )
+
+    return df.groupby(columns, observed=True, sort=True).agg(
+        count=("test_name", "size"),
+        pass_count=("passed", "sum"),
+        sent_mean=("sent_avg", "mean"),
+        sent_min=("sent_avg", "min"),
+        sent_max=("sent_avg", "max"),
+        sent_n=("sent_avg", "count"),
+        recv_mean=("recv_avg", "mean"),
+        recv_min=("recv_avg", "min"),
+        recv_max=("recv_avg", "max"),
+        recv_n=("recv_avg", "count"),
+        first=("timestamp", "min"),
+        last=("timestamp", "max"),
+    ).reset_index()
+
+
+class ResultsStore:
+    """
+    Test results in a SQLite database (WAL mode) with the same columns
+    as dashboard_data.csv.
+
+    Writers are the Robot runs (several at once under the orchestrator),
+    readers the dashboard threads; WAL lets both proceed without
+    blocking each other. Each thread keeps its own connection.
+    """
+
+    def __init__(self, db_file=None, busy_timeout=30):
+        self.db_file = os.path.abspath(db_file or DB_FILE)
+        self.busy_timeout = float(busy_timeout)
+
+        self._local = threading.local()
+
+        db_dir = os.path.dirname(self.db_file)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.executescript(SUMMARY_SCHEMA)
+
+        self._backfill_summary()
+
+    # -----------------------------------------
+    # Connection
+    # -----------------------------------------
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # -----------------------------------------
+    # Summary
+    # -----------------------------------------
+
+    def _backfill_summary(self):
+        # Stores created before run_summary existed: one rebuild, after
+        # which the trigger keeps it current
+        conn = self._connect()
+        has_summary = conn.execute("SELECT EXISTS (SELECT 1 FROM run_summary)").fetchone()[0]
+        has_results = conn.execute("SELECT EXISTS (SELECT 1 FROM results)").fetchone()[0]
+
+        if has_results and not has_summary:
+            self.rebuild_summary()
+
+    def rebuild_summary(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM run_summary")
+            conn.execute(SUMMARY_REBUILD)
+
+    # -----------------------------------------
+    # Write
+    # -----------------------------------------
+
+    def _row(self, record):
+        row = []
+        for column in COLUMNS:
+            value = record.get(column)
+            if column == "timestamp":
+                row.append(_timestamp(value))
+            elif column in REAL_COLUMNS:
+                row.append(_real(value))
+            else:
+                row.append(_text(value))
+        return row
+
+    def insert(self, record):
+        """Store one result; returns False if the same row already exists."""
+        return self.insert_many([record]) == 1
+
+    def insert_many(self, records):
+        sql = (
+            f"INSERT OR IGNORE INTO results ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+        )
+        rows = [self._row(record) for record in records]
+        rows = [row for row in rows if row[0] and row[COLUMNS.index("test_name")]]
+
+        conn = self._connect()
+        with conn:
+            # rowcount excludes the rows results_summary writes;
+            # total_changes would count each stored result twice
+            return conn.executemany(sql, rows).rowcount
+
+    def import_csv(self, csv_file, batch_size=5000):
+        """One-shot import of dashboard_data.csv history; safe to re-run."""
+
+        if not os.path.exists(csv_file):
+            return 0
+
+        imported = 0
+        batch = []
+
+        with open(csv_file, "r", newline="") as f:
+            for record in csv.DictReader(f):
+                # Rows with extra fields (bad lines) end up under the None key
+                if None in record:
+                    continue
+
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    imported += self.insert_many(batch)
+                    batch = []
+
+        if batch:
+            imported += self.insert_many(batch)
+
+        return imported
+
+    # -----------------------------------------
+    # Query
+    # -----------------------------------------
+
+    def _where(self, filters, start=None, end=None, since=None, until=None,
+               test_contains=None):
+        clauses = []
+        params = []
+
+        for column in FILTERS:
+            value = filters.get(column)
+            if value is None or _text(value) == "":
+                continue
+            clauses.append(f"{column} = ?")
+            params.append(_text(value))
+
+        if test_contains:
+            # Case-sensitive substring, like str.contains on the frame
+            clauses.append("instr(test_name, ?) > 0")
+            params.append(_text(test_contains))
+
+        if start:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp(start))
+
+        if end:
+            # end is an inclusive date, as in the dashboard filters
+            clauses.append("timestamp < ?")
+            params.append(
+                (pd.to_datetime(end) + pd.Timedelta(days=1)).strftime(TIMESTAMP_FORMAT)
+            )
+
+        # since/until are exact, inclusive timestamps (e.g. a run window)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(_timestamp(since))
+
+        if until:
+            clauses.append("timestamp <= ?")
+            params.append(_timestamp(until))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, start=None, end=None, limit=None, columns=None, **filters):
+        """
+        Rows matching the equality filters (board_model, run_id, channel,
+        tdd, mcs, test_name, status) and the optional start/end dates,
+        oldest first, as a DataFrame with the dashboard_data.csv columns
+        (or just columns, a subset of them).
+        """
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown result filters: {sorted(unknown)}")
+
+        columns = list(columns or COLUMNS)
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown result columns: {sorted(unknown)}")
+
+        where, params = self._where(filters, start, end)
+        sql = f"SELECT {', '.join(columns)} FROM results {where} ORDER BY timestamp, id"
+
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def page(self, sort="timestamp", descending=False, after=None, limit=100,
+             start=None, end=None, **filters):
+        """
+        One page of query() in the order of SORT_KEYS[sort], then id.
+
+        Keyset pagination: after is the cursor returned with the
+        previous page, so each page is an index range scan instead of an
+        OFFSET over everything before it. Returns (rows, cursor); the
+        cursor is None on the last page.
+        """
+
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort column: {sort}")
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown result filters: {sorted(unknown)}")
+
+        key = SORT_KEYS[sort]
+        direction = "DESC" if descending else "ASC"
+
+        where, params = self._where(filters, start, end)
+
+        if after is not None:
+            clause = f"({key}, id) {'<' if descending else '>'} (?, ?)"
+            where = f"{where} AND {clause}" if where else f"WHERE {clause}"
+            params += list(after)
+
+        sql = (
+            f"SELECT {', '.join(COLUMNS)}, {key} AS sort_key, id FROM results {where} "
+            f"ORDER BY {key} {direction}, id {direction} LIMIT ?"
+        )
+        params.append(int(limit) + 1)
+
+        rows = pd.read_sql_query(sql, self._connect(), params=params)
+
+        cursor = None
+        if len(rows) > limit:
+            last = rows.iloc[limit - 1]
+            cursor = [_scalar(last["sort_key"]), int(last["id"])]
+
+        return rows.iloc[:limit].drop(columns=["sort_key", "id"]), cursor
+
+    def iter_query(self, start=None, end=None, since=None, until=None,
+                   test_contains=None, chunk_size=10000, **filters):
+        """
+        query() in DataFrames of up to chunk_size rows, for exports of
+        any size. Reads on its own connection, so the generator can be
+        consumed from another thread and one snapshot covers all chunks.
+        """
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown result filters: {sorted(unknown)}")
+
+        where, params = self._where(filters, start, end, since, until, test_contains)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM results {where} ORDER BY timestamp, id"
+
+        conn = sqlite3.connect(
+            self.db_file, timeout=self.busy_timeout, check_same_thread=False
+        )
+        try:
+            for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunk_size):
+                yield chunk
+        finally:
+            conn.close()
+
+    def aggregate(self, group_by="test", start=None, end=None, **filters):
+        """
+        Per-group throughput aggregates of the matching rows, in one
+        GROUP BY query. group_by is a key of GROUPINGS.
+        """
+
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping: {group_by}")
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown result filters: {sorted(unknown)}")
+
+        columns = ", ".join(GROUPINGS[group_by])
+        where, params = self._where(filters, start, end)
+
+        # Whole-history groups come from the summary table; date ranges
+        # and status filters need the raw rows
+        if not start and not end and not filters.get("status"):
+            sql = f"""
+                SELECT {columns},
+                       SUM(count) AS count,
+                       SUM(pass_count) AS pass_count,
+                       SUM(sent_sum) / NULLIF(SUM(sent_n), 0) AS sent_mean,
+                       MIN(sent_min) AS sent_min,
+                       MAX(sent_max) AS sent_max,
+                       SUM(sent_n) AS sent_n,
+                       SUM(recv_sum) / NULLIF(SUM(recv_n), 0) AS recv_mean,
+                       MIN(recv_min) AS recv_min,
+                       MAX(recv_max) AS recv_max,
+                       SUM(recv_n) AS recv_n,
+                       MIN(first) AS first,
+                       MAX(last) AS last
+                FROM run_summary {where}
+                GROUP BY {columns}
+                ORDER BY {columns}
+            """
+            return pd.read_sql_query(sql, self._connect(), params=params)
+
+        sql = f"""
+            SELECT {columns},
+                   COUNT(*) AS count,
+                   SUM(UPPER(TRIM(status)) = 'PASS') AS pass_count,
+                   AVG(sent_avg) AS sent_mean,
+                   MIN(sent_avg) AS sent_min,
+                   MAX(sent_avg) AS sent_max,
+                   COUNT(sent_avg) AS sent_n,
+                   AVG(recv_avg) AS recv_mean,
+                   MIN(recv_avg) AS recv_min,
+                   MAX(recv_avg) AS recv_max,
+                   COUNT(recv_avg) AS recv_n,
+                   MIN(timestamp) AS first,
+                   MAX(timestamp) AS last
+            FROM results {where}
+            GROUP BY {columns}
+            ORDER BY {columns}
+        """
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def summary(self, **filters):
+        """
+        run_summary rows (one per run, cell and test) matching the
+        equality filters; status is not kept per summary row.
+        """
+
+        unknown = set(filters) - set(SUMMARY_KEY)
+        if unknown:
+            raise ValueError(f"Unknown summary filters: {sorted(unknown)}")
+
+        where, params = self._where(filters)
+        sql = (
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM run_summary {where} "
+            f"ORDER BY {', '.join(SUMMARY_KEY)}"
+        )
+        return pd.read_sql_query(sql, self._connect(), params=params)
+
+    def gains(self, **filters):
+        return gains_frame(self.summary(**filters))
+
+    def tests(self, **filters):
+        """Test names of the matching runs/cells in order of first appearance."""
+
+        unknown = set(filters) - set(SUMMARY_KEY)
+        if unknown:
+            raise ValueError(f"Unknown summary filters: {sorted(unknown)}")
+
+        where, params = self._where(filters)
+        rows = self._connect().execute(
+            f"SELECT test_name FROM run_summary {where} "
+            f"GROUP BY test_name ORDER BY MIN(first), test_name",
+            params
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def overview(self, start=None, end=None, **filters):
+        """
+        Home page figures of the matching rows: count, pass_count and
+        fail_count from one aggregate query, and the latest row.
+        """
+
+        unknown = set(filters) - set(FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown result filters: {sorted(unknown)}")
+
+        where, params = self._where(filters, start, end)
+        conn = self._connect()
+
+        count, pass_count, fail_count = conn.execute(
+            f"""
+            SELECT COUNT(*),
+                   IFNULL(SUM(UPPER(TRIM(status)) = 'PASS'), 0),
+                   IFNULL(SUM(UPPER(TRIM(status)) = 'FAIL'), 0)
+            FROM results {where}
+            """,
+            params
+        ).fetchone()
+
+        last = conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM results {where} "
+            f"ORDER BY timestamp DESC, id DESC LIMIT 1",
+            params
+        ).fetchone()
+
+        return {
+            "count": count,
+            "pass_count": pass_count,
+            "fail_count": fail_count,
+            "last": dict(zip(COLUMNS, last)) if last else None,
+        }
+
+    def distinct(self, column, **filters):
+        """Distinct values of column among the matching rows, sorted."""
+
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown result column: {column}")
+
+        where, params = self._where(filters)
+        rows = self._connect().execute(
+            f"SELECT DISTINCT {column} FROM results {where} ORDER BY {column}",
+            params
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def version(self, start=None, end=None, **filters):
+        """
+        Token that changes whenever rows matching the filters are added;
+        used to invalidate anything derived from them.
+        """
+
+        where, params = self._where(filters, start, end)
+        count, last_id = self._connect().execute(
+            f"SELECT COUNT(*), MAX(id) FROM results {where}", params
+        ).fetchone()
+        return f"{count}:{last_id or 0}"
+
+    def last_id(self):
+        return self._connect().execute("SELECT MAX(id) FROM results").fetchone()[0] or 0
+
+    def runs_since(self, last_id=0):
+        """(board_model, run_id) pairs with rows added after last_id."""
+
+        rows = self._connect().execute(
+            "SELECT board_model, run_id FROM results WHERE id > ? "
+            "GROUP BY board_model, run_id",
+            (int(last_id),)
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def count(self, start=None, end=None, **filters):
+        where, params = self._where(filters, start, end)
+        return self._connect().execute(
+            f"SELECT COUNT(*) FROM results {where}", params
+        ).fetchone()[0]
+
+
+def main(argv=None):
+    """python -m performance.results_store [dashboard_data.csv] [results.sqlite]"""
+
+    argv = sys.argv[1:] if argv is None else argv
+
+    csv_file = argv[0] if argv else os.path.join(PROJECT_ROOT, "dashboard_data.csv")
+    db_file = argv[1] if len(argv) > 1 else None
+
+    store = ResultsStore(db_file)
+    imported = store.import_csv(csv_file)
+
+    print(f"Imported {imported} rows from {csv_file} into {store.db_file}")
+    print(f"Total rows: {store.count()}")
+
+
+if __name__ == "__main__":
+    main()
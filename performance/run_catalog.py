@@ -0,0 +1,209 @@
+import os
+import threading
+import time
+
+import yaml
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "results")
+SETUPS_FILE = os.path.join(PROJECT_ROOT, "mikrotik", "ptp_setups.yaml")
+
+# Run folders that are not channel folders (precomputed graphs)
+SKIP_DIRS = {"graphs"}
+
+GRAPH_SUFFIX = "_graph.png"
+
+
+def tdd_folder(tdd):
+    """Folder name of a TDD ratio (75-25), as Render Graph creates it: TDD 75-25."""
+    return "TDD " + str(tdd).replace("/", "-")
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _subdirs(path):
+    try:
+        with os.scandir(path) as it:
+            return sorted((entry for entry in it if entry.is_dir()), key=lambda e: e.name)
+    except OSError:
+        return []
+
+
+class RunCatalog:
+    """
+    In-memory index of the PTP setups in ptp_setups.yaml and of what
+    results/<setup>/<run_id>/ holds: the channel/TDD/MCS cells, their
+    per-test graphs and the run's top-level artifacts.
+
+    Nothing is rescanned while the directory (or YAML) mtimes it was
+    built from are unchanged; creating or removing an entry changes the
+    mtime of its parent. Those checks themselves run at most every
+    check_interval seconds per entry, so a busy dashboard does a few
+    stat() calls per interval instead of a YAML parse and directory
+    listings per request.
+    """
+
+    def __init__(self, results_dir=RESULTS_DIR, setups_file=SETUPS_FILE,
+                 check_interval=2.0):
+
+        self.results_dir = results_dir
+        self.setups_file = setups_file
+        self.check_interval = float(check_interval)
+
+        self._lock = threading.Lock()
+
+        # key -> (checked_at, signature, value)
+        self._setups = None
+        self._runs = {}
+        self._run_entries = {}
+
+    def _due(self, entry):
+        return entry is None or time.monotonic() - entry[0] >= self.check_interval
+
+    # -----------------------------------------
+    # Setups (ptp_setups.yaml)
+    # -----------------------------------------
+
+    def _load_setups(self):
+        if not os.path.exists(self.setups_file):
+            print("YAML NOT FOUND")
+            return []
+
+        with open(self.setups_file, "r") as f:
+            data = yaml.safe_load(f)
+
+        if not data or "ptp_setups" not in data:
+            print("ptp_setups key missing")
+            return []
+
+        return list(data["ptp_setups"].keys())
+
+    def setups(self):
+        with self._lock:
+            entry = self._setups
+            if self._due(entry):
+                signature = _mtime(self.setups_file)
+                if entry is None or entry[1] != signature:
+                    entry = (time.monotonic(), signature, self._load_setups())
+                else:
+                    entry = (time.monotonic(), signature, entry[2])
+                self._setups = entry
+            return list(entry[2])
+
+    # -----------------------------------------
+    # Runs of a setup
+    # -----------------------------------------
+
+    def runs(self, setup):
+        """Run IDs of a setup, newest first."""
+
+        if not setup:
+            return []
+
+        setup_dir = os.path.join(self.results_dir, setup)
+
+        with self._lock:
+            entry = self._runs.get(setup)
+            if self._due(entry):
+                signature = _mtime(setup_dir)
+                if entry is None or entry[1] != signature:
+                    runs = sorted((d.name for d in _subdirs(setup_dir)), reverse=True)
+                    entry = (time.monotonic(), signature, runs)
+                else:
+                    entry = (time.monotonic(), signature, entry[2])
+                self._runs[setup] = entry
+            return list(entry[2])
+
+    # -----------------------------------------
+    # Contents of a run
+    # -----------------------------------------
+
+    def _scan_run(self, run_dir):
+        """(dir mtimes, run index) of one run folder."""
+
+        mtimes = {run_dir: _mtime(run_dir)}
+        run = {"artifacts": {}, "cells": {}}
+
+        try:
+            with os.scandir(run_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        run["artifacts"][entry.name] = entry.path
+        except OSError:
+            return mtimes, run
+
+        for channel_dir in _subdirs(run_dir):
+            if channel_dir.name in SKIP_DIRS:
+                continue
+            mtimes[channel_dir.path] = _mtime(channel_dir.path)
+
+            for tdd_dir in _subdirs(channel_dir.path):
+                if not tdd_dir.name.startswith("TDD "):
+                    continue
+                mtimes[tdd_dir.path] = _mtime(tdd_dir.path)
+                # Same spelling as the results rows and filters: 75-25
+                tdd = tdd_dir.name[len("TDD "):]
+
+                for mcs_dir in _subdirs(tdd_dir.path):
+                    if not mcs_dir.name.startswith("MCS"):
+                        continue
+                    mtimes[mcs_dir.path] = _mtime(mcs_dir.path)
+                    mcs = mcs_dir.name[len("MCS"):]
+
+                    graphs = {}
+                    with os.scandir(mcs_dir.path) as it:
+                        for entry in it:
+                            if entry.name.endswith(GRAPH_SUFFIX):
+                                graphs[entry.name[:-len(GRAPH_SUFFIX)]] = entry.path
+
+                    run["cells"][(channel_dir.name, tdd, mcs)] = {"graphs": graphs}
+
+        return mtimes, run
+
+    def run(self, setup, run_id):
+        """{"artifacts": {file name: path}, "cells": {(channel, tdd, mcs): {"graphs": {test: path}}}}"""
+
+        if not setup or not run_id:
+            return {"artifacts": {}, "cells": {}}
+
+        run_dir = os.path.join(self.results_dir, setup, run_id)
+        key = (setup, run_id)
+
+        with self._lock:
+            entry = self._run_entries.get(key)
+            if self._due(entry):
+                changed = entry is None or any(
+                    _mtime(path) != mtime for path, mtime in entry[1].items()
+                )
+                if changed:
+                    mtimes, run = self._scan_run(run_dir)
+                    entry = (time.monotonic(), mtimes, run)
+                else:
+                    entry = (time.monotonic(), entry[1], entry[2])
+                self._run_entries[key] = entry
+            return entry[2]
+
+    def cells(self, setup, run_id):
+        """Sorted (channel, tdd, mcs) of the cells with a folder in the run."""
+        return sorted(self.run(setup, run_id)["cells"])
+
+    def graph_path(self, setup, run_id, channel, tdd, mcs, test_name):
+        cell = self.run(setup, run_id)["cells"].get((channel, tdd, str(mcs)))
+        if cell is None:
+            return None
+        return cell["graphs"].get(test_name)
+
+    def expected_graph_path(self, setup, run_id, channel, tdd, mcs, test_name):
+        """Where Render Graph writes a test's graph, whether or not it exists."""
+        return os.path.join(
+            self.results_dir, setup, run_id, channel, tdd_folder(tdd),
+            f"MCS{mcs}", f"{test_name}{GRAPH_SUFFIX}"
+        )
@@ -0,0 +1,94 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from libraries.matrix.checkpoint import CheckpointManifest, resolve_run_dir
+
+
+CSV_HEADER = ["board_model", "run_id", "channel", "tdd", "mcs", "test_name", "status"]
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.tmp.name, "results", "V5000")
+        self.run_dir = os.path.join(self.model_dir, "20260224_172045")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_csv(self, rows):
+        path = os.path.join(self.tmp.name, "dashboard_data.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(rows)
+        return path
+
+    def test_record_survives_reload(self):
+        manifest = CheckpointManifest(self.run_dir)
+        manifest.record(2, "75-25", 9, "TCP-Downlink-4Stream")
+
+        reloaded = CheckpointManifest(self.run_dir)
+
+        self.assertTrue(reloaded.is_completed("2", "75-25", "9", "TCP-Downlink-4Stream"))
+        self.assertFalse(reloaded.is_completed("2", "75-25", "12", "TCP-Downlink-4Stream"))
+
+    def test_truncated_last_line_is_ignored(self):
+        manifest = CheckpointManifest(self.run_dir)
+        manifest.record(2, "75-25", 9, "TCP-Downlink-4Stream")
+
+        # Run killed halfway through writing the next entry
+        with open(manifest.path, "a") as f:
+            f.write('{"channel": "2", "tdd": "75-25", "mc')
+
+        resumed = CheckpointManifest(self.run_dir)
+        self.assertEqual(len(resumed.completed()), 1)
+
+        resumed.record(2, "75-25", 12, "TCP-Downlink-4Stream")
+
+        with open(manifest.path) as f:
+            lines = f.read().splitlines()
+
+        self.assertEqual(json.loads(lines[-1])["mcs"], "12")
+        self.assertEqual(len(CheckpointManifest(self.run_dir).completed()), 2)
+
+    def test_import_csv_matches_run_and_board(self):
+        csv_file = self.write_csv([
+            ["V5000", "20260224_172045", "2", "75-25", "9", "TCP-Downlink-4Stream", "PASS"],
+            ["V3000", "20260224_172045", "2", "75-25", "12", "TCP-Downlink-4Stream", "PASS"],
+            ["V5000", "20260223_090000", "2", "75-25", "10", "TCP-Downlink-4Stream", "PASS"],
+        ])
+
+        manifest = CheckpointManifest(self.run_dir)
+
+        self.assertEqual(manifest.board_model, "V5000")
+        self.assertEqual(manifest.import_csv(csv_file), 1)
+        self.assertTrue(manifest.is_completed("2", "75-25", "9", "TCP-Downlink-4Stream"))
+
+    def test_import_csv_skipped_once_manifest_has_cells(self):
+        csv_file = self.write_csv([
+            ["V5000", "20260224_172045", "2", "75-25", "9", "TCP-Downlink-4Stream", "PASS"],
+        ])
+
+        manifest = CheckpointManifest(self.run_dir)
+        manifest.record(2, "50-50", 12, "UDP-Bidir")
+
+        self.assertEqual(manifest.import_csv(csv_file), 0)
+
+    def test_resolve_latest_run(self):
+        for name in ("20260223_090000", "20260224_172045"):
+            os.makedirs(os.path.join(self.model_dir, name))
+
+        self.assertEqual(resolve_run_dir(self.model_dir, "latest"), self.run_dir)
+        self.assertEqual(resolve_run_dir(self.model_dir, "20260224_172045"), self.run_dir)
+
+        with self.assertRaises(FileNotFoundError):
+            resolve_run_dir(self.model_dir, "20250101_000000")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from performance.dashboard import CsvFrameCache
+
+
+HEADER = "timestamp,board_model,run_id,channel,tdd,mcs,test_name,sent_avg,recv_avg,status\n"
+
+
+def row(i, mcs="9"):
+    return (
+        f"2026-02-24 17:{i:02d}:00,V5000,20260224_172045,2,75-25,{mcs},"
+        f"TCP-Downlink-{i}Stream,{800 + i}.5,,PASS\n"
+    )
+
+
+class CsvFrameCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "dashboard_data.csv")
+        self.write(HEADER + row(1) + row(2))
+
+        self.cache = CsvFrameCache(self.path)
+        self.parse_offsets = []
+
+        parse = self.cache._parse
+
+        def spy(f, columns):
+            self.parse_offsets.append(self.cache.offset)
+            return parse(f, columns)
+
+        patcher = mock.patch.object(self.cache, "_parse", side_effect=spy)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, text, mode="w"):
+        with open(self.path, mode, newline="") as f:
+            f.write(text)
+
+    def rewrite(self, text):
+        # New file moved into place, as an editor or export would do
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", newline="") as f:
+            f.write(text)
+        os.replace(tmp_path, self.path)
+
+    def test_unchanged_file_is_not_reparsed(self):
+        self.assertEqual(len(self.cache.load()), 2)
+        self.assertEqual(len(self.cache.load()), 2)
+
+        self.assertEqual(self.parse_offsets, [len(HEADER)])
+
+    def test_appended_rows_parsed_from_last_offset(self):
+        self.cache.load()
+        size = os.path.getsize(self.path)
+
+        self.write(row(3, mcs="12"), mode="a")
+        frame = self.cache.load()
+
+        self.assertEqual(self.parse_offsets, [len(HEADER), size])
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame["mcs"].dtype.name, "category")
+        self.assertEqual(sorted(frame["mcs"].cat.categories), ["12", "9"])
+        self.assertEqual(frame["sent_avg"].iloc[-1], 803.5)
+
+    def test_partial_row_waits_for_its_newline(self):
+        self.cache.load()
+
+        partial = row(3)
+        self.write(partial[:20], mode="a")
+        self.assertEqual(len(self.cache.load()), 2)
+
+        self.write(partial[20:], mode="a")
+        frame = self.cache.load()
+
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame["test_name"].iloc[-1], "TCP-Downlink-3Stream")
+
+    def test_rewritten_file_is_reloaded(self):
+        self.cache.load()
+
+        self.rewrite(HEADER + row(5) + row(6) + row(7))
+        frame = self.cache.load()
+
+        self.assertEqual(self.parse_offsets[-1], len(HEADER))
+        self.assertEqual(frame["test_name"].tolist(), [
+            "TCP-Downlink-5Stream", "TCP-Downlink-6Stream", "TCP-Downlink-7Stream"
+        ])
+
+    def test_truncated_file_is_reloaded(self):
+        self.cache.load()
+
+        self.write(HEADER + row(4))
+        frame = self.cache.load()
+
+        self.assertEqual(self.parse_offsets[-1], len(HEADER))
+        self.assertEqual(frame["test_name"].tolist(), ["TCP-Downlink-4Stream"])
+
+    def test_missing_file(self):
+        self.cache.load()
+        os.remove(self.path)
+
+        self.assertTrue(self.cache.load().empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
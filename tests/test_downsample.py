@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+from performance.downsample import downsample_indices, lttb_indices, minmax_indices
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float), rng.normal(800, 50, n)
+
+
+class LttbTest(unittest.TestCase):
+
+    def test_keeps_exactly_threshold_points_within_bounds(self):
+        for n, threshold in [(10, 3), (10, 9), (1000, 50), (1001, 1000), (5000, 7)]:
+            with self.subTest(n=n, threshold=threshold):
+                x, y = series(n)
+                kept = lttb_indices(x, y, threshold)
+
+                self.assertEqual(len(kept), threshold)
+                self.assertEqual(kept[0], 0)
+                self.assertEqual(kept[-1], n - 1)
+                self.assertTrue((np.diff(kept) > 0).all())
+
+    def test_small_budget_or_series_kept_whole(self):
+        x, y = series(20)
+
+        np.testing.assert_array_equal(lttb_indices(x, y, 20), np.arange(20))
+        np.testing.assert_array_equal(lttb_indices(x, y, 100), np.arange(20))
+        np.testing.assert_array_equal(lttb_indices(x, y, 2), np.arange(20))
+        self.assertEqual(len(lttb_indices([], [], 10)), 0)
+
+    def test_keeps_spike(self):
+        x, y = series(1000)
+        y[437] = 5000.0
+
+        self.assertIn(437, lttb_indices(x, y, 40))
+
+    def test_nan_treated_as_zero(self):
+        x, y = series(500)
+        y[100:110] = np.nan
+
+        kept = lttb_indices(x, y, 30)
+
+        self.assertEqual(len(kept), 30)
+        self.assertTrue(any(100 <= i < 110 for i in kept))
+
+
+class MinMaxTest(unittest.TestCase):
+
+    def test_within_budget_and_keeps_extremes(self):
+        for n, threshold in [(10, 4), (1000, 50), (1001, 1000), (5000, 3)]:
+            with self.subTest(n=n, threshold=threshold):
+                _, y = series(n, seed=n)
+                kept = minmax_indices(y, threshold)
+
+                self.assertLessEqual(len(kept), threshold)
+                self.assertTrue((np.diff(kept) > 0).all())
+                self.assertGreaterEqual(kept[0], 0)
+                self.assertLess(kept[-1], n)
+                self.assertIn(int(y.argmin()), kept)
+                self.assertIn(int(y.argmax()), kept)
+
+    def test_small_budget_or_series_kept_whole(self):
+        y = np.arange(10.0)
+
+        np.testing.assert_array_equal(minmax_indices(y, 10), np.arange(10))
+        np.testing.assert_array_equal(minmax_indices(y, 1), np.arange(10))
+
+
+class DownsampleIndicesTest(unittest.TestCase):
+
+    def test_budget_shared_between_series(self):
+        x, sent = series(2000, seed=1)
+        _, recv = series(2000, seed=2)
+
+        for method in ("lttb", "minmax"):
+            with self.subTest(method=method):
+                kept = downsample_indices(x, [sent, recv], 200, method=method)
+
+                self.assertLessEqual(len(kept), 200)
+                self.assertTrue((np.diff(kept) > 0).all())
+                self.assertGreaterEqual(kept[0], 0)
+                self.assertLess(kept[-1], 2000)
+
+        # LTTB always keeps both ends of the x range
+        kept = downsample_indices(x, [sent, recv], 200)
+        self.assertEqual((kept[0], kept[-1]), (0, 1999))
+
+    def test_no_budget_keeps_everything(self):
+        x, y = series(50)
+
+        np.testing.assert_array_equal(downsample_indices(x, [y], None), np.arange(50))
+        np.testing.assert_array_equal(downsample_indices(x, [y], 50), np.arange(50))
+
+
+if __name__ == "__main__":
+    unittest.main()
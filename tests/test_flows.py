@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from libraries.iperf.exceptions import IperfError
+from libraries.iperf.flows import (
+    ROLE_BACKGROUND,
+    ROLE_RECV,
+    FlowSpec,
+    merge_flow_results,
+)
+from performance.plot_iperf import IperfResult
+
+
+def flow_result(protocol, mbps, series, retransmits=None, loss=None, artifact=None):
+    result = IperfResult("flow", protocol, None)
+    result.sent_mbps = mbps
+    result.sent_bw = np.array(series, dtype=float)
+    result.times_sent = np.arange(1.0, len(series) + 1)
+    result.sent_retransmits = retransmits
+    result.sent_loss_pct = loss
+    result.duration_s = float(len(series))
+    result.artifact = artifact
+    return result
+
+
+class MergeFlowResultsTest(unittest.TestCase):
+
+    def test_sent_flows_add_up(self):
+        flows = [FlowSpec("a", "pop", "dn"), FlowSpec("b", "pop", "dn")]
+        results = [
+            flow_result("TCP", 100.0, [90, 100, 110, 100], retransmits=2),
+            flow_result("TCP", 50.0, [50, 50, 50], retransmits=None),
+        ]
+
+        merged = merge_flow_results("TCP-Multi", flows, results)
+
+        self.assertEqual(merged.protocol, "TCP")
+        self.assertFalse(merged.bidirectional)
+        self.assertEqual(merged.sent_mbps, 150.0)
+        self.assertEqual(merged.sent_retransmits, 2)
+        self.assertIsNone(merged.recv_mbps)
+
+        # Series are cut to the shortest flow before summing
+        np.testing.assert_array_equal(merged.sent_bw, [140, 150, 160])
+        np.testing.assert_array_equal(merged.times_sent, [1, 2, 3])
+        self.assertEqual(merged.duration_s, 3.0)
+
+    def test_reverse_flows_fill_the_receive_side(self):
+        flows = [
+            FlowSpec("up", "pop", "dn", protocol="udp"),
+            FlowSpec("down", "dn", "pop", protocol="udp", role=ROLE_RECV),
+        ]
+        results = [
+            flow_result("UDP", 400.0, [400] * 5, loss=1.0),
+            flow_result("UDP", 300.0, [300] * 5, loss=4.0),
+        ]
+
+        merged = merge_flow_results("UDP-Multi", flows, results)
+
+        self.assertTrue(merged.bidirectional)
+        self.assertEqual(merged.direction, "bidirectional")
+        self.assertEqual(merged.recv_mbps, 300.0)
+        self.assertEqual(merged.sent_loss_pct, 1.0)
+        self.assertEqual(merged.recv_loss_pct, 4.0)
+        self.assertEqual(merged.recv_stats["mean"], 300.0)
+
+    def test_background_flows_only_listed(self):
+        flows = [
+            FlowSpec("main", "pop", "dn"),
+            FlowSpec("load", "pop", "dn", protocol="udp", role=ROLE_BACKGROUND),
+        ]
+        results = [
+            flow_result("TCP", 100.0, [100] * 3, artifact="main.json.gz"),
+            flow_result("UDP", 500.0, [500] * 3, artifact="load.json.gz"),
+        ]
+
+        merged = merge_flow_results("TCP-Loaded", flows, results)
+
+        # The background flow's protocol does not make this MIXED
+        self.assertEqual(merged.protocol, "TCP")
+        self.assertEqual(merged.sent_mbps, 100.0)
+        self.assertEqual([f["name"] for f in merged.flows], ["main", "load"])
+        self.assertEqual(merged.flows[1]["role"], ROLE_BACKGROUND)
+        self.assertEqual(merged.artifact, ["main.json.gz", "load.json.gz"])
+
+    def test_mixed_protocols(self):
+        flows = [FlowSpec("tcp", "pop", "dn"), FlowSpec("udp", "pop", "dn", protocol="udp")]
+        results = [flow_result("TCP", 1.0, [1]), flow_result("UDP", 1.0, [1])]
+
+        self.assertEqual(merge_flow_results("Mixed", flows, results).protocol, "MIXED")
+
+
+class FlowSpecTest(unittest.TestCase):
+
+    def test_command(self):
+        flow = FlowSpec("up", "pop", "dn", protocol="UDP", streams=4, bidir="True")
+
+        self.assertEqual(
+            flow.command("10.0.0.2", 5202, 60),
+            "iperf3 -c 10.0.0.2 -i1 -t 60 -p 5202 -u -b 2G -P 4 --bidir -J"
+        )
+
+    def test_unknown_role(self):
+        with self.assertRaises(IperfError):
+            FlowSpec("x", "pop", "dn", role="both")
+
+
+if __name__ == "__main__":
+    unittest.main()
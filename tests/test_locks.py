@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from libraries.matrix.locks import LockTimeoutError, ResourceLockManager
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Takes a lock, reports it and waits to be killed
+HOLDER_SCRIPT = (
+    "import sys, time\n"
+    "from libraries.matrix.locks import ResourceLockManager\n"
+    "locks = ResourceLockManager(sys.argv[1], owner='worker-1')\n"
+    "assert locks.try_acquire('router:bridge')\n"
+    "print('locked', flush=True)\n"
+    "time.sleep(60)\n"
+)
+
+
+class ResourceLockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.first = ResourceLockManager(self.tmp.name, owner="worker-1")
+        self.second = ResourceLockManager(self.tmp.name, owner="worker-2")
+
+    def tearDown(self):
+        self.first.release_all()
+        self.second.release_all()
+        self.tmp.cleanup()
+
+    def test_acquire_is_exclusive_until_release(self):
+        self.assertTrue(self.first.try_acquire("router:bridge"))
+        self.assertFalse(self.second.try_acquire("router:bridge"))
+        self.assertEqual(self.second.holder("router:bridge"), "worker-1")
+
+        self.first.release("router:bridge")
+
+        self.assertIsNone(self.second.holder("router:bridge"))
+        self.assertTrue(self.second.try_acquire("router:bridge"))
+
+    def test_reacquire_by_holder(self):
+        self.assertTrue(self.first.try_acquire("ubuntu:pop"))
+        self.assertTrue(self.first.try_acquire("ubuntu:pop"))
+        self.assertTrue(self.first.holds("ubuntu:pop"))
+
+    def test_acquire_all_times_out_without_partial_hold(self):
+        self.second.try_acquire("ubuntu:dn")
+
+        with self.assertRaises(LockTimeoutError):
+            self.first.acquire_all(["ubuntu:pop", "ubuntu:dn"], timeout=0, interval=0)
+
+        self.assertFalse(self.first.holds("ubuntu:pop"))
+        self.assertTrue(self.second.try_acquire("ubuntu:pop"))
+
+    def test_acquire_all_keeps_locks_held_before_the_call(self):
+        self.first.try_acquire("ubuntu:pop")
+        self.second.try_acquire("ubuntu:dn")
+
+        with self.assertRaises(LockTimeoutError):
+            self.first.acquire_all(["ubuntu:pop", "ubuntu:dn"], timeout=0, interval=0)
+
+        self.assertTrue(self.first.holds("ubuntu:pop"))
+
+    def test_lock_of_killed_holder_is_released(self):
+        env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+        holder = subprocess.Popen(
+            [sys.executable, "-c", HOLDER_SCRIPT, self.tmp.name],
+            cwd=PROJECT_ROOT, env=env, stdout=subprocess.PIPE, text=True
+        )
+
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), "locked")
+            self.assertFalse(self.second.try_acquire("router:bridge"))
+        finally:
+            holder.kill()
+            holder.wait()
+            holder.stdout.close()
+
+        # The owner file outlives the process, the OS lock does not
+        self.assertEqual(self.second.holder("router:bridge"), "worker-1")
+        self.assertTrue(self.second.try_acquire("router:bridge"))
+
+
+if __name__ == "__main__":
+    unittest.main()
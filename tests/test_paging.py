@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from performance.dashboard import decode_cursor, encode_cursor
+from performance.results_store import ResultsStore, normalize_frame, page_frame
+
+
+# Throughput ties and missing values, inserted in this (id) order
+SENT = [800.0, None, 750.0, 800.0, 750.0, None, 800.0, 900.0, 750.0, 800.0]
+
+
+def record(i, sent):
+    return {
+        "timestamp": f"2026-02-24 17:{i % 3:02d}:00",
+        "board_model": "V5000",
+        "run_id": "20260224_172045",
+        "channel": "2",
+        "tdd": "75-25",
+        "mcs": "9",
+        "test_name": f"TCP-Downlink-{i}",
+        "sent_avg": "" if sent is None else str(sent),
+        "recv_avg": "",
+        "status": "PASS",
+    }
+
+
+def expected(key, descending):
+    # Sort value, then insertion order, both in the requested direction
+    order = sorted(range(len(SENT)), key=lambda i: (key(i), i), reverse=descending)
+    return [f"TCP-Downlink-{i}" for i in order]
+
+
+class KeysetPagingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(os.path.join(self.tmp.name, "results.sqlite"))
+        self.records = [record(i, sent) for i, sent in enumerate(SENT)]
+        self.store.insert_many(self.records)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def walk(self, page, sort, descending, limit=3):
+        names = []
+        token = None
+
+        while True:
+            after = decode_cursor(token, sort) if token else None
+            rows, cursor = page(sort=sort, descending=descending, after=after, limit=limit)
+
+            names += rows["test_name"].astype(str).tolist()
+            token = encode_cursor(cursor)
+            if token is None:
+                return names
+
+    def test_ties_broken_by_id_across_pages(self):
+        key = lambda i: -1e308 if SENT[i] is None else SENT[i]
+
+        for descending in (False, True):
+            with self.subTest(descending=descending):
+                self.assertEqual(
+                    self.walk(self.store.page, "sent_avg", descending),
+                    expected(key, descending)
+                )
+
+    def test_timestamp_ties(self):
+        key = lambda i: i % 3
+
+        self.assertEqual(
+            self.walk(self.store.page, "timestamp", False, limit=4),
+            expected(key, False)
+        )
+
+    def test_frame_pages_match_store(self):
+        # CSV fallback: file order stands in for the row id
+        frame = normalize_frame(pd.DataFrame(self.records))
+
+        def frame_page(**kwargs):
+            return page_frame(frame, **kwargs)
+
+        for sort in ("sent_avg", "timestamp"):
+            for descending in (False, True):
+                with self.subTest(sort=sort, descending=descending):
+                    self.assertEqual(
+                        self.walk(frame_page, sort, descending),
+                        self.walk(self.store.page, sort, descending)
+                    )
+
+    def test_exact_last_page_has_no_cursor(self):
+        rows, cursor = self.store.page(limit=len(SENT))
+
+        self.assertEqual(len(rows), len(SENT))
+        self.assertIsNone(cursor)
+
+
+class DecodeCursorTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        token = encode_cursor([750.0, 3])
+
+        self.assertEqual(decode_cursor(token, "sent_avg"), (750.0, 3))
+
+    def test_invalid_token(self):
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor", "sent_avg")
+
+    def test_cursor_of_another_sort(self):
+        token = encode_cursor(["2026-02-24 17:00:00", 3])
+
+        with self.assertRaises(ValueError):
+            decode_cursor(token, "sent_avg")
+
+        with self.assertRaises(ValueError):
+            decode_cursor(encode_cursor([True, 3]), "sent_avg")
+
+        self.assertEqual(decode_cursor(token, "timestamp")[1], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
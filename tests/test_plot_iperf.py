@@ -0,0 +1,102 @@
+import os
+import unittest
+
+import numpy as np
+
+from performance.plot_iperf import analyze_iperf_file, interval_stats
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def load(name):
+    return analyze_iperf_file(os.path.join(DATA_DIR, name))
+
+
+class TcpBidirTest(unittest.TestCase):
+    """iperf3 -P 2 --bidir -O 1: two sockets per direction, first interval omitted."""
+
+    def setUp(self):
+        self.result = load("iperf3_tcp_bidir_p2.json")
+
+    def test_end_summary(self):
+        self.assertTrue(self.result.bidirectional)
+        self.assertAlmostEqual(self.result.sent_mbps, 390.0)
+        self.assertAlmostEqual(self.result.recv_mbps, 300.0)
+        self.assertEqual(self.result.sent_retransmits, 6)
+        self.assertEqual(self.result.recv_retransmits, 2)
+        self.assertEqual(self.result.duration_s, 11.0)
+
+    def test_omitted_interval_dropped(self):
+        np.testing.assert_array_equal(self.result.times_sent, np.arange(1.0, 12.0))
+        np.testing.assert_array_equal(self.result.times_recv, self.result.times_sent)
+        self.assertEqual(self.result.sent_bw[0], 200.0)
+
+    def test_directions_split_by_socket(self):
+        # Stream matrices keep every interval, one column per socket
+        self.assertEqual(self.result.sent_streams_bw.shape, (12, 2))
+        self.assertEqual(self.result.recv_streams_bw.shape, (12, 2))
+
+        np.testing.assert_allclose(
+            self.result.sent_streams_bw.sum(axis=1)[1:], self.result.sent_bw
+        )
+        np.testing.assert_allclose(self.result.recv_bw, 300.0)
+
+    def test_stats_follow_the_ramp(self):
+        stats = self.result.sent_stats
+
+        self.assertAlmostEqual(stats["mean"], self.result.sent_bw.mean())
+        self.assertEqual(stats["p50"], 400.0)
+        self.assertEqual(stats["time_to_steady_s"], 1.0)
+        self.assertEqual(self.result.recv_stats["std"], 0.0)
+
+
+class UdpBidirTest(unittest.TestCase):
+
+    def setUp(self):
+        self.result = load("iperf3_udp_bidir.json")
+
+    def test_effective_rate_after_loss(self):
+        self.assertAlmostEqual(self.result.sent_mbps, 400.0 * 0.975)
+        self.assertEqual(self.result.sent_loss_pct, 2.5)
+        self.assertEqual(self.result.sent_jitter_ms, 0.021)
+
+        self.assertAlmostEqual(self.result.recv_mbps, 310.0)
+        self.assertEqual(self.result.recv_jitter_ms, 0.034)
+
+    def test_interval_series(self):
+        self.assertEqual(len(self.result.sent_bw), 10)
+        np.testing.assert_array_equal(self.result.recv_bw[:2], [300.0, 320.0])
+        self.assertEqual(self.result.recv_stats["mean"], 310.0)
+        self.assertIsNotNone(self.result.confidence_pct)
+
+
+class IntervalStatsTest(unittest.TestCase):
+
+    def test_empty_series(self):
+        self.assertIsNone(interval_stats(np.empty(0), np.empty(0)))
+
+    def test_short_series_has_no_steady_state(self):
+        stats = interval_stats(np.array([100.0, 200.0, 300.0]), np.arange(3.0))
+
+        self.assertEqual(stats["p50"], 200.0)
+        self.assertIsNone(stats["time_to_steady_s"])
+
+    def test_steady_after_ramp(self):
+        values = np.array([10.0, 50.0, 90.0] + [100.0] * 12)
+
+        stats = interval_stats(values, np.arange(len(values), dtype=float))
+
+        # First 5 s window inside 10% of the median starts at 2 s
+        self.assertEqual(stats["time_to_steady_s"], 2.0)
+
+    def test_never_settles(self):
+        values = np.array([100.0, 10.0] * 8)
+
+        stats = interval_stats(values, np.arange(len(values), dtype=float))
+
+        self.assertIsNone(stats["time_to_steady_s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from performance.results_store import ResultsStore
+
+
+RECORD = {
+    "timestamp": "2026-02-24 17:20:45",
+    "board_model": "V5000",
+    "run_id": "20260224_172045",
+    "channel": "2",
+    "tdd": "75-25",
+    "mcs": "9",
+    "test_name": "TCP-Downlink-4Stream",
+    "sent_avg": "812.5",
+    "recv_avg": "",
+    "status": "PASS",
+}
+
+
+class InsertCountTest(unittest.TestCase):
+    """Row counts must not include the rows the results_summary trigger writes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(os.path.join(self.tmp.name, "results.sqlite"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_insert_new_then_duplicate(self):
+        self.assertTrue(self.store.insert(RECORD))
+        self.assertFalse(self.store.insert(RECORD))
+
+    def test_insert_many_counts_stored_rows(self):
+        records = [dict(RECORD, test_name=f"TCP-Downlink-{i}Stream") for i in range(300)]
+
+        self.assertEqual(self.store.insert_many(records), 300)
+        self.assertEqual(self.store.insert_many(records), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
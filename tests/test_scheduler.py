@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from libraries.matrix.scheduler import MatrixScheduler
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def matrix(tdds, mcs_values, channel="2"):
+    return [
+        {"name": f"{tdd}-{mcs}", "channel": channel, "tdd": tdd, "mcs": mcs}
+        for tdd in tdds
+        for mcs in mcs_values
+    ]
+
+
+def names(steps):
+    return [step["cell"]["name"] for step in steps]
+
+
+class PlanTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = MatrixScheduler()
+
+    def test_empty_matrix(self):
+        self.assertEqual(self.scheduler.plan([]), [])
+
+    def test_starts_on_current_config_and_chains_mcs(self):
+        cells = matrix(["75-25", "50-50"], [9, 12])
+
+        steps = self.scheduler.plan(
+            cells, current_channel="2", current_tdd="50-50", current_mcs=12
+        )
+
+        # Stay on 50-50/12, then carry MCS 9 over the TDD change
+        self.assertEqual(names(steps), ["50-50-12", "50-50-9", "75-25-9", "75-25-12"])
+        self.assertEqual(
+            [(s["change_tdd"], s["change_mcs"]) for s in steps],
+            [(False, False), (False, True), (True, False), (False, True)]
+        )
+
+    def test_every_cell_planned_once(self):
+        cells = matrix(["75-25", "50-50", "30-70"], [9, 10, 12])
+
+        steps = self.scheduler.plan(cells)
+
+        self.assertEqual(sorted(names(steps)), sorted(c["name"] for c in cells))
+
+    def test_unknown_start_pays_first_tdd_and_mcs_push(self):
+        steps = self.scheduler.plan(matrix(["75-25"], [9]))
+
+        self.assertTrue(steps[0]["change_tdd"])
+        self.assertTrue(steps[0]["change_mcs"])
+        self.assertEqual(
+            steps[0]["reconfig_cost"],
+            self.scheduler.tdd_change_cost + self.scheduler.mcs_change_cost
+        )
+
+    def test_ties_keep_authored_order(self):
+        cells = matrix(["75-25", "50-50"], [9, 12])
+
+        self.assertEqual(
+            names(self.scheduler.plan(cells)),
+            ["75-25-9", "75-25-12", "50-50-12", "50-50-9"]
+        )
+
+
+class EstimateTest(unittest.TestCase):
+
+    def test_plan_never_costs_more_than_authored_order(self):
+        scheduler = MatrixScheduler()
+        cells = matrix(["75-25", "50-50"], [9, 12])
+        cells = cells[::2] + cells[1::2]
+
+        plan = scheduler.estimate(scheduler.plan(cells))
+        authored = scheduler.estimate(scheduler.authored_steps(cells))
+
+        self.assertLess(plan["reconfig_seconds"], authored["reconfig_seconds"])
+        self.assertEqual(plan["traffic_seconds"], authored["traffic_seconds"])
+
+    def test_totals(self):
+        scheduler = MatrixScheduler(
+            tdd_change_cost=100, mcs_change_cost=10,
+            traffic_tests_per_cell=2, traffic_test_cost=5
+        )
+        steps = scheduler.authored_steps(
+            matrix(["75-25"], [9, 12]), current_channel="2", current_tdd="75-25"
+        )
+
+        self.assertEqual(scheduler.estimate(steps), {
+            "cells": 2,
+            "tdd_changes": 0,
+            "mcs_changes": 2,
+            "reconfig_seconds": 20.0,
+            "traffic_seconds": 20.0,
+            "total_seconds": 40.0
+        })
+
+
+class DeterminismTest(unittest.TestCase):
+    """The plan must not depend on string hash randomization."""
+
+    SCRIPT = (
+        "import json\n"
+        "from libraries.matrix.scheduler import MatrixScheduler\n"
+        "cells = [{'name': f'{t}-{m}', 'channel': '2', 'tdd': t, 'mcs': m}\n"
+        "         for t in ('75-25', '50-50', '30-70') for m in ('9', '10', '12')]\n"
+        "print(json.dumps([s['cell']['name'] for s in MatrixScheduler().plan(cells)]))\n"
+    )
+
+    def plan_with_seed(self, seed):
+        env = dict(os.environ, PYTHONHASHSEED=str(seed), PYTHONPATH=PROJECT_ROOT)
+        output = subprocess.run(
+            [sys.executable, "-c", self.SCRIPT],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(output)
+
+    def test_same_plan_for_every_hash_seed(self):
+        plans = [self.plan_with_seed(seed) for seed in range(1, 5)]
+
+        for plan in plans[1:]:
+            self.assertEqual(plan, plans[0])
+
+
+if __name__ == "__main__":
+    unittest.main()